@@ -1,6 +1,8 @@
 from employee import Employee
 
 class Bellboy(Employee):
+    __slots__ = ()
+
     def deliverKeys(self, room):
         pass
 
@@ -0,0 +1,172 @@
+"""
+Carga concurrente sobre el servicio de reservas (booking_server.py) en localhost.
+
+Levanta el servicio dentro del proceso contra la BD configurada (o usa uno ya
+corriendo con --url), siembra habitaciones y clientes y lanza --clients hilos,
+cada uno con su BookingClient y su conexion keep-alive, que repiten la mezcla
+de peticiones de una terminal: disponibilidad, cotizacion, busqueda de cliente
+y reserva con pago. Las reservas usan habitacion y noche distintas, asi que un
+409 cuenta como error. Reporta peticiones por segundo del conjunto y p50/p99
+por tipo de peticion, medidos del lado del cliente.
+
+Como bench_dao.py, vacia la BD: solo corre contra una BD "_bench" o con
+DB_BACKEND=sqlite SQLITE_PATH=":memory:".
+
+    DB_BACKEND=sqlite SQLITE_PATH=":memory:" python benchmarks/bench_booking_service.py --clients 16 --requests 200
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_dao import make_customer, make_room, reset_tables, summarize
+from booking_client import BookingClient
+from booking_server import BookingServer
+from booking_service import BookingService
+from dao.customer_dao import CustomerDAO
+from dao.room_dao import RoomDAO
+from sqlite_backend import SQLiteDatabase
+from mysql_env import DATABASE, DB_BACKEND, BOOKING_WORKERS
+
+# Peso de cada tipo de peticion en la mezcla.
+MIX = (('available', 4), ('quote', 3), ('customer', 2), ('book', 1))
+
+
+def start_server(workers):
+    """Servicio en un hilo con su propio bucle; devuelve (server, loop, hilo)."""
+    loop = asyncio.new_event_loop()
+    server = BookingServer(BookingService.from_db(), "127.0.0.1", 0, workers)
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, name="booking-server", daemon=True)
+    thread.start()
+    return server, loop, thread
+
+
+def stop_server(server, loop, thread):
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+
+def client_loop(url, requests, room_ids, emails, stays, rng, latencies, errors, lock):
+    client = BookingClient(url)
+    kinds = [kind for kind, weight in MIX for _ in range(weight)]
+    mine = {kind: [] for kind, _ in MIX}
+    failed = 0
+    start = date.today() + timedelta(days=1)
+    try:
+        for _ in range(requests):
+            kind = rng.choice(kinds)
+            check_in = start + timedelta(days=rng.randrange(300))
+            check_out = check_in + timedelta(days=rng.randint(1, 4))
+            started = time.perf_counter()
+            try:
+                if kind == 'available':
+                    client.available_rooms(check_in.isoformat(), check_out.isoformat())
+                elif kind == 'quote':
+                    client.quote(rng.choice(room_ids), check_in.isoformat(), check_out.isoformat())
+                elif kind == 'customer':
+                    client.customer(rng.choice(emails))
+                else:
+                    room_id, night = next(stays)
+                    client.book(rng.choice(emails), room_id, night.isoformat(), (night + timedelta(days=1)).isoformat(), "Tarjeta")
+            except Exception:
+                failed += 1
+                continue
+            mine[kind].append(time.perf_counter() - started)
+    finally:
+        client.close()
+    with lock:
+        for kind, values in mine.items():
+            latencies[kind].extend(values)
+        errors[0] += failed
+
+
+def run(url, clients, requests, room_ids, emails, seed_value=0):
+    # Cada reserva toma la siguiente (habitacion, noche) libre: ninguna choca con otra.
+    first_night = date.today() + timedelta(days=400)
+    pairs = ((room_ids[i % len(room_ids)], first_night + timedelta(days=i // len(room_ids))) for i in itertools.count())
+    stays_lock = threading.Lock()
+
+    class Stays:
+        def __next__(self):
+            with stays_lock:
+                return next(pairs)
+
+    latencies = {kind: [] for kind, _ in MIX}
+    errors = [0]
+    lock = threading.Lock()
+    threads = [threading.Thread(target=client_loop, args=(url, requests, room_ids, emails, Stays(),
+                                                          random.Random(seed_value + i), latencies, errors, lock))
+               for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    results = {kind: summarize(values) for kind, values in latencies.items() if values}
+    total = sum(len(values) for values in latencies.values())
+    everything = summarize([value for values in latencies.values() for value in values])
+    results['total'] = dict(everything, ops_per_s=round(total / elapsed, 1) if elapsed else 0.0)
+    return results, errors[0], elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga concurrente sobre el servicio de reservas.")
+    parser.add_argument('--clients', type=int, default=16, help="Clientes concurrentes (hilos).")
+    parser.add_argument('--requests', type=int, default=200, help="Peticiones por cliente.")
+    parser.add_argument('--rooms', type=int, default=200, help="Habitaciones sembradas.")
+    parser.add_argument('--customers', type=int, default=1000, help="Clientes sembrados.")
+    parser.add_argument('--workers', type=int, default=BOOKING_WORKERS, help="Hilos del servicio para la BD.")
+    parser.add_argument('--url', help="Usa un servicio ya corriendo (con datos sembrados) en lugar de levantar uno.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--allow-any-db', action='store_true', help="Permite vaciar una BD que no termina en _bench.")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        client = BookingClient(args.url)
+        room_ids = [room['room_id'] for room in client.rooms()]
+        emails = [make_customer(i).getEmail() for i in range(args.customers)]
+        client.close()
+        url = args.url
+    else:
+        target = SQLiteDatabase.path if DB_BACKEND == "sqlite" else DATABASE
+        disposable = target == ":memory:" or os.path.splitext(target)[0].endswith("_bench")
+        if not disposable and not args.allow_any_db:
+            parser.error(f"La BD '{target}' no termina en _bench y el benchmark la vaciaria; use DB_NAME=..._bench.")
+        reset_tables()
+        room_ids = RoomDAO().create_many(make_room(i) for i in range(args.rooms))
+        CustomerDAO().create_many(make_customer(i) for i in range(args.customers))
+        emails = [make_customer(i).getEmail() for i in range(args.customers)]
+        server = start_server(args.workers)
+        url = f"http://127.0.0.1:{server[0].port}"
+
+    try:
+        results, errors, elapsed = run(url, args.clients, args.requests, room_ids, emails, args.seed)
+    finally:
+        if server is not None:
+            stop_server(*server)
+
+    print(f"INFO: {args.clients} clientes x {args.requests} peticiones en {elapsed:.1f} s contra {url}.")
+    print(f"{'peticion':<12}{'muestras':>9}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind, stats in results.items():
+        print(f"{kind:<12}{stats['samples']:>9}{stats['ops_per_s']:>12,.1f}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+    if errors:
+        print(f"ERROR: {errors} peticiones fallaron.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Busqueda de clientes mientras se escribe (customer_search.py) sobre clientes sinteticos.
+
+No usa la BD: genera --customers filas con nombres y apellidos comunes
+(con acentos), telefono, email y CURP, construye el indice con add_rows y
+repite, letra por letra, consultas tipicas de recepcion: nombre y apellido,
+apellido con error de dedo, inicio de email, telefono y CURP. Reporta el
+tiempo de construccion, la memoria que ocupa y p50/p99 por tecla.
+
+    python benchmarks/bench_customer_search.py --customers 500000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import resource
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_dao import summarize
+from customer_search import CustomerSearchIndex
+
+FIRST_NAMES = ["María", "José", "Juan", "Ana", "Luis", "Sofía", "Carlos", "Lucía", "Jorge", "Valeria", "Miguel",
+               "Fernanda", "Andrés", "Camila", "Ramón", "Mónica", "Raúl", "Ximena", "Iván", "Renée"]
+LAST_NAMES = ["García", "Hernández", "López", "Martínez", "González", "Pérez", "Rodríguez", "Sánchez", "Ramírez",
+              "Cruz", "Flores", "Gómez", "Morales", "Vázquez", "Jiménez", "Reyes", "Díaz", "Torres", "Gutiérrez",
+              "Ruiz", "Mendoza", "Aguilar", "Ortiz", "Castillo", "Muñoz", "Romero", "Álvarez", "Chávez"]
+
+
+def make_row(i, seed=0):
+    rng = random.Random(seed * 10**9 + i)
+    first, last, second_last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(LAST_NAMES)
+    email = f"{first[0]}{last}{i}@mail.com".lower()
+    return (i + 1, first, "", last, second_last, f"55{i:08d}", email, f"{last[:2].upper()}{i:016d}")
+
+
+def typed(text):
+    """Cada estado de la caja de busqueda al escribir `text`, desde la segunda letra."""
+    return [text[:end] for end in range(2, len(text) + 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Busqueda de clientes mientras se escribe.")
+    parser.add_argument('--customers', type=int, default=500000)
+    parser.add_argument('--queries', type=int, default=200, help="Consultas completas; cada una se teclea letra por letra.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    index = CustomerSearchIndex(watch=False)
+    index.add_rows(make_row(i, args.seed) for i in range(args.customers))
+    built = time.perf_counter() - started
+    # Como las aplicaciones al terminar de arrancar (execute.py, booking_server.py).
+    gc.collect()
+    gc.freeze()
+    grown = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    print(f"INFO: indice de {len(index):,} clientes en {built:.1f} s, +{grown / 1024:,.0f} MB de RSS.")
+
+    kinds = {
+        'nombre': lambda i: f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        'error': lambda i: (lambda name: name[:2] + name[3] + name[2] + name[4:])(rng.choice(LAST_NAMES).lower()),
+        'email': lambda i: make_row(rng.randrange(args.customers), args.seed)[6],
+        'telefono': lambda i: f"55 {rng.randrange(args.customers):08d}",
+        'curp': lambda i: make_row(rng.randrange(args.customers), args.seed)[7],
+    }
+    print(f"{'consulta':<12}{'teclas':>9}{'p50 ms':>10}{'p99 ms':>10}{'sin resultado':>15}")
+    for kind, make_query in kinds.items():
+        latencies, empty = [], 0
+        for i in range(args.queries):
+            for text in typed(make_query(i)):
+                started = time.perf_counter()
+                results = index.search(text)
+                latencies.append(time.perf_counter() - started)
+                empty += not results
+        stats = summarize(latencies)
+        print(f"{kind:<12}{stats['samples']:>9}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}{empty:>15}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
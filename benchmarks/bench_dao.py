@@ -0,0 +1,277 @@
+"""
+Mide el costo de los DAOs contra una BD local: create, get_all, get_by_id y
+delete de cada DAO (los que los tienen), incluido el get_all con JOIN de
+ReservationDAO.
+
+Para cada tamano vacia las tablas, siembra N filas sinteticas por tabla con
+create_many y reporta operaciones por segundo y latencias p50/p99. Con
+--baseline compara contra resultados guardados y termina con codigo 1 si
+alguna operacion se volvio mas lenta que la tolerancia.
+
+Borra datos: solo corre contra una BD cuyo nombre termine en "_bench"
+(DB_NAME=hotel_le_villa_bench), salvo que se pase --allow-any-db. Con
+DB_BACKEND=sqlite y SQLITE_PATH=":memory:" corre sin servidor, en una BD
+desechable dentro del proceso.
+
+    python benchmarks/bench_dao.py --sizes 1000 100000 1000000
+    python benchmarks/bench_dao.py --sizes 1000 --save-baseline benchmarks/baseline_dao.json
+    python benchmarks/bench_dao.py --sizes 1000 --baseline benchmarks/baseline_dao.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from customer import Customer
+from receptionist import Receptionist
+from reservation import Reservation
+from room import Room
+from service import Service
+from db_connection import get_conn, close_conn
+from dao.customer_dao import CustomerDAO
+from dao.employee_dao import EmployeeDAO
+from dao.identity_map import IdentityMap
+from dao.reservation_dao import ReservationDAO
+from dao.room_dao import RoomDAO
+from dao.ServiceDAO import ServiceDAO
+from sqlite_backend import SQLiteDatabase
+from mysql_env import DATABASE, DB_BACKEND
+
+# Hijas antes que padres, por las llaves foraneas.
+TABLES = ("ROOM_NIGHTS", "RESERVATIONS", "PAYMENTS", "CUSTOMERS", "EMPLOYEES", "SERVICES", "ROOMS", "CHANGE_TOMBSTONES")
+# Las estancias sembradas empiezan aqui; las que crea el benchmark, en SAMPLE_START, para no chocar en ROOM_NIGHTS.
+SEED_START = date(2025, 1, 1)
+SAMPLE_START = date(2040, 1, 1)
+
+
+def make_room(i):
+    return Room(0, f"B{i}", ("Sencilla", "Doble", "Suite")[i % 3], "Available", 120.0, "")
+
+
+def make_service(i):
+    return Service(0, f"Servicio {i}", 50.0, "")
+
+
+def make_customer(i):
+    return Customer(0, f"Nombre{i}", "", f"Apellido{i}", "", f"55{i:08d}", f"bench{i}@mail.com", "Queretaro", f"CURP{i:014d}", "x")
+
+
+def make_employee(i):
+    return Receptionist(0, f"Nombre{i}", "", f"Apellido{i}", "", f"55{i:08d}", f"bench{i}@hotel.com", "Activo", f"CURP{i:014d}", "x")
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango mas cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies, rows=1):
+    """Latencias en segundos -> ops/s (o filas/s si cada llamada trae `rows`), p50 y p99 en ms."""
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        'samples': len(latencies),
+        'ops_per_s': round(len(latencies) * rows / total, 1) if total else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def timed(call, *args):
+    started = time.perf_counter()
+    result = call(*args)
+    return time.perf_counter() - started, result
+
+
+def reset_tables():
+    if DB_BACKEND == "sqlite" and SQLiteDatabase.path == ":memory:":
+        # Una BD en memoria nueva ya viene vacia y con el esquema.
+        SQLiteDatabase.reset()
+    else:
+        conn = get_conn()
+        cursor = conn.cursor()
+        try:
+            if DB_BACKEND == "sqlite":
+                for table in TABLES:
+                    cursor.execute(f"DELETE FROM {table}")
+                cursor.execute("DELETE FROM sqlite_sequence")
+            else:
+                cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+                for table in TABLES:
+                    cursor.execute(f"TRUNCATE TABLE {table}")
+                cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+            conn.commit()
+        finally:
+            cursor.close()
+            close_conn(conn)
+    IdentityMap.reset()
+    ServiceDAO.cache.clear()
+    EmployeeDAO.cache.clear()
+
+
+def seed(size):
+    """N filas por tabla; la reserva i ocupa una noche de la habitacion i con el cliente i."""
+    rooms = RoomDAO().create_many(make_room(i) for i in range(size))
+    services = ServiceDAO().create_many(make_service(i) for i in range(size))
+    customers = CustomerDAO().create_many(make_customer(i) for i in range(size))
+    employees = EmployeeDAO().create_many(make_employee(i) for i in range(size))
+    # Solo referencias por id: create_many no necesita las entidades completas de cliente y habitacion.
+    pairs = ((Reservation(0, (SEED_START + timedelta(days=i % 365)).isoformat(),
+                          (SEED_START + timedelta(days=i % 365 + 1)).isoformat(),
+                          Customer(customers[i], "", "", "", "", "", "", "", ""),
+                          Room(rooms[i], "", ""), None, 120.0), 120.0)
+             for i in range(min(len(rooms), len(customers))))
+    reservations = ReservationDAO().create_many(pairs)
+    IdentityMap.reset()
+    return {'RoomDAO': rooms, 'ServiceDAO': services, 'CustomerDAO': customers,
+            'EmployeeDAO': employees, 'ReservationDAO': reservations}
+
+
+def reservation_factory(ids):
+    rooms, customers = ids['RoomDAO'], ids['CustomerDAO']
+
+    def make(i):
+        check_in = SAMPLE_START + timedelta(days=i)
+        return Reservation(0, check_in.isoformat(), (check_in + timedelta(days=1)).isoformat(),
+                           Customer(customers[i % len(customers)], "", "", "", "", "", "", "", ""),
+                           Room(rooms[i % len(rooms)], "", ""))
+    return make
+
+
+def bench_dao(name, dao, ids, samples, scans, rng):
+    results = {}
+    factories = {'RoomDAO': make_room, 'ServiceDAO': make_service, 'CustomerDAO': make_customer,
+                 'EmployeeDAO': make_employee, 'ReservationDAO': reservation_factory(ids)}
+    offset = len(ids[name]) + 1
+
+    created = []
+    latencies = []
+    for i in range(samples):
+        entity = factories[name](offset + i)
+        args = (entity, 120.0) if name == 'ReservationDAO' else (entity,)
+        elapsed, new_id = timed(dao.create, *args)
+        latencies.append(elapsed)
+        if new_id:
+            created.append(new_id)
+    results['create'] = summarize(latencies)
+
+    if hasattr(dao, 'get_by_id') and ids[name]:
+        latencies = []
+        for entity_id in rng.choices(ids[name], k=samples):
+            # Se mide la ida a la BD, no el acierto en la cache de entidades.
+            IdentityMap.reset()
+            if hasattr(dao, 'cache'):
+                dao.cache.clear()
+            latencies.append(timed(dao.get_by_id, entity_id)[0])
+        results['get_by_id'] = summarize(latencies)
+
+    latencies = []
+    rows = 0
+    for _ in range(scans):
+        IdentityMap.reset()
+        elapsed, loaded = timed(dao.get_all)
+        latencies.append(elapsed)
+        rows = len(loaded)
+        del loaded
+    results['get_all'] = dict(summarize(latencies, rows), rows=rows)
+
+    if hasattr(dao, 'delete'):
+        latencies = [timed(dao.delete, entity_id)[0] for entity_id in created]
+        results['delete'] = summarize(latencies)
+    IdentityMap.reset()
+    return results
+
+
+def run(sizes, samples, scans, only=None, seed_value=0):
+    daos = {'RoomDAO': RoomDAO(), 'ServiceDAO': ServiceDAO(), 'CustomerDAO': CustomerDAO(),
+            'EmployeeDAO': EmployeeDAO(), 'ReservationDAO': ReservationDAO()}
+    results = {}
+    for size in sizes:
+        reset_tables()
+        started = time.perf_counter()
+        ids = seed(size)
+        print(f"INFO: {size:,} filas por tabla sembradas en {time.perf_counter() - started:.1f} s.")
+        rng = random.Random(seed_value)
+        for name, dao in daos.items():
+            if only and name not in only:
+                continue
+            for operation, stats in bench_dao(name, dao, ids, samples, scans, rng).items():
+                results[f"{size}/{name}/{operation}"] = stats
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Filas (llave, metrica, base, actual, cambio) y cuantas pasan de la tolerancia."""
+    rows = []
+    regressions = 0
+    for key, stats in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ('p50_ms', 'p99_ms'):
+            if not previous.get(metric):
+                continue
+            change = stats[metric] / previous[metric] - 1.0
+            regressed = change > tolerance
+            regressions += regressed
+            rows.append((key, metric, previous[metric], stats[metric], change, regressed))
+    return rows, regressions
+
+
+def print_results(results):
+    print(f"{'tamano/dao/operacion':<38}{'muestras':>9}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for key, stats in results.items():
+        print(f"{key:<38}{stats['samples']:>9}{stats['ops_per_s']:>12,.1f}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los DAOs contra una BD local.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000], help="Filas sembradas por tabla (p. ej. 1000 100000 1000000).")
+    parser.add_argument('--samples', type=int, default=200, help="Llamadas medidas de create, get_by_id y delete.")
+    parser.add_argument('--scans', type=int, default=3, help="Repeticiones de get_all.")
+    parser.add_argument('--dao', action='append', help="Limita a este DAO (se puede repetir).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help="JSON con resultados previos para comparar.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Aumento de latencia permitido (0.25 = 25%%).")
+    parser.add_argument('--save-baseline', help="Guarda los resultados en este JSON.")
+    parser.add_argument('--allow-any-db', action='store_true', help="Permite vaciar una BD que no termina en _bench.")
+    args = parser.parse_args(argv)
+
+    target = SQLiteDatabase.path if DB_BACKEND == "sqlite" else DATABASE
+    disposable = target == ":memory:" or os.path.splitext(target)[0].endswith("_bench")
+    if not disposable and not args.allow_any_db:
+        parser.error(f"La BD '{target}' no termina en _bench y el benchmark la vaciaria; use DB_NAME=..._bench.")
+
+    results = run(args.sizes, args.samples, args.scans, args.dao, args.seed)
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as stream:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results},
+                      stream, indent=2, sort_keys=True)
+        print(f"INFO: Resultados guardados en {args.save_baseline}.")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as stream:
+            baseline = json.load(stream)['results']
+        rows, regressions = compare(results, baseline, args.tolerance)
+        print(f"\n{'tamano/dao/operacion':<38}{'metrica':>8}{'base':>10}{'actual':>10}{'cambio':>9}")
+        for key, metric, before, after, change, regressed in rows:
+            print(f"{key:<38}{metric:>8}{before:>10.3f}{after:>10.3f}{change:>+8.0%}{'  <-- mas lento' if regressed else ''}")
+        if regressions:
+            print(f"ERROR: {regressions} metricas empeoraron mas de {args.tolerance:.0%} contra la linea base.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
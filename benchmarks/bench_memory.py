@@ -0,0 +1,112 @@
+"""
+Mide la memoria por entidad del modelo de dominio.
+
+Construye N instancias de cada clase con datos parecidos a los de la BD
+(tipos, estados y fechas repetidos) y reporta los bytes asignados por
+entidad segun tracemalloc.
+
+    python benchmarks/bench_memory.py --sizes 100000 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from customer import Customer
+from employee import Employee
+from room import Room
+from reservation import Reservation
+from payment import Payment
+from service import Service
+from reservationService import ServiceReservation
+
+ROOM_TYPES = ("Sencilla", "Doble", "Suite")
+STATES = ("Queretaro", "Jalisco", "Nuevo Leon", "CDMX")
+
+
+def _text(value, i):
+    # Copia nueva del texto, como la que entrega el conector por cada fila (no un literal compartido).
+    return "".join(list(value))
+
+
+def make_customer(i):
+    return Customer(i, f"Nombre{i}", "", f"Apellido{i}", "", f"55{i:08d}", f"cliente{i}@mail.com",
+                    _text(STATES[i % 4], i), f"CURP{i:014d}", "")
+
+
+def make_employee(i):
+    return Employee(i, f"Nombre{i}", "", f"Apellido{i}", "", f"55{i:08d}", f"empleado{i}@hotel.com",
+                    _text("Active", i), f"CURP{i:014d}", "")
+
+
+def make_room(i):
+    return Room(i, str(100 + i), _text(ROOM_TYPES[i % 3], i), _text("Available", i), 120.0, "")
+
+
+def make_service(i):
+    return Service(i, _text(("Spa", "Gimnasio", "Lavanderia")[i % 3], i), 50.0, "")
+
+
+def make_payment(i):
+    return Payment(i, 240.0, _text(("Tarjeta", "Efectivo")[i % 2], i))
+
+
+def make_reservation_factory():
+    customer = make_customer(0)
+    room = make_room(0)
+
+    def make_reservation(i):
+        day = 1 + i % 28
+        return Reservation(i, f"2025-03-{day:02d}", f"2025-03-{day + 1:02d}", customer, room, None, 240.0)
+    return make_reservation
+
+
+def make_service_reservation_factory():
+    customer = make_customer(0)
+    service = make_service(0)
+    return lambda i: ServiceReservation(i, f"2025-03-{1 + i % 28:02d} 10:00", customer, service)
+
+
+FACTORIES = {
+    'Customer': make_customer,
+    'Employee': make_employee,
+    'Room': make_room,
+    'Service': make_service,
+    'Payment': make_payment,
+    'Reservation': make_reservation_factory(),
+    'ServiceReservation': make_service_reservation_factory(),
+}
+
+
+def measure(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Se descuenta la lista que sostiene a las instancias.
+    list_bytes = sys.getsizeof(entities)
+    del entities
+    return (after - before - list_bytes) / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bytes por entidad del modelo de dominio.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--entity', choices=sorted(FACTORIES), action='append',
+                        help="Entidad a medir (se puede repetir); por defecto todas.")
+    args = parser.parse_args(argv)
+
+    names = args.entity or list(FACTORIES)
+    print(f"{'entidad':<20}" + "".join(f"{n:>14,}" for n in args.sizes))
+    for name in names:
+        row = [measure(FACTORIES[name], n) for n in args.sizes]
+        print(f"{name:<20}" + "".join(f"{b:>12.1f} B" for b in row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Cliente del servicio de reservas (booking_server.py).
+
+BookingClient tiene los mismos metodos que BookingService y lanza las mismas
+excepciones (ValueError, LookupError, RoomNotAvailableError), asi que la GUI
+usa uno u otro sin cambiar: con BOOKING_SERVICE_URL configurado corre como
+cliente ligero y no abre su propio pool ni carga tablas para reservar.
+
+Cada hilo conserva su conexion HTTP keep-alive. Si el servidor cerro una
+conexion inactiva, las consultas (GET) se reintentan una vez; las escrituras
+no, porque no se sabe si llegaron a aplicarse.
+"""
+import http.client
+import json
+import threading
+from urllib.parse import urlencode, urlsplit
+
+from booking_service import room_from_dict, service_from_dict
+from customer_search import SEARCH_LIMIT
+from dao.reservation_dao import RoomNotAvailableError
+from mysql_env import BOOKING_SERVICE_URL, BOOKING_TIMEOUT, PAGE_SIZE
+
+
+class BookingServiceError(RuntimeError):
+    """El servicio fallo o no responde."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+ERRORS_BY_STATUS = {400: ValueError, 404: LookupError, 409: RoomNotAvailableError}
+
+
+def load_remote_data(client):
+    """
+    Como booking_service.load_data, pero con los catalogos del servicio: la GUI
+    como cliente ligero no abre su propio pool. Los usuarios se validan con
+    BookingClient.login y las reservas viven en el servicio.
+    """
+    return {
+        'customers': {},
+        'employees': {},
+        'rooms': {room['room_id']: room_from_dict(room) for room in client.rooms()},
+        'reservations': {},
+        'service_reservations': {},
+        'services': {service['service_id']: service_from_dict(service) for service in client.services()},
+    }
+
+
+class BookingClient:
+
+    def __init__(self, base_url=BOOKING_SERVICE_URL, timeout=BOOKING_TIMEOUT):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise ValueError(f"URL del servicio de reservas invalida: '{base_url}'.")
+        self.base_url = base_url
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._prefix = parts.path.rstrip('/')
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _send(self, method, path, body):
+        conn = self._connection()
+        headers = {'Accept': 'application/json'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        try:
+            conn.request(method, self._prefix + path, body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            self.close()
+            raise
+
+    def request(self, method, path, params=None, payload=None):
+        """Llama al servicio y devuelve el JSON de la respuesta; los errores se traducen a excepciones."""
+        if params:
+            path += "?" + urlencode({key: value for key, value in params.items() if value is not None})
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        try:
+            try:
+                status, data = self._send(method, path, body)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if method != 'GET':
+                    raise
+                status, data = self._send(method, path, body)
+        except (http.client.HTTPException, OSError) as err:
+            raise BookingServiceError(f"No se pudo contactar al servicio de reservas en {self.base_url}: {err}") from err
+
+        try:
+            result = json.loads(data) if data else None
+        except ValueError:
+            raise BookingServiceError(f"Respuesta invalida del servicio ({status}).", status) from None
+        if status >= 400:
+            message = result.get('error') if isinstance(result, dict) else None
+            error = ERRORS_BY_STATUS.get(status)
+            if error is not None:
+                raise error(message)
+            raise BookingServiceError(message or f"El servicio respondio {status}.", status)
+        return result
+
+    def health(self):
+        return self.request('GET', '/health')
+
+    def rooms(self):
+        return self.request('GET', '/rooms')
+
+    def room_types(self):
+        return sorted({room['room_type'] for room in self.rooms()})
+
+    def services(self):
+        return self.request('GET', '/services')
+
+    def available_rooms(self, check_in, check_out, room_type=None):
+        return self.request('GET', '/rooms/available',
+                            {'check_in': check_in, 'check_out': check_out, 'room_type': room_type})
+
+    def quote(self, room_id, check_in, check_out, service_id=None):
+        return self.request('GET', '/quote', {'room_id': room_id, 'check_in': check_in, 'check_out': check_out,
+                                              'service_id': service_id})
+
+    def customer(self, email):
+        return self.request('GET', '/customers', {'email': email})
+
+    def search_customers(self, query, limit=SEARCH_LIMIT):
+        return self.request('GET', '/customers/search', {'q': query, 'limit': limit})
+
+    def login(self, kind, email, password):
+        return self.request('POST', '/login', payload={'kind': kind, 'email': email, 'password': password})
+
+    def reservation(self, reservation_id):
+        return self.request('GET', f"/reservations/{int(reservation_id)}")
+
+    def cancel_reservation(self, reservation_id):
+        return self.request('DELETE', f"/reservations/{int(reservation_id)}")
+
+    def get_summary_page(self, sort='id', descending=False, search="", after=None, limit=PAGE_SIZE):
+        params = {'sort': sort, 'descending': int(bool(descending)), 'search': search or None, 'limit': limit}
+        if after is not None:
+            params['after'], params['after_id'] = json.dumps(after[0]), after[1]
+        return [tuple(row) for row in self.request('GET', '/reservations', params)]
+
+    def occupancy(self, start, end):
+        return self.request('GET', '/occupancy', {'start': str(start), 'end': str(end)})
+
+    def register_customer(self, first_name, last_name, email, password, phone="", state="", curp=""):
+        return self.request('POST', '/customers', payload={
+            'first_name': first_name, 'last_name': last_name, 'email': email, 'password': password,
+            'phone': phone, 'state': state, 'curp': curp})
+
+    def register_employee(self, role, first_name, last_name, email, password, phone="", status="", curp="",
+                          middle_name="", second_last_name=""):
+        return self.request('POST', '/employees', payload={
+            'role': role, 'first_name': first_name, 'last_name': last_name, 'email': email, 'password': password,
+            'phone': phone, 'status': status, 'curp': curp, 'middle_name': middle_name,
+            'second_last_name': second_last_name})
+
+    def book(self, email, room_id, check_in, check_out, payment_method, service_id=None):
+        return self.request('POST', '/bookings', payload={
+            'email': email, 'room_id': room_id, 'check_in': str(check_in), 'check_out': str(check_out),
+            'payment_method': payment_method, 'service_id': service_id})
+
+    def book_service(self, email, service_id, date_time, payment_method):
+        return self.request('POST', '/service-bookings', payload={
+            'email': email, 'service_id': service_id, 'date_time': date_time, 'payment_method': payment_method})
@@ -0,0 +1,360 @@
+"""
+Servicio de reservas sin interfaz: API HTTP/JSON local sobre BookingService.
+
+Un solo proceso carga los catalogos, el indice de disponibilidad y las tarifas
+una vez y atiende a todas las terminales con un solo pool de conexiones; las
+GUI corren como clientes ligeros (BOOKING_SERVICE_URL, ver booking_client.py).
+
+El bucle de asyncio solo lee peticiones y escribe respuestas (HTTP/1.1 con
+keep-alive). Cada llamada a BookingService corre en un ThreadPoolExecutor del
+tamano de BOOKING_WORKERS, porque los DAOs son bloqueantes; con el mismo
+tamano que el pool nadie espera conexion dentro del servicio.
+
+    GET  /health
+    GET  /rooms
+    GET  /rooms/available?check_in=AAAA-MM-DD&check_out=AAAA-MM-DD[&room_type=...]
+    GET  /quote?room_id=1&check_in=...&check_out=...[&service_id=2]
+    GET  /services
+    GET  /customers?email=...
+    GET  /customers/search?q=...[&limit=10]
+    GET  /reservations?sort=id[&descending=1][&search=...][&after=<json>&after_id=7][&limit=50]
+    GET  /reservations/<id>
+    DELETE /reservations/<id>
+    GET  /occupancy?start=AAAA-MM-DD&end=AAAA-MM-DD
+    POST /login              {"kind": "Customer"|"Employee", "email", "password"}
+    POST /customers          {"first_name", "last_name", "email", "password"[, "phone", "state", "curp"]}
+    POST /employees          {"role", "first_name", "last_name", "email", "password"[, "phone", "status", "curp", ...]}
+    POST /bookings           {"email", "room_id", "check_in", "check_out", "payment_method"[, "service_id"]}
+    POST /service-bookings   {"email", "service_id", "date_time", "payment_method"}
+
+Errores: 400 datos invalidos, 404 no existe, 409 habitacion ocupada, 503 BD no
+disponible. El cuerpo siempre es JSON; los errores traen {"error": mensaje}.
+
+    python booking_server.py [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+import mysql.connector
+
+from booking_service import BookingService, make_sync, parse_id
+from customer_search import SEARCH_LIMIT
+from db_connection import warm_up
+from dao.instrumentation import configure_logging, metrics as dao_metrics
+from dao.reservation_dao import RoomNotAvailableError
+from mysql_env import BOOKING_HOST, BOOKING_PORT, BOOKING_WORKERS, PAGE_SIZE, SYNC_INTERVAL
+
+log = logging.getLogger(__name__)
+
+# Tope del cuerpo de una peticion; las de este API caben de sobra.
+MAX_BODY_BYTES = 64 * 1024
+# Segundos que una conexion keep-alive puede quedar sin peticiones.
+IDLE_TIMEOUT = 30.0
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def error_status(err):
+    """Codigo HTTP para una excepcion de BookingService."""
+    if isinstance(err, HTTPError):
+        return err.status
+    if isinstance(err, RoomNotAvailableError):
+        return 409
+    if isinstance(err, LookupError):
+        return 404
+    if isinstance(err, ValueError):
+        return 400
+    if isinstance(err, mysql.connector.Error):
+        return 503
+    return 500
+
+
+def _require(payload, *fields):
+    missing = [field for field in fields if payload.get(field) in (None, "")]
+    if missing:
+        raise HTTPError(400, f"Faltan campos: {', '.join(missing)}.")
+    return [payload[field] for field in fields]
+
+
+class BookingServer:
+    """Rutas del API y ciclo de vida del servidor asyncio."""
+
+    def __init__(self, service, host=BOOKING_HOST, port=BOOKING_PORT, workers=BOOKING_WORKERS, sync=None):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.sync = sync
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="booking-worker")
+        self._server = None
+        self._sync_task = None
+        self._connections = set()
+        self._routes = {
+            ('GET', '/health'): self._health,
+            ('GET', '/rooms'): lambda query, body: self.service.rooms(),
+            ('GET', '/rooms/available'): self._available,
+            ('GET', '/quote'): self._quote,
+            ('GET', '/services'): lambda query, body: self.service.services(),
+            ('GET', '/customers'): lambda query, body: self.service.customer(*_require(query, 'email')),
+            ('GET', '/customers/search'): self._search_customers,
+            ('GET', '/reservations'): self._reservation_page,
+            ('GET', '/occupancy'): self._occupancy,
+            ('POST', '/login'): self._login,
+            ('POST', '/customers'): self._register_customer,
+            ('POST', '/employees'): self._register_employee,
+            ('POST', '/bookings'): self._book,
+            ('POST', '/service-bookings'): self._book_service,
+        }
+
+    # --- rutas (corren en el executor) ---
+
+    def _health(self, query, body):
+        return {'status': 'ok', 'rooms': len(self.service.data['rooms'])}
+
+    def _available(self, query, body):
+        check_in, check_out = _require(query, 'check_in', 'check_out')
+        return self.service.available_rooms(check_in, check_out, query.get('room_type'))
+
+    def _quote(self, query, body):
+        room_id, check_in, check_out = _require(query, 'room_id', 'check_in', 'check_out')
+        return self.service.quote(room_id, check_in, check_out, query.get('service_id'))
+
+    def _search_customers(self, query, body):
+        return self.service.search_customers(query.get('q', ""), query.get('limit', SEARCH_LIMIT))
+
+    def _reservation_page(self, query, body):
+        # Las fechas viajan como texto y el costo como numero; `after` es la llave de la ultima fila
+        # recibida en JSON, para que conserve su tipo al compararse en la BD.
+        after = None
+        if 'after' in query:
+            try:
+                after = (json.loads(query['after']), parse_id(query.get('after_id'), 'after_id'))
+            except ValueError as err:
+                raise HTTPError(400, f"Cursor invalido: {err}") from None
+        rows = self.service.get_summary_page(query.get('sort', 'id'), query.get('descending') == '1',
+                                             query.get('search', ""), after, query.get('limit', PAGE_SIZE))
+        return [[row_id, customer, room, str(check_in), str(check_out), float(cost)]
+                for row_id, customer, room, check_in, check_out, cost in rows]
+
+    def _occupancy(self, query, body):
+        return self.service.occupancy(*_require(query, 'start', 'end'))
+
+    def _login(self, query, body):
+        kind, email = _require(body, 'kind', 'email')
+        return self.service.login(kind, email, body.get('password', ""))
+
+    def _register_customer(self, query, body):
+        fields = _require(body, 'first_name', 'last_name', 'email', 'password')
+        optional = {key: body[key] for key in ('phone', 'state', 'curp') if key in body}
+        return 201, self.service.register_customer(*fields, **optional)
+
+    def _register_employee(self, query, body):
+        fields = _require(body, 'role', 'first_name', 'last_name', 'email', 'password')
+        optional = {key: body[key] for key in ('phone', 'status', 'curp', 'middle_name', 'second_last_name') if key in body}
+        return 201, self.service.register_employee(*fields, **optional)
+
+    def _book(self, query, body):
+        fields = _require(body, 'email', 'room_id', 'check_in', 'check_out', 'payment_method')
+        return 201, self.service.book(*fields, service_id=body.get('service_id'))
+
+    def _book_service(self, query, body):
+        return 201, self.service.book_service(*_require(body, 'email', 'service_id', 'date_time', 'payment_method'))
+
+    def _reservation(self, method, reservation_id):
+        if method == 'DELETE':
+            return lambda query, body: self.service.cancel_reservation(reservation_id)
+        return lambda query, body: self.service.reservation(reservation_id)
+
+    def route(self, method, path):
+        handler = self._routes.get((method, path))
+        if handler is not None:
+            return handler
+        if path.startswith('/reservations/') and path.count('/') == 2:
+            if method not in ('GET', 'DELETE'):
+                raise HTTPError(405, f"Metodo {method} no permitido en {path}.")
+            return self._reservation(method, path.rsplit('/', 1)[1])
+        if any(known == path for _, known in self._routes):
+            raise HTTPError(405, f"Metodo {method} no permitido en {path}.")
+        raise HTTPError(404, f"Ruta desconocida: {path}.")
+
+    def call(self, method, target, body):
+        """Resuelve y ejecuta una peticion; devuelve (status, objeto JSON). Es bloqueante."""
+        try:
+            parts = urlsplit(target)
+            handler = self.route(method, parts.path.rstrip('/') or '/')
+            if body:
+                try:
+                    body = json.loads(body)
+                except ValueError:
+                    raise HTTPError(400, "El cuerpo no es JSON valido.") from None
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "El cuerpo debe ser un objeto JSON.")
+            result = handler(dict(parse_qsl(parts.query)), body or {})
+        except Exception as err:
+            status = error_status(err)
+            if status == 500:
+                log.exception("Error atendiendo %s %s", method, target)
+                return 500, {'error': "Error interno del servicio."}
+            log.log(logging.WARNING if status >= 500 else logging.DEBUG, "%s %s -> %s: %s", method, target, status, err)
+            return status, {'error': str(err)}
+        if isinstance(result, tuple):
+            return result
+        return 200, result
+
+    # --- protocolo ---
+
+    async def _read_request(self, reader):
+        """(metodo, destino, cuerpo, keep_alive) o None si el cliente cerro la conexion."""
+        line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Linea de peticion invalida.") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(400, "Content-Length invalido.") from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"El cuerpo excede {MAX_BODY_BYTES} bytes.")
+        body = await reader.readexactly(length) if length else b''
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method.upper(), target, body, keep_alive
+
+    @staticmethod
+    def _response(status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode('latin-1') + data
+
+    async def _handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as err:
+                    writer.write(self._response(err.status, {'error': str(err)}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                started = time.perf_counter()
+                status, payload = await loop.run_in_executor(self._executor, self.call, method, target, body)
+                log.debug("%s %s -> %s (%.1f ms)", method, target, status, (time.perf_counter() - started) * 1000)
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _sync_loop(self, interval):
+        loop = asyncio.get_running_loop()
+        while self.sync.enabled:
+            await asyncio.sleep(interval)
+            try:
+                changes = await loop.run_in_executor(self._executor, self.sync.fetch)
+                applied = await loop.run_in_executor(self._executor, self.service.apply_changes, self.sync, changes)
+                if applied:
+                    log.info("Sincronizacion: %s cambios aplicados desde otras terminales.", applied)
+            except Exception as err:
+                log.warning("Fallo la sincronizacion incremental: %s", err)
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.sync is not None and self.sync.enabled and SYNC_INTERVAL > 0:
+            self._sync_task = asyncio.ensure_future(self._sync_loop(SYNC_INTERVAL))
+        log.info("Servicio de reservas escuchando en http://%s:%s", self.host, self.port)
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+        if self._server is not None:
+            self._server.close()
+            # Las conexiones keep-alive inactivas no terminan solas.
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+
+
+def load_customer_index(service):
+    service.load_customer_index()
+    # Catalogos e indice de clientes viven lo que el proceso: se sacan de las colecciones
+    # completas del GC, que si no pausan las peticiones al recorrerlos.
+    gc.collect()
+    gc.freeze()
+
+
+async def main_async(host, port, workers):
+    sync = make_sync()
+    if SYNC_INTERVAL > 0:
+        # La marca de agua se toma antes de la carga: lo que cambie mientras tanto llega en la primera sincronizacion.
+        sync.start()
+    service = BookingService.from_db()
+    server = await BookingServer(service, host, port, workers, sync).start()
+    # El indice de clientes se arma en segundo plano; mientras, las busquedas esperan y lo demas se atiende.
+    asyncio.get_running_loop().run_in_executor(None, load_customer_index, service)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+        log.debug("Metricas de los DAOs:\n%s", dao_metrics.format())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio de reservas con API HTTP/JSON.")
+    parser.add_argument('--host', default=BOOKING_HOST)
+    parser.add_argument('--port', type=int, default=BOOKING_PORT)
+    parser.add_argument('--workers', type=int, default=BOOKING_WORKERS, help="Hilos para las llamadas a la BD.")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    warm_up()
+    try:
+        asyncio.run(main_async(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        log.info("Servicio de reservas detenido.")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
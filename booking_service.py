@@ -0,0 +1,417 @@
+"""
+Logica de reservas sin interfaz grafica.
+
+BookingService concentra lo que antes vivia en las ventanas de execute.py:
+disponibilidad, cotizacion, reserva con su pago en una sola transaccion,
+pago de servicios y busquedas. Trabaja sobre los datos compartidos (catalogos,
+repositorios, indice de disponibilidad y tarifas) con un candado, asi que la
+pueden usar a la vez los hilos de la GUI o los del servidor HTTP
+(booking_server.py), que atiende a muchas terminales con una sola cache y un
+solo pool.
+
+Los metodos reciben y devuelven valores simples (str, int, float, dict) para
+que BookingClient pueda ofrecer la misma interfaz por HTTP. Los errores son
+ValueError (datos invalidos), LookupError (no existe) y RoomNotAvailableError
+(la habitacion ya esta ocupada en esas fechas).
+
+La busqueda de clientes (customer_search.py) se construye la primera vez que
+se usa, o antes con load_customer_index() para no hacer esperar al primero.
+Igual el almacen en columnas del reporte de ocupacion (reservation_store.py):
+se carga con el primer reporte y despues lo mantienen las reservas y la
+sincronizacion.
+"""
+import logging
+import threading
+from datetime import date, datetime
+
+from customer import Customer
+from bellboy import Bellboy
+from customer_search import CustomerSearchIndex, SEARCH_LIMIT
+from employee import Employee
+from mysql_env import PAGE_SIZE
+from occupancy_report import build_report
+from payment import Payment
+from reservation import Reservation
+from reservationService import ServiceReservation
+from reservation_store import ReservationStore
+from receptionist import Receptionist
+from room import Room
+from service import Service
+from pricing import RateCalendar, PricingEngine
+from repository import CustomerRepository, EmployeeRepository, ReservationRepository
+from room_availability import RoomAvailabilityIndex
+from sync import DeltaSync
+from dao.change_log import ChangeLogDAO
+from dao.customer_dao import CustomerDAO
+from dao.employee_dao import EmployeeDAO
+from dao.payment_dao import PaymentDAO
+from dao.reservation_dao import ReservationDAO, RoomNotAvailableError, stay_nights
+from dao.room_dao import RoomDAO
+from dao.ServiceDAO import ServiceDAO
+from dao.unit_of_work import UnitOfWork
+
+log = logging.getLogger(__name__)
+
+SERVICE_DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+# Puesto elegido en el registro de empleados -> clase de la entidad.
+EMPLOYEE_ROLES = {'Recepcionista': Receptionist, 'Botones': Bellboy, 'Servicio': Employee}
+
+
+def load_data():
+    """Catalogos completos (habitaciones y servicios) y repositorios bajo demanda para lo demas."""
+    return {
+        'customers': CustomerRepository(CustomerDAO()),
+        'employees': EmployeeRepository(EmployeeDAO()),
+        'rooms': {r.getId(): r for r in RoomDAO().get_all()},
+        'reservations': ReservationRepository(ReservationDAO()),
+        'service_reservations': {},
+        'services': {s.getId(): s for s in ServiceDAO().get_all()},
+    }
+
+
+def make_sync():
+    """DeltaSync de todas las tablas; llamar a start() antes de load_data para no perder cambios."""
+    return DeltaSync({Room: RoomDAO(), Service: ServiceDAO(), Customer: CustomerDAO(),
+                      Employee: EmployeeDAO(), Reservation: ReservationDAO()}, ChangeLogDAO())
+
+
+def parse_date(value, field):
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Fecha invalida en {field}: '{value}'. Use AAAA-MM-DD.") from None
+
+
+def parse_id(value, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Id invalido en {field}: '{value}'.") from None
+
+
+def room_to_dict(room, total=None):
+    data = {'room_id': room.getId(), 'room_number': room.getRoomNumber(), 'room_type': room.getType(),
+            'status': room.getStatus(), 'cost_per_night': float(room.getCost())}
+    if total is not None:
+        data['total'] = total
+    return data
+
+
+def service_to_dict(service):
+    return {'service_id': service.getId(), 'name': service.getType(), 'cost': float(service.getCost())}
+
+
+def customer_to_dict(customer):
+    # Nunca se expone la contrasena.
+    return {'customer_id': customer.getId(), 'name': customer.getName(), 'last_name': customer.getLastName(),
+            'email': customer.getEmail(), 'phone': customer.getPhone()}
+
+
+def employee_to_dict(employee):
+    return {'employee_id': employee.getId(), 'first_name': employee.getFirstName(),
+            'last_name': employee.getLastName(), 'email': employee.getEmail(), 'phone': employee.getPhone()}
+
+
+def room_from_dict(data):
+    return Room(data['room_id'], data['room_number'], data['room_type'], data['status'], data['cost_per_night'])
+
+
+def service_from_dict(data):
+    return Service(data['service_id'], data['name'], data['cost'], "")
+
+
+def customer_from_dict(data):
+    return Customer(data['customer_id'], data['name'], "", data['last_name'], "", data['phone'], data['email'], "", "", "")
+
+
+def employee_from_dict(data):
+    return Employee(data['employee_id'], data['first_name'], "", data['last_name'], "", data['phone'], data['email'], "", "")
+
+
+def reservation_to_dict(reservation):
+    payment = reservation.getPayment()
+    return {'reservation_id': reservation.getId(), 'customer_id': reservation.getCustomer().getId(),
+            'customer_email': reservation.getCustomer().getEmail(), 'room_id': reservation.getRoom().getId(),
+            'room_number': reservation.getRoom().getRoomNumber(), 'check_in': str(reservation.getCheckIn()),
+            'check_out': str(reservation.getCheckOut()), 'total_cost': reservation.getTotalCost(),
+            'payment_id': payment.getId() if isinstance(payment, Payment) else payment}
+
+
+def quote_to_dict(quote, service=None):
+    return {'room_id': quote.room.getId(), 'nights': quote.nights, 'room_subtotal': quote.room_subtotal,
+            'discount': quote.discount, 'service_id': service.getId() if service is not None else None,
+            'service_subtotal': quote.service_subtotal, 'total': round(quote.total, 2)}
+
+
+class BookingService:
+    """
+    Operaciones de reserva sobre datos compartidos. `data` es el diccionario de
+    load_data(); availability y pricing se construyen de el si no se pasan.
+    """
+
+    def __init__(self, data, availability=None, pricing=None, reservation_dao=None, payment_dao=None,
+                 customer_dao=None, employee_dao=None):
+        self.data = data
+        self.availability = availability or RoomAvailabilityIndex(data['rooms'].values(),
+                                                                  data['reservations'].between(date.today()))
+        self.pricing = pricing or PricingEngine(RateCalendar.from_rooms(data['rooms'].values()))
+        self.reservation_dao = reservation_dao or ReservationDAO()
+        self.payment_dao = payment_dao or PaymentDAO()
+        self.customer_dao = customer_dao or CustomerDAO()
+        self.employee_dao = employee_dao or EmployeeDAO()
+        self._lock = threading.RLock()
+        self._index_lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self.customer_index = None
+        self.reservation_store = None
+        self._next_service_reservation_id = max(data['service_reservations'], default=0) + 1
+
+    @classmethod
+    def from_db(cls):
+        return cls(load_data())
+
+    def apply_changes(self, sync, changes):
+        """Aplica un ChangeSet de DeltaSync a los datos compartidos; devuelve cuantos cambios trajo."""
+        with self._lock:
+            applied = sync.apply(changes, self.data, self.availability)
+            store = self.reservation_store
+            changed = changes.changed.get(Reservation, ())
+            stale = [r.getId() for r in changed] + list(changes.deleted.get(Reservation, ()))
+            if store is not None and stale:
+                store.remove(stale)
+                for reservation in changed:
+                    store.append(reservation)
+        index = self.customer_index
+        if index is not None:
+            for customer in changes.changed.get(Customer, ()):
+                index.add(customer)
+            for customer_id in changes.deleted.get(Customer, ()):
+                index.remove(customer_id)
+        return applied
+
+    def load_customer_index(self):
+        """Construye el indice de busqueda de clientes si aun no existe; los demas hilos esperan al primero."""
+        with self._index_lock:
+            if self.customer_index is None:
+                self.customer_index = CustomerSearchIndex.from_dao()
+        return self.customer_index
+
+    def load_reservation_store(self):
+        """Carga las reservas en columnas para el reporte de ocupacion si aun no estan."""
+        with self._store_lock:
+            if self.reservation_store is None:
+                store = ReservationStore.from_dao(self.reservation_dao)
+                with self._lock:
+                    self.reservation_store = store
+        return self.reservation_store
+
+    # --- consultas ---
+
+    def _room(self, room_id):
+        room = self.data['rooms'].get(parse_id(room_id, 'room_id'))
+        if room is None:
+            raise LookupError(f"Habitacion {room_id} no encontrada.")
+        return room
+
+    def _service(self, service_id):
+        if service_id in (None, ""):
+            return None
+        service = self.data['services'].get(parse_id(service_id, 'service_id'))
+        if service is None:
+            raise LookupError(f"Servicio {service_id} no encontrado.")
+        return service
+
+    def _customer(self, email):
+        email = str(email or "").strip()
+        if not email:
+            raise ValueError("Falta el email del cliente.")
+        customer = self.data['customers'].get(email)
+        if customer is None:
+            raise LookupError(f"Cliente no encontrado: {email}.")
+        return customer
+
+    def rooms(self):
+        with self._lock:
+            return [room_to_dict(room) for _, room in sorted(self.data['rooms'].items())]
+
+    def room_types(self):
+        with self._lock:
+            return self.availability.room_types()
+
+    def services(self):
+        with self._lock:
+            return [service_to_dict(service) for _, service in sorted(self.data['services'].items())]
+
+    def available_rooms(self, check_in, check_out, room_type=None):
+        """Habitaciones libres en [check_in, check_out) con el total de la estancia, si hay tarifa para esas fechas."""
+        start, end = parse_date(check_in, 'check_in'), parse_date(check_out, 'check_out')
+        with self._lock:
+            rooms = sorted(self.availability.available_rooms(start, end, room_type or None), key=lambda r: r.getId())
+            try:
+                quotes = self.pricing.quote_many(rooms, start, end)
+            except ValueError:
+                quotes = {}
+        return [room_to_dict(room, quotes.get(room.getId())) for room in rooms]
+
+    def quote(self, room_id, check_in, check_out, service_id=None):
+        start, end = parse_date(check_in, 'check_in'), parse_date(check_out, 'check_out')
+        stay_nights(start, end)
+        with self._lock:
+            service = self._service(service_id)
+            return quote_to_dict(self.pricing.quote(self._room(room_id), start, end, service), service)
+
+    def customer(self, email):
+        return customer_to_dict(self._customer(email))
+
+    def login(self, kind, email, password):
+        """Valida las credenciales de un huesped ("Customer") o empleado ("Employee")."""
+        if kind not in ("Customer", "Employee"):
+            raise ValueError(f"Tipo de acceso invalido: '{kind}'.")
+        email = str(email or "").strip()
+        if not email:
+            raise ValueError("Falta el email.")
+        user = self.data['customers' if kind == "Customer" else 'employees'].get(email)
+        if user is None or user.getPassword() != password:
+            raise LookupError("Credenciales invalidas.")
+        return customer_to_dict(user) if kind == "Customer" else employee_to_dict(user)
+
+    def search_customers(self, query, limit=SEARCH_LIMIT):
+        """Clientes por nombre, apellidos, telefono, email o CURP (prefijo, sin acentos, con errores de dedo)."""
+        index = self.customer_index if self.customer_index is not None else self.load_customer_index()
+        return index.search(query, parse_id(limit, 'limit'))
+
+    def get_summary_page(self, sort='id', descending=False, search="", after=None, limit=PAGE_SIZE):
+        """
+        Pagina del listado de reservas, con la firma de ReservationDAO.get_summary_page
+        para que ReservationListModel use el servicio o el cliente por igual.
+        """
+        return self.reservation_dao.get_summary_page(sort, descending, search, after, parse_id(limit, 'limit'))
+
+    def occupancy(self, start, end):
+        """Ocupacion, ADR, RevPAR e ingreso por tipo de habitacion en [start, end) (OccupancyReport.summary)."""
+        start, end = parse_date(start, 'start'), parse_date(end, 'end')
+        store = self.reservation_store if self.reservation_store is not None else self.load_reservation_store()
+        with self._lock:
+            return build_report(store, list(self.data['rooms'].values()), start, end).summary()
+
+    def reservation(self, reservation_id):
+        reservation = self.data['reservations'].get(parse_id(reservation_id, 'reservation_id'))
+        if reservation is None:
+            raise LookupError(f"Reserva {reservation_id} no encontrada.")
+        return reservation_to_dict(reservation)
+
+    # --- escrituras ---
+
+    def book(self, email, room_id, check_in, check_out, payment_method, service_id=None):
+        """
+        Reserva, pago y enlace en una sola transaccion: o se guardan los tres o
+        ninguno. La BD reclama las noches en ROOM_NIGHTS, asi que dos terminales
+        (o dos procesos del servicio) no pueden vender la misma noche aunque su
+        memoria este atrasada; en ese caso se lanza RoomNotAvailableError.
+        """
+        if not payment_method:
+            raise ValueError("Falta el metodo de pago.")
+        start, end = parse_date(check_in, 'check_in'), parse_date(check_out, 'check_out')
+        stay_nights(start, end)
+        customer = self._customer(email)
+        with self._lock:
+            room = self._room(room_id)
+            service = self._service(service_id)
+            if not self.availability.is_available(room.getId(), start, end):
+                raise RoomNotAvailableError(f"La habitacion {room.getRoomNumber()} no esta disponible para esas fechas.")
+            quote = self.pricing.quote(room, start, end, service)
+
+        total = round(quote.total, 2)
+        reservation = Reservation(None, start.isoformat(), end.isoformat(), customer, room, None, total)
+        payment = Payment(None, total, payment_method, reservation)
+        with UnitOfWork() as session:
+            self.reservation_dao.create(reservation, total, session=session)
+            self.payment_dao.create(payment, session=session)
+            if not self.reservation_dao.link_payment(reservation.getId(), payment.getId(), session=session):
+                raise RuntimeError("No se pudo asociar el pago a la reserva.")
+
+        reservation.setPayment(payment)
+        with self._lock:
+            customer.linkReservation(reservation)
+            self.data['reservations'][reservation.getId()] = reservation
+            self.availability.add(reservation)
+            if self.reservation_store is not None:
+                self.reservation_store.append(reservation)
+        log.debug("Reserva %s guardada con el pago %s.", reservation.getId(), payment.getId())
+        return dict(reservation_to_dict(reservation), quote=quote_to_dict(quote, service))
+
+    def cancel_reservation(self, reservation_id):
+        """Elimina una reserva y libera sus noches."""
+        reservation_id = parse_id(reservation_id, 'reservation_id')
+        if not self.reservation_dao.delete(reservation_id):
+            raise LookupError(f"No se pudo eliminar la reserva {reservation_id}.")
+        with self._lock:
+            del self.data['reservations'][reservation_id]
+            self.availability.remove(reservation_id)
+            if self.reservation_store is not None:
+                self.reservation_store.remove([reservation_id])
+        return {'reservation_id': reservation_id, 'deleted': True}
+
+    def _new_email(self, kind, email):
+        email = str(email or "").strip()
+        if not email:
+            raise ValueError("Falta el email.")
+        if self.data[kind].get(email) is not None:
+            raise ValueError(f"Ya existe un registro con el email {email}.")
+        return email
+
+    def register_customer(self, first_name, last_name, email, password, phone="", state="", curp=""):
+        """Da de alta un huesped; devuelve sus datos (sin contrasena) con el id asignado."""
+        if not first_name or not last_name or not password:
+            raise ValueError("Nombre, apellido, email y contrasena son obligatorios.")
+        customer = Customer(0, first_name, "", last_name, "", phone, self._new_email('customers', email), state, curp, password)
+        if not self.customer_dao.create(customer):
+            raise RuntimeError("No se pudo registrar al cliente.")
+        with self._lock:
+            self.data['customers'][customer.getEmail()] = customer
+        if self.customer_index is not None:
+            self.customer_index.add(customer)
+        return customer_to_dict(customer)
+
+    def register_employee(self, role, first_name, last_name, email, password, phone="", status="", curp="",
+                          middle_name="", second_last_name=""):
+        """Da de alta un empleado con el puesto `role` (ver EMPLOYEE_ROLES)."""
+        if role not in EMPLOYEE_ROLES:
+            raise ValueError(f"Puesto invalido: '{role}'.")
+        if not first_name or not last_name or not password:
+            raise ValueError("Nombre, apellido, email y contrasena son obligatorios.")
+        employee = EMPLOYEE_ROLES[role](0, first_name, middle_name, last_name, second_last_name, phone,
+                                        self._new_email('employees', email), status, curp, password)
+        if not self.employee_dao.create(employee):
+            raise RuntimeError("No se pudo registrar al empleado.")
+        with self._lock:
+            self.data['employees'][employee.getEmail()] = employee
+        return employee_to_dict(employee)
+
+    def book_service(self, email, service_id, date_time, payment_method):
+        """Solicitud de servicio con su pago; la solicitud vive en memoria, el pago se guarda en la BD."""
+        if not payment_method:
+            raise ValueError("Falta el metodo de pago.")
+        try:
+            datetime.strptime(str(date_time).strip(), SERVICE_DATETIME_FORMAT)
+        except ValueError:
+            raise ValueError(f"Fecha/hora invalida: '{date_time}'. Use AAAA-MM-DD HH:MM.") from None
+        customer = self._customer(email)
+        with self._lock:
+            service = self._service(service_id)
+            if service is None:
+                raise ValueError("Falta el servicio.")
+            request_id = self._next_service_reservation_id
+            self._next_service_reservation_id += 1
+
+        request = ServiceReservation(request_id, str(date_time).strip(), customer, service)
+        payment = Payment(None, float(service.getCost()), payment_method, request)
+        payment_id = self.payment_dao.create(payment)
+        if not payment_id:
+            raise RuntimeError("No se pudo guardar el pago del servicio.")
+        with self._lock:
+            customer.makeServiceReservation(request)
+            self.data['service_reservations'][request_id] = request
+        return {'service_reservation_id': request_id, 'payment_id': payment_id, 'service_id': service.getId(),
+                'customer_email': customer.getEmail(), 'date_time': request.getDateTime(), 'total': float(service.getCost())}
@@ -0,0 +1,149 @@
+"""
+Exportacion de reservas (con su cliente y habitacion) a CSV o NDJSON.
+
+Las filas del JOIN llegan en bloques desde ReservationDAO.iter_export_rows y se
+escriben tal cual: no se construyen Customer, Room ni Reservation y nunca hay
+mas de un bloque en memoria, asi que los extractos nocturnos para BI no
+dependen del tamano de la tabla. Las columnas se eligen de
+ReservationDAO.EXPORT_COLUMNS; password_hash no es exportable.
+
+La compresion se deduce de la extension (.gz, .bz2, .xz) y el formato del
+nombre sin ella (.ndjson/.jsonl; lo demas es CSV). "-" escribe a la salida
+estandar.
+
+    python bulk_export.py reservas.csv.gz
+    python bulk_export.py reservas.ndjson --columns reservation_id,check_in,total_cost,room_type
+    python bulk_export.py reservas_marzo.csv --start 2025-03-01 --end 2025-04-01
+"""
+import argparse
+import bz2
+import csv
+import gzip
+import json
+import logging
+import lzma
+import os
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from dao.instrumentation import configure_logging
+from dao.reservation_dao import ReservationDAO
+from dao.streaming import CHUNK_SIZE
+
+log = logging.getLogger(__name__)
+
+COMPRESSORS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+# Cada cuantas filas se informa el avance.
+PROGRESS_EVERY = 100000
+
+
+def split_path(path):
+    """(formato, compresor) a partir del nombre del archivo."""
+    base, ext = os.path.splitext(path.lower())
+    opener = COMPRESSORS.get(ext)
+    if opener is not None:
+        ext = os.path.splitext(base)[1]
+    return ("ndjson" if ext in (".ndjson", ".jsonl", ".json") else "csv"), opener
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def write_csv(stream, columns, rows):
+    writer = csv.writer(stream)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_ndjson(stream, columns, rows):
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(dict(zip(columns, map(_json_value, row))), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+WRITERS = {'csv': write_csv, 'ndjson': write_ndjson}
+
+
+def _with_progress(rows, every):
+    started = time.perf_counter()
+    for count, row in enumerate(rows, start=1):
+        if every and count % every == 0:
+            log.info("%s filas exportadas (%.0f filas/s)...", f"{count:,}", count / (time.perf_counter() - started))
+        yield row
+
+
+def export_reservations(stream, fmt="csv", columns=None, start=None, end=None, chunk_size=CHUNK_SIZE,
+                        progress_every=PROGRESS_EVERY, dao=None):
+    """Escribe las reservas en `stream` (texto) y devuelve cuantas filas se exportaron."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Formato de exportacion desconocido: {fmt}")
+    dao = dao or ReservationDAO()
+    columns = list(columns or dao.DEFAULT_EXPORT_COLUMNS)
+    rows = dao.iter_export_rows(columns, start, end, chunk_size)
+    return WRITERS[fmt](stream, columns, _with_progress(rows, progress_every))
+
+
+def export_file(path, fmt=None, **options):
+    """
+    Exporta a `path`; se escribe en un temporal y se renombra al terminar, asi
+    que un extracto que falla a la mitad no deja un archivo incompleto.
+    """
+    detected, opener = split_path(path)
+    fmt = fmt or detected
+    if path == "-":
+        return export_reservations(sys.stdout, fmt, **options)
+    partial = path + ".part"
+    try:
+        if opener is not None:
+            stream = opener(partial, 'wt', encoding='utf-8', newline='')
+        else:
+            stream = open(partial, 'w', encoding='utf-8', newline='')
+        with stream:
+            count = export_reservations(stream, fmt, **options)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return count
+
+
+def main(argv=None):
+    columns_help = ", ".join(ReservationDAO.EXPORT_COLUMNS)
+    parser = argparse.ArgumentParser(description="Exporta las reservas con su cliente y habitacion.")
+    parser.add_argument('path', help="Archivo de salida (.csv, .ndjson, opcionalmente .gz/.bz2/.xz) o - para la salida estandar.")
+    parser.add_argument('--format', choices=sorted(WRITERS), help="Por defecto se deduce de la extension.")
+    parser.add_argument('--columns', help=f"Columnas separadas por coma. Disponibles: {columns_help}.")
+    parser.add_argument('--start', type=date.fromisoformat, help="Solo entradas desde esta fecha (AAAA-MM-DD).")
+    parser.add_argument('--end', type=date.fromisoformat, help="Solo entradas antes de esta fecha (AAAA-MM-DD).")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Filas por lectura del cursor.")
+    parser.add_argument('--progress-every', type=int, default=PROGRESS_EVERY)
+    args = parser.parse_args(argv)
+
+    columns = [name.strip() for name in args.columns.split(",") if name.strip()] if args.columns else None
+    unknown = [name for name in columns or () if name not in ReservationDAO.EXPORT_COLUMNS]
+    if unknown:
+        parser.error(f"Columnas no exportables: {', '.join(unknown)}. Disponibles: {columns_help}.")
+
+    configure_logging()
+    started = time.perf_counter()
+    count = export_file(args.path, args.format, columns=columns, start=args.start, end=args.end,
+                        chunk_size=args.chunk_size, progress_every=args.progress_every)
+    log.info("%s reservas exportadas a %s en %.1f s.", f"{count:,}", args.path, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""
+Importacion masiva de habitaciones, clientes y reservas desde CSV o NDJSON.
+
+Los archivos se leen registro por registro y se insertan por lotes con el
+create_many de cada DAO (un INSERT multi-fila y un commit por lote), asi que la
+memoria depende del tamano del lote y no del archivo. Cada registro se valida
+antes de llegar a la BD (email, CURP, fechas, montos); los rechazados se
+cuentan en el reporte y, con --errors, se escriben completos en un NDJSON con
+su numero de registro y el motivo.
+
+Las llaves foraneas se resuelven en memoria: al empezar se leen una sola vez
+email -> customer_id y room_number -> room_id (solo esas columnas) y los ids
+nuevos se agregan conforme se insertan. Esas tablas crecen con el numero de
+clientes y habitaciones, no con el de filas importadas.
+
+Si un lote falla en la BD (p. ej. dos reservas de la misma noche), se revierte
+y sus registros se reintentan uno por uno para rechazar solo los que fallan.
+
+Para migrar un PMS anterior, --map renombra columnas del archivo:
+
+    python bulk_import.py rooms habitaciones.csv
+    python bulk_import.py customers clientes.ndjson --errors rechazados.ndjson
+    python bulk_import.py reservations reservas.csv --map correo=email --map cuarto=room_number
+
+Orden recomendado: habitaciones, clientes y al final reservas.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+
+import mysql.connector
+
+from customer import Customer
+from reservation import Reservation
+from room import Room
+from dao.batching import chunked, BATCH_SIZE
+from dao.customer_dao import CustomerDAO
+from dao.instrumentation import configure_logging
+from dao.reservation_dao import ReservationDAO, RoomNotAvailableError, stay_nights
+from dao.room_dao import RoomDAO
+from dao.streaming import stream_rows
+
+log = logging.getLogger(__name__)
+
+# Cada cuantos registros leidos se informa el avance.
+PROGRESS_EVERY = 100000
+# Errores que guarda el reporte en memoria; el archivo --errors los recibe todos.
+MAX_REPORTED_ERRORS = 100
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# CURP: 4 letras, fecha AAMMDD, sexo, entidad (2), 3 consonantes, homoclave y digito verificador.
+CURP_PATTERN = re.compile(r"^[A-Z][AEIOUX][A-Z]{2}\d{6}[HMX][A-Z]{2}[B-DF-HJ-NP-TV-Z]{3}[A-Z0-9]\d$")
+
+
+class ImportReport:
+    """Conteo de leidos, insertados y rechazados; guarda los primeros errores."""
+
+    def __init__(self, kind, error_sink=None):
+        self.kind = kind
+        self.read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self._error_sink = error_sink
+
+    def reject(self, record_number, row, reason):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((record_number, str(reason)))
+        if self._error_sink is not None:
+            self._error_sink.write(json.dumps({'record': record_number, 'error': str(reason), 'row': row},
+                                              ensure_ascii=False, default=str) + "\n")
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        rate = self.read / self.elapsed if self.elapsed else 0.0
+        return (f"{self.kind}: {self.read:,} leidos, {self.inserted:,} insertados, {self.rejected:,} rechazados "
+                f"en {self.elapsed:.1f} s ({rate:,.0f} registros/s).")
+
+
+# --- lectura ---
+
+def read_csv(stream, delimiter=","):
+    """Registros (numero, dict) de un CSV con encabezado."""
+    reader = csv.DictReader(stream, delimiter=delimiter)
+    for number, row in enumerate(reader, start=1):
+        yield number, row
+
+
+def read_ndjson(stream):
+    """Registros (numero, dict) de un archivo con un objeto JSON por linea; las lineas vacias se saltan."""
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as err:
+            row = {'_invalid': f"JSON invalido: {err}"}
+        if not isinstance(row, dict):
+            row = {'_invalid': "Se esperaba un objeto JSON."}
+        yield number, row
+
+
+def detect_format(path):
+    return "ndjson" if os.path.splitext(path)[1].lower() in (".ndjson", ".jsonl", ".json") else "csv"
+
+
+def renamed(records, column_map):
+    """Aplica --map (columna_del_archivo -> columna_esperada) a cada registro."""
+    if not column_map:
+        yield from records
+        return
+    for number, row in records:
+        yield number, {column_map.get(key, key): value for key, value in row.items()}
+
+
+# --- validacion ---
+
+def _text(row, field, required=True, max_length=None):
+    value = row.get(field)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise ValueError(f"Falta {field}.")
+    if max_length and len(value) > max_length:
+        raise ValueError(f"{field} excede {max_length} caracteres.")
+    return value
+
+
+def _email(row, field="email"):
+    email = _text(row, field, max_length=100).lower()
+    if not EMAIL_PATTERN.match(email):
+        raise ValueError(f"Email invalido: '{email}'.")
+    return email
+
+
+def _date(row, field):
+    value = _text(row, field)
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Fecha invalida en {field}: '{value}'. Use AAAA-MM-DD.") from None
+
+
+def _amount(row, field, required=True):
+    value = _text(row, field, required)
+    if not value:
+        return None
+    try:
+        amount = float(value)
+    except ValueError:
+        raise ValueError(f"Monto invalido en {field}: '{value}'.") from None
+    if amount < 0:
+        raise ValueError(f"{field} no puede ser negativo.")
+    return amount
+
+
+def _check_row(row):
+    if '_invalid' in row:
+        raise ValueError(row['_invalid'])
+
+
+class Lookups:
+    """
+    Tablas email -> customer_id y room_number -> (room_id, costo por noche),
+    leidas de la BD una sola vez por corrida y completadas con lo que se importa.
+    """
+
+    def __init__(self):
+        self._customers = None
+        self._rooms = None
+
+    @property
+    def customers(self):
+        if self._customers is None:
+            self._customers = {str(email).lower(): customer_id for email, customer_id
+                               in stream_rows("SELECT email, customer_id FROM CUSTOMERS", label="emails de clientes")}
+            log.info("%s clientes existentes cargados para resolver emails.", len(self._customers))
+        return self._customers
+
+    @property
+    def rooms(self):
+        if self._rooms is None:
+            self._rooms = {str(number): (room_id, float(cost)) for room_id, number, cost
+                           in stream_rows("SELECT room_id, room_number, cost_per_night FROM ROOMS", label="numeros de habitacion")}
+            log.info("%s habitaciones existentes cargadas para resolver numeros.", len(self._rooms))
+        return self._rooms
+
+
+def parse_room(row, lookups):
+    _check_row(row)
+    number = _text(row, 'room_number', max_length=10)
+    if number in lookups.rooms:
+        raise ValueError(f"La habitacion {number} ya existe.")
+    room = Room(0, number, _text(row, 'room_type', max_length=50), _text(row, 'status', False, 20) or "Available",
+                _amount(row, 'cost_per_night'), _text(row, 'description', False))
+    return room
+
+
+def parse_customer(row, lookups):
+    _check_row(row)
+    email = _email(row)
+    if email in lookups.customers:
+        raise ValueError(f"El email {email} ya esta registrado.")
+    curp = _text(row, 'curp', False).upper()
+    if curp and not CURP_PATTERN.match(curp):
+        raise ValueError(f"CURP invalida: '{curp}'.")
+    phone = _text(row, 'phone', False, 20)
+    if phone and not re.fullmatch(r"[0-9+ ()-]{7,20}", phone):
+        raise ValueError(f"Telefono invalido: '{phone}'.")
+    password = _text(row, 'password_hash', False) or _text(row, 'password', False)
+    return Customer(0, _text(row, 'first_name', max_length=50), _text(row, 'second_name', False, 50),
+                    _text(row, 'last_name', max_length=50), _text(row, 'second_last_name', False, 50),
+                    phone, email, _text(row, 'state', False, 50), curp, password)
+
+
+def parse_reservation(row, lookups):
+    """(reserva, costo_total). Sin total_cost se cobra la tarifa base de la habitacion por noche."""
+    _check_row(row)
+    email = _email(row, 'email')
+    customer_id = lookups.customers.get(email)
+    if customer_id is None:
+        raise LookupError(f"No existe el cliente {email}.")
+    number = _text(row, 'room_number')
+    room = lookups.rooms.get(number)
+    if room is None:
+        raise LookupError(f"No existe la habitacion {number}.")
+    check_in, check_out = _date(row, 'check_in'), _date(row, 'check_out')
+    nights = len(stay_nights(check_in, check_out))
+    total = _amount(row, 'total_cost', False)
+    if total is None:
+        total = round(room[1] * nights, 2)
+    # Solo los ids: create_many no necesita las entidades completas de cliente y habitacion.
+    reservation = Reservation(0, check_in.isoformat(), check_out.isoformat(),
+                              Customer(customer_id, "", "", "", "", "", email, "", ""), Room(room[0], number, ""))
+    return reservation, total
+
+
+class Kind:
+    """Como validar, insertar y registrar en las tablas de busqueda cada tipo de registro."""
+
+    def __init__(self, parse, dao, create_one, register=None, release=None):
+        self.parse = parse
+        self.dao = dao
+        self.create_one = create_one
+        self.register = register or (lambda item, lookups: None)
+        self.release = release or (lambda item, lookups: None)
+
+
+KINDS = {
+    'rooms': Kind(parse_room, RoomDAO, lambda dao, room: dao.create(room),
+                  register=lambda room, lookups: lookups.rooms.__setitem__(room.getRoomNumber(), (room.getId(), float(room.getCost()))),
+                  release=lambda room, lookups: lookups.rooms.pop(room.getRoomNumber(), None)),
+    'customers': Kind(parse_customer, CustomerDAO, lambda dao, customer: dao.create(customer),
+                      register=lambda customer, lookups: lookups.customers.__setitem__(customer.getEmail(), customer.getId()),
+                      release=lambda customer, lookups: lookups.customers.pop(customer.getEmail(), None)),
+    'reservations': Kind(parse_reservation, ReservationDAO, lambda dao, pair: dao.create(*pair)),
+}
+
+
+def _valid_items(kind, records, lookups, report, progress_every):
+    for number, row in records:
+        report.read += 1
+        if progress_every and report.read % progress_every == 0:
+            log.info("%s: %s registros leidos, %s insertados, %s rechazados...",
+                     report.kind, f"{report.read:,}", f"{report.inserted:,}", f"{report.rejected:,}")
+        try:
+            item = kind.parse(row, lookups)
+        except (ValueError, LookupError) as err:
+            report.reject(number, row, err)
+            continue
+        # Se aparta la llave ya, para rechazar duplicados dentro del mismo archivo.
+        kind.register(item, lookups)
+        yield number, row, item
+
+
+def _load_batch(kind, dao, batch, lookups, report):
+    items = [item for _, _, item in batch]
+    ids = dao.create_many(items, len(items))
+    report.batches += 1
+    if len(ids) == len(items):
+        for item in items:
+            kind.register(item, lookups)
+        report.inserted += len(ids)
+        return
+    # El lote se revirtio completo: uno por uno, para rechazar solo los registros que fallan.
+    log.warning("%s: lote de %s registros revertido; se reintenta registro por registro.", report.kind, len(items))
+    for number, row, item in batch:
+        try:
+            new_id = kind.create_one(dao, item)
+        except (RoomNotAvailableError, mysql.connector.Error) as err:
+            new_id, reason = None, err
+        else:
+            reason = "La BD rechazo el registro."
+        if new_id:
+            kind.register(item, lookups)
+            report.inserted += 1
+        else:
+            kind.release(item, lookups)
+            report.reject(number, row, reason)
+
+
+def import_records(kind_name, records, lookups=None, batch_size=BATCH_SIZE, progress_every=PROGRESS_EVERY, error_sink=None):
+    """Valida e inserta por lotes los registros (numero, dict); devuelve un ImportReport."""
+    kind = KINDS[kind_name]
+    lookups = lookups or Lookups()
+    dao = kind.dao()
+    report = ImportReport(kind_name, error_sink)
+    for batch in chunked(_valid_items(kind, records, lookups, report, progress_every), batch_size):
+        # El mapa de identidad guarda referencias debiles: las entidades del lote se liberan al pasar al siguiente.
+        _load_batch(kind, dao, batch, lookups, report)
+    log.info(report.summary())
+    return report
+
+
+def import_file(kind_name, path, fmt=None, column_map=None, limit=None, **options):
+    fmt = fmt or detect_format(path)
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        records = read_ndjson(stream) if fmt == "ndjson" else read_csv(stream)
+        if limit:
+            records = islice(records, limit)
+        return import_records(kind_name, renamed(records, column_map), **options)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa habitaciones, clientes o reservas desde CSV o NDJSON.")
+    parser.add_argument('kind', choices=sorted(KINDS))
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=("csv", "ndjson"), help="Por defecto se deduce de la extension.")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--map', action='append', default=[], metavar="ARCHIVO=COLUMNA",
+                        help="Renombra una columna del archivo (se puede repetir).")
+    parser.add_argument('--errors', help="Escribe cada registro rechazado, con su motivo, en este NDJSON.")
+    parser.add_argument('--limit', type=int, help="Importa solo los primeros N registros.")
+    parser.add_argument('--progress-every', type=int, default=PROGRESS_EVERY)
+    args = parser.parse_args(argv)
+
+    column_map = {}
+    for mapping in args.map:
+        source, _, target = mapping.partition("=")
+        if not source or not target:
+            parser.error(f"--map espera ARCHIVO=COLUMNA, no '{mapping}'.")
+        column_map[source.strip()] = target.strip()
+
+    configure_logging()
+    error_sink = open(args.errors, 'w', encoding='utf-8') if args.errors else None
+    try:
+        report = import_file(args.kind, args.path, args.format, column_map, args.limit,
+                             batch_size=args.batch_size, progress_every=args.progress_every, error_sink=error_sink)
+    finally:
+        if error_sink is not None:
+            error_sink.close()
+
+    print(report.summary())
+    for number, reason in report.errors[:20]:
+        print(f"  registro {number}: {reason}")
+    if report.rejected > 20:
+        print(f"  ... {report.rejected - 20:,} rechazos mas" + (f" en {args.errors}." if args.errors else "."))
+    return 0 if not report.rejected else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
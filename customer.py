@@ -1,6 +1,11 @@
 from typing import List
+from interning import intern_value
 
 class Customer:
+    # Sin __dict__ por instancia; __weakref__ lo necesita el mapa de identidad.
+    __slots__ = ('__id', '__name', '__secondName', '__lastName', '__secondLastName', '__phone', '__email',
+                 '__state', '__curp', '__password', '__reservations', '__service_reservations', '__weakref__')
+
     def __init__(self, id, name, secondName, lastName, secondLastName, phone, email, state, curp, password=""):
         self.__id = id
         self.__name = name
@@ -9,11 +14,12 @@ class Customer:
         self.__secondLastName = secondLastName
         self.__phone = phone
         self.__email = email
-        self.__state = state
+        self.__state = intern_value(state)
         self.__curp = curp
         self.__password = password
-        self.__reservations: List = []
-        self.__service_reservations: List = []
+        # Las listas se crean al primer uso: la mayoria de los clientes cargados no las necesita.
+        self.__reservations: List = None
+        self.__service_reservations: List = None
 
     def getId(self): return self.__id
     def setId(self, id): self.__id = id
@@ -40,21 +46,26 @@ class Customer:
     def setPassword(self, password): self.__password = password
 
     def getState(self): return self.__state
-    def setState(self, state): self.__state = state
+    def setState(self, state): self.__state = intern_value(state)
 
     def getCurp(self): return self.__curp
     def setCurp(self, curp): self.__curp = curp
 
-    def getReservations(self): return self.__reservations
+    def getReservations(self):
+        if self.__reservations is None:
+            self.__reservations = []
+        return self.__reservations
 
     def getServiceReservations(self):
+        if self.__service_reservations is None:
+            self.__service_reservations = []
         return self.__service_reservations
 
     def registerCustomer(self):
         print(f"Customer {self.__name} has been registered.")
 
     def makeReservation(self, reservation):
-        self.__reservations.append(reservation)
+        self.getReservations().append(reservation)
         print(f"Reservation #{reservation.getId()} added to customer {self.__name}'s record.")
         
     def checkReservation(self):
@@ -66,19 +77,32 @@ class Customer:
                 res.showInfo() 
 
     def cancelReservation(self, reservation_id):
-        initial_count = len(self.__reservations)
-        self.__reservations = [res for res in self.__reservations if res.getId() != reservation_id]
-        if len(self.__reservations) < initial_count:
+        if self.unlinkReservation(reservation_id):
             print(f"Reservation #{reservation_id} removed from customer {self.__name}'s record.")
             return True
         return False
 
+    def unlinkReservation(self, reservation_id):
+        # Quita una reserva borrada o reasignada en la BD sin anunciarlo; True si la tenia.
+        reservations = self.getReservations()
+        kept = [res for res in reservations if res.getId() != reservation_id]
+        if len(kept) == len(reservations):
+            return False
+        reservations[:] = kept
+        return True
+
+    def linkReservation(self, reservation):
+        # Asocia una reserva cargada desde la BD sin duplicarla ni anunciarla.
+        reservations = self.getReservations()
+        if not any(res is reservation for res in reservations):
+            reservations.append(reservation)
+
     def makeServiceReservation(self, service_reservation):
-        self.__service_reservations.append(service_reservation)
+        self.getServiceReservations().append(service_reservation)
         print(f"Service Reservation #{service_reservation.getId()} added to customer {self.__name}'s record.")
 
     def cancelServiceReservation(self, reservation_id):
-        initial_count = len(self.__service_reservations)
+        initial_count = len(self.getServiceReservations())
         self.__service_reservations = [res for res in self.__service_reservations if res.getId() != reservation_id]
         if len(self.__service_reservations) < initial_count:
             print(f"Service Reservation #{reservation_id} removed from customer {self.__name}'s record.")
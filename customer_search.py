@@ -0,0 +1,333 @@
+"""
+Busqueda de clientes para la recepcion: por nombre, apellidos, telefono,
+email o CURP, mientras se escribe.
+
+CustomerSearchIndex guarda solo lo necesario para mostrar y elegir un cliente
+(id, email y nombre), no los Customer completos, y se construye leyendo de la
+BD unicamente las columnas que indexa. Los terminos se normalizan sin acentos
+y en minusculas ("Muñoz" se encuentra con "munoz") y viven en una lista
+ordenada: los que empiezan con lo escrito forman un rango contiguo que se
+ubica con bisect, asi que una busqueda no recorre los clientes.
+
+Para los errores de dedo en nombres y apellidos se indexan las variantes con
+una letra menos de cada palabra: "gonzales" y "gonzalez" comparten
+"gonzale", y la distancia se confirma despues (una edicion o una
+transposicion). Los resultados se ordenan por coincidencia exacta, luego por
+prefijo y al final por aproximada.
+
+CustomerDAO avisa de cada cliente nuevo (create y create_many) a los indices
+que esten vivos; los cambios de otras terminales llegan con DeltaSync a
+traves de BookingService.apply_changes.
+"""
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+from itertools import islice
+from sys import intern
+
+from dao.customer_dao import CustomerDAO
+
+log = logging.getLogger(__name__)
+
+# Palabras mas cortas no se comparan de forma aproximada: casi todo estaria a una letra.
+FUZZY_MIN_LENGTH = 4
+# Una palabra que coincide con mas clientes no sirve para cruzar; solo filtra al calificar.
+MATCH_LIMIT = 5000
+# Tope de clientes que se califican por busqueda; con una o dos letras basta con los primeros.
+MAX_CANDIDATES = 300
+SEARCH_LIMIT = 10
+NATIONAL_DIGITS = 10
+
+EXACT, PREFIX, FUZZY = 3, 2, 1
+
+# Marcas diacriticas combinantes (acento, dieresis, tilde...) que NFKD separa de la letra.
+_ACCENTS = dict.fromkeys(range(0x300, 0x370))
+_WORDS = re.compile(r"[a-z0-9]+")
+_PHONE = re.compile(r"^\+?[\d\s().-]+$")
+
+
+def fold(text):
+    """Minusculas y sin acentos ni dieresis."""
+    text = str(text or "")
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize('NFKD', text).translate(_ACCENTS).lower()
+
+
+@lru_cache(maxsize=65536)
+def _words(name):
+    # Los nombres y apellidos se repiten mucho entre clientes: cada uno se normaliza una vez.
+    return tuple(intern(word) for word in _WORDS.findall(fold(name)))
+
+
+def name_words(*names):
+    return [word for name in names if name for word in _words(name)]
+
+
+def digits(text):
+    return "".join(filter(str.isdigit, str(text or "")))
+
+
+def query_terms(query):
+    """Lo escrito, en terminos: un telefono con espacios o guiones se queda en sus digitos."""
+    query = str(query or "").strip()
+    if not query:
+        return []
+    if _PHONE.match(query) and len(digits(query)) >= 3:
+        return [digits(query)]
+    return [fold(part) for part in query.split()]
+
+
+def within_one_edit(a, b):
+    """True si a y b difieren en a lo mas una insercion, borrado, sustitucion o transposicion."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2] and a[i + 2:] == b[i + 2:]
+    if la > lb:
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+def near_prefix(term, word):
+    """True si `term` esta a una edicion del inicio de `word` (o de `word` completa)."""
+    return any(within_one_edit(term, word[:size]) for size in range(len(term) - 1, len(term) + 2) if size <= len(word))
+
+
+def _deletes(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _variants(word):
+    """El inicio de la palabra desde FUZZY_MIN_LENGTH letras, y cada uno con una letra menos."""
+    variants = set()
+    for size in range(FUZZY_MIN_LENGTH, len(word) + 1):
+        start = word[:size]
+        variants.add(start)
+        variants.update(_deletes(start))
+    return variants
+
+
+class CustomerSearchIndex:
+    """
+    Indice en memoria de clientes. `search` devuelve dicts con customer_id,
+    email y name; el Customer completo se pide despues por email al
+    repositorio. Es seguro usarlo desde varios hilos.
+    """
+
+    def __init__(self, watch=True):
+        self._terms = []       # terminos ordenados, para los rangos por prefijo
+        self._postings = {}    # termino -> id, o lista de ids si lo comparten varios clientes
+        self._docs = {}        # id -> (email, nombre, terminos)
+        self._fuzzy = {}       # inicio de palabra, o con una letra menos -> palabras de nombre
+        self._lock = threading.RLock()
+        # Los clientes que se crean durante la carga masiva se indexan al terminarla.
+        self._loading = False
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        if watch:
+            CustomerDAO.watchers.add(self)
+
+    @classmethod
+    def from_dao(cls, dao=None, watch=True):
+        """Construye el indice leyendo de la BD solo las columnas que se buscan."""
+        started = time.perf_counter()
+        index = cls(watch)
+        index.add_rows((dao or CustomerDAO()).iter_search_rows())
+        log.info("Indice de busqueda con %s clientes en %.1f s.", len(index), time.perf_counter() - started)
+        return index
+
+    def __len__(self):
+        return len(self._docs)
+
+    # --- altas y bajas ---
+
+    def add_rows(self, rows):
+        """
+        Carga masiva de filas (id, nombre, segundo nombre, apellido, segundo
+        apellido, telefono, email, curp); ordena los terminos una sola vez al final.
+        """
+        self._loading = True
+        try:
+            with self._lock:
+                for row in rows:
+                    self._index(*row)
+                self._terms = sorted(self._postings)
+        finally:
+            with self._pending_lock:
+                self._loading = False
+                pending, self._pending = self._pending, []
+        for customer in pending:
+            self.add(customer)
+
+    def add(self, customer):
+        """Indexa (o reindexa, si cambio) un cliente."""
+        with self._pending_lock:
+            if self._loading:
+                self._pending.append(customer)
+                return
+        with self._lock:
+            self.remove(customer.getId())
+            for term in self._index(customer.getId(), customer.getName(), customer.getSecondName(),
+                                    customer.getLastName(), customer.getSecondLastName(), customer.getPhone(),
+                                    customer.getEmail(), customer.getCurp()):
+                if isinstance(self._postings[term], int):
+                    insort(self._terms, term)
+
+    customer_added = add
+
+    def remove(self, customer_id):
+        with self._lock:
+            doc = self._docs.pop(customer_id, None)
+            if doc is None:
+                return
+            for term in doc[2]:
+                ids = self._postings.get(term)
+                if isinstance(ids, list):
+                    ids.remove(customer_id)
+                    if len(ids) == 1:
+                        self._postings[term] = ids[0]
+                elif ids is not None:
+                    del self._postings[term]
+                    position = bisect_left(self._terms, term)
+                    if position < len(self._terms) and self._terms[position] == term:
+                        del self._terms[position]
+                    self._forget_fuzzy(term)
+
+    def _forget_fuzzy(self, word):
+        """Quita las variantes de una palabra de nombre que ya ningun cliente tiene."""
+        if len(word) < FUZZY_MIN_LENGTH or word not in self._fuzzy.get(word[:FUZZY_MIN_LENGTH], ()):
+            return
+        for variant in _variants(word):
+            words = self._fuzzy.get(variant)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self._fuzzy[variant]
+
+    def _index(self, customer_id, first_name, second_name, last_name, second_last_name, phone, email, curp):
+        words = name_words(first_name, second_name, last_name, second_last_name)
+        email = fold(email).strip()
+        terms = dict.fromkeys(words + name_words(email.split("@")[0]))
+        phone = digits(phone)
+        # Tambien sin lada internacional: se busca por los 10 digitos del numero nacional.
+        for term in (email, phone, phone[-NATIONAL_DIGITS:], fold(curp).strip()):
+            if term:
+                terms[term] = None
+        terms = tuple(terms)
+        display = " ".join(part for part in (first_name, last_name, second_last_name) if part)
+        self._docs[customer_id] = (email, display, terms)
+        for word in words:
+            if len(word) >= FUZZY_MIN_LENGTH and word not in self._postings:
+                for variant in _variants(word):
+                    self._fuzzy.setdefault(variant, set()).add(word)
+        for term in terms:
+            ids = self._postings.get(term)
+            if ids is None:
+                self._postings[term] = customer_id
+            elif isinstance(ids, list):
+                ids.append(customer_id)
+            else:
+                self._postings[term] = [ids, customer_id]
+        return terms
+
+    # --- busqueda ---
+
+    def _prefix_range(self, term):
+        return bisect_left(self._terms, term), bisect_left(self._terms, term + "\uffff")
+
+    def _fuzzy_words(self, term):
+        """Palabras de nombre que empiezan a una edicion de `term`."""
+        if len(term) < FUZZY_MIN_LENGTH:
+            return set()
+        words = set()
+        for variant in _deletes(term) | {term}:
+            words.update(self._fuzzy.get(variant, ()))
+        return {word for word in words if word in self._postings and near_prefix(term, word)}
+
+    def _ids(self, term):
+        ids = self._postings.get(term)
+        return () if ids is None else (ids,) if isinstance(ids, int) else ids
+
+    def _matching(self, term, prefixes, fuzzy, limit, partial=False):
+        """
+        Ids que coinciden con `term`: exactos primero, luego por prefijo y al
+        final aproximados. Si son mas de `limit` devuelve None, o con `partial`
+        los primeros `limit`.
+        """
+        low, high = prefixes
+        if high - low > limit and not partial:
+            return None
+        postings = self._postings
+        found = dict.fromkeys(self._ids(term)[:limit])
+        # Cada termino aporta al menos un id: nunca hacen falta mas de `limit` terminos.
+        for source in self._terms[low:min(high, low + limit)] + sorted(fuzzy):
+            if len(found) >= limit:
+                if partial:
+                    break
+                return None
+            ids = postings[source]
+            if isinstance(ids, int):
+                found[ids] = None
+            else:
+                found.update(dict.fromkeys(ids[:limit]))
+        return found if partial or len(found) <= limit else None
+
+    @staticmethod
+    def _score(doc_terms, term, fuzzy):
+        best = 0
+        for candidate in doc_terms:
+            if candidate == term:
+                return EXACT
+            if candidate.startswith(term):
+                best = PREFIX
+            elif best < FUZZY and candidate in fuzzy:
+                best = FUZZY
+        return best
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """
+        Clientes que coinciden con todas las palabras de `query`, como prefijo
+        o, si nada empieza asi, con un error de dedo; los mejores primero.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        with self._lock:
+            prefixes = {term: self._prefix_range(term) for term in terms}
+            fuzzy = {term: self._fuzzy_words(term) if low == high else set() for term, (low, high) in prefixes.items()}
+            # Se cruzan los ids de las palabras poco comunes, de la que menos tiene a la
+            # que mas; si todas son comunes se califican los primeros de la primera.
+            found = [self._matching(term, prefixes[term], fuzzy[term], MATCH_LIMIT) for term in terms]
+            bounded = sorted((ids for ids in found if ids is not None), key=len)
+            if bounded:
+                driver, others = bounded[0], bounded[1:]
+            else:
+                driver, others = self._matching(terms[0], prefixes[terms[0]], fuzzy[terms[0]], MAX_CANDIDATES, partial=True), []
+            candidates = (customer_id for customer_id in driver if all(customer_id in ids for ids in others))
+            scored = []
+            for customer_id in islice(candidates, MAX_CANDIDATES):
+                email, display, doc_terms = self._docs[customer_id]
+                total = 0
+                for term in terms:
+                    score = self._score(doc_terms, term, fuzzy[term])
+                    if not score:
+                        break
+                    total += score
+                else:
+                    scored.append((-total, display.lower(), customer_id, email, display))
+        scored.sort()
+        return [{'customer_id': customer_id, 'email': email, 'name': display}
+                for _, _, customer_id, email, display in scored[:limit]]
@@ -1,34 +1,57 @@
+import logging
 import mysql.connector
 from db_connection import get_conn, close_conn
 from service import Service
-from typing import Optional, List
+from dao.batching import insert_many, BATCH_SIZE
+from dao.streaming import stream_rows, CHUNK_SIZE
+from dao.identity_map import IdentityMap
+from dao.change_log import fetch_changed
+from dao.statement_cache import StatementCache
+from cache import LRUCache
+from mysql_env import ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL
+from typing import Iterable, Iterator, Optional, List, Tuple
+from dao.instrumentation import instrumented
 
+log = logging.getLogger(__name__)
+
+@instrumented
 class ServiceDAO:
+    # Cache compartida por todas las instancias para que una escritura invalide a todas.
+    cache = LRUCache(ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL)
+
+    _SELECT = "SELECT service_id, name, cost, description FROM SERVICES"
+    _INSERT = """
+        INSERT INTO SERVICES 
+        (name, cost, description) 
+        VALUES (%s, %s, %s)
+    """
+    _SELECT_BY_ID = _SELECT + " WHERE service_id = %s"
+    _DELETE = "DELETE FROM SERVICES WHERE service_id = %s"
+
+    def __init__(self, cache=None):
+        if cache is not None:
+            self.cache = cache
+
+    def _to_values(self, svc: Service) -> tuple:
+        return (svc.getType(), svc.getCost(), svc.getDescription())
+
+    def _assign_id(self, svc: Service, svc_id: int):
+        svc.setId(svc_id)
+        IdentityMap.get_instance().add(Service, svc_id, svc)
+        self.cache.pop(svc_id)
 
     def create(self, svc: Service) -> Optional[int]:
-        conn = None
-        cursor = None
-        
-        query = """
-            INSERT INTO SERVICES 
-            (name, cost, description) 
-            VALUES (%s, %s, %s)
-        """
-        values = (
-            svc.getType(), svc.getCost(), svc.getDescription()
-        )
-        
         conn = None
         try:
             conn = get_conn()
             with conn.cursor() as cursor:
-                cursor.execute(query, values)
+                cursor.execute(self._INSERT, self._to_values(svc))
                 conn.commit()
                 svc_id = cursor.lastrowid
-                svc.setId(svc_id)
+                self._assign_id(svc, svc_id)
                 return svc_id
         except mysql.connector.Error as err:
-            print(f"Error CREATE Service: {err}")
+            log.error("Error CREATE Service: %s", err)
             if conn:
                 conn.rollback()
             return None
@@ -36,42 +59,46 @@ class ServiceDAO:
             if conn:
                 close_conn(conn)
 
+    def create_many(self, services: Iterable[Service], batch_size: int = BATCH_SIZE) -> List[int]:
+        return insert_many(self._INSERT, services, self._to_values, self._assign_id, batch_size, "servicios")
+
+    def _from_record(self, record) -> Service:
+        return IdentityMap.get_instance().resolve(Service, record[0], Service, *record)
+
     def get_by_id(self, service_id: int) -> Optional[Service]:
+        cached = self.cache.get(service_id)
+        if cached is not None:
+            return cached
+
         conn = get_conn()
-        cursor = conn.cursor()
-        
-        query = "SELECT service_id, name, cost, description FROM SERVICES WHERE service_id = %s"
-        
         try:
-            cursor.execute(query, (service_id,))
-            record = cursor.fetchone()
+            record = StatementCache.get_instance().fetch_one(conn, self._SELECT_BY_ID, (service_id,))
             
             if record:
-                (id, type_name, cost, description) = record
-                return Service(id, type_name, cost, description)
+                svc = self._from_record(record)
+                self.cache.put(service_id, svc)
+                return svc
             return None
         except mysql.connector.Error as err:
-            print(f"Error READ Service: {err}")
+            log.error("Error READ Service: %s", err)
             return None
         finally:
-            cursor.close()
             close_conn(conn)
 
     def get_all(self) -> List[Service]:
         conn = None
         cursor = None
         services = []
-        query = "SELECT service_id, name, cost, description FROM SERVICES"
         try:
             conn = get_conn()
             cursor = conn.cursor()
-            cursor.execute(query)
+            cursor.execute(self._SELECT)
             records = cursor.fetchall()
-            for id, type_name, cost, description in records:
-                services.append(Service(id, type_name, cost, description))
-            print(f"INFO: Se cargaron {len(services)} servicios desde la BD.")
+            for record in records:
+                services.append(self._from_record(record))
+            log.info("Se cargaron %s servicios desde la BD.", len(services))
         except mysql.connector.Error as err:
-            print(f"Error READ ALL Services: {err}")
+            log.error("Error READ ALL Services: %s", err)
         finally:
             if cursor:
                 cursor.close()
@@ -79,19 +106,33 @@ class ServiceDAO:
                 close_conn(conn)
         return services
 
+    def iter_all(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Service]:
+        for record in stream_rows(self._SELECT, chunk_size=chunk_size, label="servicios"):
+            yield self._from_record(record)
+
+    _SELECT_CHANGED = "SELECT service_id, name, cost, description, updated_at FROM SERVICES WHERE updated_at > %s ORDER BY updated_at"
+
+    def get_changed_since(self, since) -> Tuple[List[Service], object]:
+        records, watermark = fetch_changed(self._SELECT_CHANGED, since, "servicios")
+        return [Service(*record) for record in records], watermark
+
+    def iter_page(self, after_id: int = 0, limit: int = CHUNK_SIZE) -> Iterator[Service]:
+        """Pagina por llave: filas con id mayor a after_id, en orden de id."""
+        query = self._SELECT + " WHERE service_id > %s ORDER BY service_id LIMIT %s"
+        for record in stream_rows(query, (after_id, limit), chunk_size=limit, label="servicios"):
+            yield self._from_record(record)
+
     def delete(self, service_id: int) -> bool:
         conn = get_conn()
-        cursor = conn.cursor()
-        query = "DELETE FROM SERVICES WHERE service_id = %s"
-        
         try:
-            cursor.execute(query, (service_id,))
+            cursor = StatementCache.get_instance().run(conn, self._DELETE, (service_id,))
             conn.commit()
+            IdentityMap.get_instance().discard(Service, service_id)
+            self.cache.pop(service_id)
             return cursor.rowcount > 0
         except mysql.connector.Error as err:
-            print(f"Error DELETE Service: {err}")
+            log.error("Error DELETE Service: %s", err)
             conn.rollback()
             return False
         finally:
-            cursor.close()
             close_conn(conn)
\ No newline at end of file
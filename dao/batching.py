@@ -0,0 +1,89 @@
+import logging
+import mysql.connector
+from itertools import islice
+from db_connection import get_conn, close_conn, backend, DBConnection
+from typing import Callable, Iterable, List, Optional
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def chunked(iterable: Iterable, size: int):
+    """Parte cualquier iterable en listas de a lo mas `size` elementos sin materializarlo completo."""
+    if size <= 0:
+        raise ValueError("batch_size debe ser mayor a cero.")
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def consecutive_ids(cursor) -> bool:
+    """
+    True si el INSERT multi-fila recibe ids consecutivos. En MySQL solo se
+    garantiza con innodb_autoinc_lock_mode 0 o 1; con 2 (el de MySQL 8) los ids
+    de escritores concurrentes se intercalan. SQLite tiene un solo escritor.
+    """
+    if backend() is not DBConnection:
+        return True
+    cursor.execute("SELECT @@innodb_autoinc_lock_mode")
+    return int(cursor.fetchone()[0]) < 2
+
+
+def insert_many(query: str, items: Iterable, to_values: Callable, on_id: Callable,
+                batch_size: int = BATCH_SIZE, label: str = "registros",
+                before_commit: Optional[Callable] = None) -> List[int]:
+    """
+    Inserta `items` por lotes con un commit por lote, todo sobre una sola
+    conexion del pool.
+
+    Si el servidor garantiza ids consecutivos (consecutive_ids) cada lote es un
+    INSERT multi-fila (executemany) y los ids salen de lastrowid, que es el de
+    la primera fila. Si no, las filas del lote se insertan una por una dentro
+    de la misma transaccion y cada una toma su propio lastrowid.
+    Los ids se reparten en orden con on_id(item, id). Si un lote falla se
+    revierte solo ese lote y se devuelven los ids ya confirmados.
+    before_commit(cursor, batch, batch_ids) escribe filas dependientes en la
+    misma transaccion del lote.
+    """
+    ids = []
+    conn = None
+    cursor = None
+    try:
+        conn = get_conn()
+        cursor = conn.cursor()
+        multi_row = consecutive_ids(cursor)
+        if not multi_row:
+            log.debug("innodb_autoinc_lock_mode=2: %s se insertan fila por fila en cada lote.", label)
+        for batch in chunked(items, batch_size):
+            try:
+                if multi_row:
+                    cursor.executemany(query, [to_values(item) for item in batch])
+                    batch_ids = list(range(cursor.lastrowid, cursor.lastrowid + len(batch)))
+                else:
+                    batch_ids = []
+                    for item in batch:
+                        cursor.execute(query, to_values(item))
+                        batch_ids.append(cursor.lastrowid)
+                if before_commit is not None:
+                    before_commit(cursor, batch, batch_ids)
+                conn.commit()
+            except mysql.connector.Error as err:
+                log.error("Fallo la insercion por lotes de %s tras %s filas: %s", label, len(ids), err)
+                conn.rollback()
+                return ids
+            for item, item_id in zip(batch, batch_ids):
+                on_id(item, item_id)
+            ids.extend(batch_ids)
+        log.info("Se insertaron %s %s por lotes.", len(ids), label)
+    except mysql.connector.Error as err:
+        log.error("No se pudo abrir la conexion para insertar %s: %s", label, err)
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            close_conn(conn)
+    return ids
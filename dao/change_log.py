@@ -0,0 +1,111 @@
+import logging
+import mysql.connector
+from datetime import datetime, timedelta
+from db_connection import get_conn, close_conn
+from dao.streaming import stream_rows
+from typing import List, Tuple
+from dao.instrumentation import instrumented
+
+log = logging.getLogger(__name__)
+
+# Consultas de cambios: las columnas de la entidad y al final updated_at.
+
+# Tabla o columna inexistente en MySQL (1146, 1054); SQLite dice "no such table/column".
+MISSING_SCHEMA_ERRNOS = (1146, 1054)
+
+
+def fetch_changed(query: str, since, label: str = "registros") -> Tuple[List[tuple], object]:
+    """
+    Filas con updated_at posterior a `since` (sin la columna updated_at) y la
+    marca de agua mas alta encontrada, o `since` si no hubo cambios.
+
+    Un error de la BD se propaga: con una lectura incompleta la marca de agua
+    de las demas tablas saltaria filas de esta que ya no se volverian a pedir.
+    """
+    records = []
+    watermark = since
+    for row in stream_rows(query, (since,), label=label, strict=True):
+        records.append(row[:-1])
+        if watermark is None or row[-1] > watermark:
+            watermark = row[-1]
+    return records, watermark
+
+
+@instrumented
+class ChangeLogDAO:
+    _TOMBSTONES = """
+        SELECT table_name, row_id, deleted_at FROM CHANGE_TOMBSTONES
+        WHERE deleted_at > %s ORDER BY deleted_at
+    """
+
+    _SCHEMA_PROBES = tuple(f"SELECT updated_at FROM {table} WHERE 1 = 0"
+                           for table in ('ROOMS', 'SERVICES', 'CUSTOMERS', 'EMPLOYEES', 'RESERVATIONS')) + (
+        "SELECT deleted_at FROM CHANGE_TOMBSTONES WHERE 1 = 0",)
+
+    def has_change_tracking(self) -> bool:
+        """
+        True si la BD ya tiene updated_at y CHANGE_TOMBSTONES
+        (sql/001_change_tracking.sql). Otros errores, como una BD caida, se propagan.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_conn()
+            cursor = conn.cursor()
+            for query in self._SCHEMA_PROBES:
+                cursor.execute(query)
+                cursor.fetchall()
+            return True
+        except mysql.connector.Error as err:
+            if getattr(err, 'errno', None) in MISSING_SCHEMA_ERRNOS or "no such" in str(err):
+                return False
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                close_conn(conn)
+
+    def server_time(self):
+        """Hora del servidor: las marcas de agua se comparan siempre con su reloj."""
+        conn = None
+        cursor = None
+        try:
+            conn = get_conn()
+            cursor = conn.cursor()
+            cursor.execute("SELECT NOW(6)")
+            now = cursor.fetchone()[0]
+            # MySQL devuelve datetime; la funcion NOW registrada en SQLite, texto.
+            return datetime.fromisoformat(now) if isinstance(now, str) else now
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                close_conn(conn)
+
+    def get_tombstones_since(self, since) -> Tuple[List[tuple], object]:
+        """Borrados posteriores a `since`: ([(tabla, id), ...], marca_de_agua)."""
+        return fetch_changed(self._TOMBSTONES, since, "lapidas")
+
+    def prune(self, days: int = 7) -> int:
+        """Elimina lapidas viejas que ya ninguna terminal necesita."""
+        conn = None
+        cursor = None
+        try:
+            # El corte se calcula aqui para no depender de la aritmetica de fechas de cada motor.
+            cutoff = self.server_time() - timedelta(days=days)
+            conn = get_conn()
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM CHANGE_TOMBSTONES WHERE deleted_at < %s", (cutoff,))
+            conn.commit()
+            return cursor.rowcount
+        except mysql.connector.Error as err:
+            log.error("No se pudieron depurar las lapidas: %s", err)
+            if conn:
+                conn.rollback()
+            return 0
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                close_conn(conn)
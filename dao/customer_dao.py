@@ -1,38 +1,58 @@
+import logging
+import weakref
 import mysql.connector
 from db_connection import get_conn, close_conn
 from customer import Customer
-from typing import Optional
+from dao.batching import insert_many, BATCH_SIZE
+from dao.streaming import stream_rows, CHUNK_SIZE
+from dao.identity_map import IdentityMap
+from dao.change_log import fetch_changed
+from dao.statement_cache import StatementCache
+from typing import Iterable, Iterator, List, Optional, Tuple
+from dao.instrumentation import instrumented
 
+log = logging.getLogger(__name__)
+
+@instrumented
 class CustomerDAO:
+    _INSERT = """
+        INSERT INTO CUSTOMERS 
+        (first_name, second_name, last_name, second_last_name, phone, email, state, curp, password_hash) 
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    # Indices en memoria (customer_search.CustomerSearchIndex) que reciben los clientes nuevos.
+    watchers = weakref.WeakSet()
+
+    def _to_values(self, cust: Customer) -> tuple:
+        return (
+            cust.getName(), cust.getSecondName(), cust.getLastName(),
+            cust.getSecondLastName(), cust.getPhone(), cust.getEmail(),
+            cust.getState(), cust.getCurp(), cust.getPassword()
+        )
+
+    def _assign_id(self, cust: Customer, cust_id: int):
+        cust.setId(cust_id)
+        IdentityMap.get_instance().add(Customer, cust_id, cust)
+        for watcher in list(CustomerDAO.watchers):
+            watcher.customer_added(cust)
+
     def create(self, cust: Customer) -> Optional[int]:
         conn = None
         cursor = None
         try:
             conn = get_conn()
             cursor = conn.cursor()
-
-            query = """
-                INSERT INTO CUSTOMERS 
-                (first_name, second_name, last_name, second_last_name, phone, email, state, curp, password_hash) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                cust.getName(), cust.getSecondName(), cust.getLastName(),
-                cust.getSecondLastName(), cust.getPhone(), cust.getEmail(),
-                cust.getState(), cust.getCurp(), cust.getPassword()
-            )
-
-            cursor.execute(query, values)
+            cursor.execute(self._INSERT, self._to_values(cust))
             conn.commit()
             
             cust_id = cursor.lastrowid
-            cust.setId(cust_id)
+            self._assign_id(cust, cust_id)
             
-            print(f"INFO: Cliente '{cust.getName()}' insertado en la BD con ID: {cust_id}")
+            log.debug("Cliente '%s' insertado en la BD con ID: %s", cust.getName(), cust_id)
             return cust_id
 
         except mysql.connector.Error as err:
-            print(f"ERROR: No se pudo crear el cliente en la BD: {err}")
+            log.error("No se pudo crear el cliente en la BD: %s", err)
             if conn:
                 conn.rollback()
             return None
@@ -42,6 +62,14 @@ class CustomerDAO:
             if conn:
                 close_conn(conn)
 
+    def create_many(self, customers: Iterable[Customer], batch_size: int = BATCH_SIZE) -> List[int]:
+        return insert_many(self._INSERT, customers, self._to_values, self._assign_id, batch_size, "clientes")
+
+    _SELECT = "SELECT customer_id, first_name, second_name, last_name, second_last_name, phone, email, state, curp, password_hash FROM CUSTOMERS"
+
+    def _from_record(self, record) -> Customer:
+        return IdentityMap.get_instance().resolve(Customer, record[0], Customer, *record)
+
     def get_all(self) -> list[Customer]:
         conn = None
         cursor = None
@@ -49,20 +77,61 @@ class CustomerDAO:
         try:
             conn = get_conn()
             cursor = conn.cursor()
-            query = "SELECT customer_id, first_name, second_name, last_name, second_last_name, phone, email, state, curp, password_hash FROM CUSTOMERS"
-            cursor.execute(query)
+            cursor.execute(self._SELECT)
             records = cursor.fetchall()
             for record in records:
-                (cust_id, name, sName, lName, sLName, phone, email, state, curp, password) = record
-                customers.append(
-                    Customer(cust_id, name, sName, lName, sLName, phone, email, state, curp, password)
-                )
-            print(f"INFO: Se cargaron {len(customers)} clientes desde la BD.")
+                customers.append(self._from_record(record))
+            log.info("Se cargaron %s clientes desde la BD.", len(customers))
         except mysql.connector.Error as err:
-            print(f"ERROR: No se pudieron obtener los clientes de la BD: {err}")
+            log.error("No se pudieron obtener los clientes de la BD: %s", err)
         finally:
             if cursor:
                 cursor.close()
             if conn:
                 close_conn(conn)
-        return customers
\ No newline at end of file
+        return customers
+
+    def _get_one(self, where: str, value) -> Optional[Customer]:
+        conn = None
+        try:
+            conn = get_conn()
+            record = StatementCache.get_instance().fetch_one(conn, self._SELECT + where, (value,))
+            return self._from_record(record) if record else None
+        except mysql.connector.Error as err:
+            log.error("No se pudo obtener el cliente de la BD: %s", err)
+            return None
+        finally:
+            if conn:
+                close_conn(conn)
+
+    def get_by_id(self, cust_id: int) -> Optional[Customer]:
+        return self._get_one(" WHERE customer_id = %s", cust_id)
+
+    def get_by_email(self, email: str) -> Optional[Customer]:
+        return self._get_one(" WHERE email = %s", email)
+
+    _SEARCH_SELECT = "SELECT customer_id, first_name, second_name, last_name, second_last_name, phone, email, curp FROM CUSTOMERS"
+
+    def iter_search_rows(self, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+        """Filas con lo que indexa la busqueda de clientes, sin password_hash y sin construir Customer."""
+        return stream_rows(self._SEARCH_SELECT, chunk_size=chunk_size, label="clientes", strict=True)
+
+    def iter_all(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Customer]:
+        for record in stream_rows(self._SELECT, chunk_size=chunk_size, label="clientes"):
+            yield self._from_record(record)
+
+    _SELECT_CHANGED = """
+        SELECT customer_id, first_name, second_name, last_name, second_last_name, phone, email, state, curp, password_hash,
+               updated_at
+        FROM CUSTOMERS WHERE updated_at > %s ORDER BY updated_at
+    """
+
+    def get_changed_since(self, since) -> Tuple[List[Customer], object]:
+        records, watermark = fetch_changed(self._SELECT_CHANGED, since, "clientes")
+        return [Customer(*record) for record in records], watermark
+
+    def iter_page(self, after_id: int = 0, limit: int = CHUNK_SIZE) -> Iterator[Customer]:
+        """Pagina por llave: filas con id mayor a after_id, en orden de id."""
+        query = self._SELECT + " WHERE customer_id > %s ORDER BY customer_id LIMIT %s"
+        for record in stream_rows(query, (after_id, limit), chunk_size=limit, label="clientes"):
+            yield self._from_record(record)
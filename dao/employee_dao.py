@@ -1,10 +1,22 @@
+import logging
 import mysql.connector
 from db_connection import get_conn, close_conn
 from employee import Employee 
 from receptionist import Receptionist
 from bellboy import Bellboy
-from typing import Optional, List
+from dao.batching import insert_many, BATCH_SIZE
+from dao.streaming import stream_rows, CHUNK_SIZE
+from dao.identity_map import IdentityMap
+from dao.change_log import fetch_changed
+from dao.statement_cache import StatementCache
+from cache import LRUCache
+from mysql_env import ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL
+from typing import Iterable, Iterator, Optional, List, Tuple
+from dao.instrumentation import instrumented
 
+log = logging.getLogger(__name__)
+
+@instrumented
 class EmployeeDAO:
     ROLE_MAPPING = {
         "Receptionist": Receptionist,
@@ -12,35 +24,47 @@ class EmployeeDAO:
         "Employee": Employee,
         "Manager": Employee
     }
+    # Cache compartida por todas las instancias para que una escritura invalide a todas.
+    cache = LRUCache(ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL)
 
-    def create(self, emp: Employee) -> Optional[int]:
-        conn = None
-        cursor = None
+    def __init__(self, cache=None):
+        if cache is not None:
+            self.cache = cache
+
+    _INSERT = """
+        INSERT INTO EMPLOYEES 
+        (first_name, second_name, last_name, second_last_name, phone, email, curp, password_hash, status, role) 
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+
+    def _to_values(self, emp: Employee) -> tuple:
         role = type(emp).__name__
         if role not in self.ROLE_MAPPING: # type: ignore
             role = "Employee"
-
-        query = """
-            INSERT INTO EMPLOYEES 
-            (first_name, second_name, last_name, second_last_name, phone, email, curp, password_hash, status, role) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        values = (
+        return (
             emp.getFirstName(), emp.getSecondName(), emp.getLastName(), 
             emp.getSecondLastName(), emp.getPhone(), emp.getEmail(), 
             emp.getCurp(), emp.getPassword(), emp.getStatus(), role
         )
-        
+
+    def _assign_id(self, emp: Employee, emp_id: int):
+        emp.setId(emp_id)
+        IdentityMap.get_instance().add(Employee, emp_id, emp)
+        self.cache.pop(emp_id)
+
+    def create(self, emp: Employee) -> Optional[int]:
+        conn = None
+        cursor = None
         try:
             conn = get_conn()
             cursor = conn.cursor()
-            cursor.execute(query, values)
+            cursor.execute(self._INSERT, self._to_values(emp))
             conn.commit()
             emp_id = cursor.lastrowid
-            emp.setId(emp_id)
+            self._assign_id(emp, emp_id)
             return emp_id
         except mysql.connector.Error as err:
-            print(f"Error CREATE Employee: {err}")
+            log.error("Error CREATE Employee: %s", err)
             if conn:
                 conn.rollback()
             return None
@@ -50,56 +74,56 @@ class EmployeeDAO:
             if conn:
                 close_conn(conn)
 
-    def get_by_id(self, emp_id: int) -> Optional[Employee]:
+    def create_many(self, employees: Iterable[Employee], batch_size: int = BATCH_SIZE) -> List[int]:
+        return insert_many(self._INSERT, employees, self._to_values, self._assign_id, batch_size, "empleados")
+
+    _SELECT = """
+        SELECT employee_id, first_name, second_name, last_name, second_last_name, 
+               phone, email, status, curp, password_hash, role 
+        FROM EMPLOYEES
+    """
+
+    def _from_record(self, record) -> Employee:
+        EmployeeClass = self.ROLE_MAPPING.get(record[10], Employee)
+        return IdentityMap.get_instance().resolve(Employee, record[0], EmployeeClass, *record[:10])
+
+    def _get_one(self, where: str, value) -> Optional[Employee]:
         conn = get_conn()
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT employee_id, first_name, second_name, last_name, second_last_name, 
-                   phone, email, status, curp, password_hash, role 
-            FROM EMPLOYEES 
-            WHERE employee_id = %s
-        """
-        
         try:
-            cursor.execute(query, (emp_id,))
-            record = cursor.fetchone()
-            
-            if record:
-                (id, fName, sName, lName, sLName, phone, email, status, curp, password, role) = record
-                EmployeeClass = self.ROLE_MAPPING.get(role, Employee)
-                return EmployeeClass(id, fName, sName, lName, sLName, phone, email, status, curp, password)
-            return None
+            record = StatementCache.get_instance().fetch_one(conn, self._SELECT + where, (value,))
+            return self._from_record(record) if record else None
         except mysql.connector.Error as err:
-            print(f"Error READ Employee: {err}")
+            log.error("Error READ Employee: %s", err)
             return None
         finally:
-            cursor.close()
             close_conn(conn)
+
+    def get_by_id(self, emp_id: int) -> Optional[Employee]:
+        cached = self.cache.get(emp_id)
+        if cached is not None:
+            return cached
+        emp = self._get_one(" WHERE employee_id = %s", emp_id)
+        if emp is not None:
+            self.cache.put(emp_id, emp)
+        return emp
+
+    def get_by_email(self, email: str) -> Optional[Employee]:
+        return self._get_one(" WHERE email = %s", email)
             
     def get_all(self) -> List[Employee]:
         conn = None
         cursor = None
         employees = []
-        query = """
-            SELECT employee_id, first_name, second_name, last_name, second_last_name, 
-                   phone, email, status, curp, password_hash, role 
-            FROM EMPLOYEES
-        """
         try:
             conn = get_conn()
             cursor = conn.cursor()
-            cursor.execute(query)
+            cursor.execute(self._SELECT)
             records = cursor.fetchall()
             for record in records:
-                (id, fName, sName, lName, sLName, phone, email, status, curp, password, role) = record
-                EmployeeClass = self.ROLE_MAPPING.get(role, Employee)
-                employees.append(
-                    EmployeeClass(id, fName, sName, lName, sLName, phone, email, status, curp, password)
-                )
-            print(f"INFO: Se cargaron {len(employees)} empleados desde la BD.")
+                employees.append(self._from_record(record))
+            log.info("Se cargaron %s empleados desde la BD.", len(employees))
         except mysql.connector.Error as err:
-            print(f"Error READ ALL Employees: {err}")
+            log.error("Error READ ALL Employees: %s", err)
         finally:
             if cursor:
                 cursor.close()
@@ -107,35 +131,57 @@ class EmployeeDAO:
                 close_conn(conn)
         return employees
 
+    def iter_all(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Employee]:
+        for record in stream_rows(self._SELECT, chunk_size=chunk_size, label="empleados"):
+            yield self._from_record(record)
+
+    _SELECT_CHANGED = """
+        SELECT employee_id, first_name, second_name, last_name, second_last_name,
+               phone, email, status, curp, password_hash, role, updated_at
+        FROM EMPLOYEES WHERE updated_at > %s ORDER BY updated_at
+    """
+
+    def get_changed_since(self, since) -> Tuple[List[Employee], object]:
+        records, watermark = fetch_changed(self._SELECT_CHANGED, since, "empleados")
+        return [self.ROLE_MAPPING.get(record[10], Employee)(*record[:10]) for record in records], watermark
+
+    def iter_page(self, after_id: int = 0, limit: int = CHUNK_SIZE) -> Iterator[Employee]:
+        """Pagina por llave: filas con id mayor a after_id, en orden de id."""
+        query = self._SELECT + " WHERE employee_id > %s ORDER BY employee_id LIMIT %s"
+        for record in stream_rows(query, (after_id, limit), chunk_size=limit, label="empleados"):
+            yield self._from_record(record)
+
     def update_status(self, emp_id: int, new_status: str) -> bool:
         conn = get_conn()
-        cursor = conn.cursor()
         query = "UPDATE EMPLOYEES SET status=%s WHERE employee_id=%s"
         values = (new_status, emp_id)
         try:
-            cursor.execute(query, values)
+            cursor = StatementCache.get_instance().run(conn, query, values)
             conn.commit()
+            self.cache.pop(emp_id)
+            loaded = IdentityMap.get_instance().get(Employee, emp_id)
+            if loaded is not None:
+                loaded.setStatus(new_status)
             return cursor.rowcount > 0
         except mysql.connector.Error as err:
-            print(f"Error UPDATE Employee Status: {err}")
+            log.error("Error UPDATE Employee Status: %s", err)
             conn.rollback()
             return False
         finally:
-            cursor.close()
             close_conn(conn)
             
     def delete(self, emp_id: int) -> bool:
         conn = get_conn()
-        cursor = conn.cursor()
         query = "DELETE FROM EMPLOYEES WHERE employee_id = %s"
         try:
-            cursor.execute(query, (emp_id,))
+            cursor = StatementCache.get_instance().run(conn, query, (emp_id,))
             conn.commit()
+            IdentityMap.get_instance().discard(Employee, emp_id)
+            self.cache.pop(emp_id)
             return cursor.rowcount > 0
         except mysql.connector.Error as err:
-            print(f"Error DELETE Employee: {err}")
+            log.error("Error DELETE Employee: %s", err)
             conn.rollback()
             return False
         finally:
-            cursor.close()
             close_conn(conn)
\ No newline at end of file
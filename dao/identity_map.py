@@ -0,0 +1,87 @@
+import threading
+import weakref
+
+from customer import Customer
+from employee import Employee
+from reservation import Reservation
+from room import Room
+from service import Service
+
+# Campos que se copian (getX -> setX) sobre la instancia ya cargada al recibir una fila nueva.
+MERGE_FIELDS = {
+    Room: ('RoomNumber', 'Type', 'Status', 'Cost', 'Description'),
+    Service: ('Type', 'Cost', 'Description'),
+    Customer: ('Name', 'SecondName', 'LastName', 'SecondLastName', 'Phone', 'Email', 'State', 'Curp', 'Password'),
+    Employee: ('FirstName', 'SecondName', 'LastName', 'SecondLastName', 'Phone', 'Email', 'Status', 'Curp', 'Password'),
+    Reservation: ('CheckIn', 'CheckOut', 'Customer', 'Room', 'TotalCost'),
+}
+
+
+def merge(target, source, fields):
+    for field in fields:
+        getattr(target, 'set' + field)(getattr(source, 'get' + field)())
+
+
+class IdentityMap:
+    """
+    Mapa de identidad de la sesion, compartido por todos los DAOs: cada llave
+    primaria corresponde a una sola instancia en memoria.
+
+    Guarda referencias debiles, asi que no retiene entidades que ya nadie usa
+    (por ejemplo las que el repositorio descarta de su conjunto de trabajo).
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        """Inicia una sesion nueva; las instancias previas dejan de compartirse."""
+        cls._instance = None
+
+    def __init__(self):
+        self._maps = {}
+        self._lock = threading.Lock()
+
+    def _map_for(self, kind):
+        entities = self._maps.get(kind)
+        if entities is None:
+            entities = self._maps.setdefault(kind, weakref.WeakValueDictionary())
+        return entities
+
+    def get(self, kind, key):
+        return self._map_for(kind).get(key)
+
+    def add(self, kind, key, obj):
+        if key:
+            self._map_for(kind)[key] = obj
+        return obj
+
+    def resolve(self, kind, key, factory, *args):
+        """
+        Devuelve la instancia para `key`: la ya cargada, con los valores de la
+        fila recien leida, o una nueva construida con factory(*args).
+        """
+        entities = self._map_for(kind)
+        obj = entities.get(key)
+        if obj is not None:
+            # Quien ya tiene la instancia ve lo que cambio en la BD desde que se cargo.
+            merge(obj, factory(*args), MERGE_FIELDS.get(kind, ()))
+        else:
+            # Los DAOs tambien corren en hilos de fondo; dos filas iguales no deben crear dos instancias.
+            with self._lock:
+                obj = entities.get(key)
+                if obj is None:
+                    obj = factory(*args)
+                    entities[key] = obj
+        return obj
+
+    def discard(self, kind, key):
+        self._map_for(kind).pop(key, None)
+
+    def __len__(self):
+        return sum(len(entities) for entities in self._maps.values())
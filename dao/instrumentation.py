@@ -0,0 +1,338 @@
+"""
+Medicion de los DAOs y configuracion del logging.
+
+@instrumented envuelve los metodos publicos de un DAO y acumula por
+"Clase.metodo": llamadas, errores, histograma de latencias, filas devueltas y
+espera por conexion del pool. Los metodos que devuelven un generador se miden
+solo mientras producen filas, no mientras el consumidor las procesa.
+
+Con SLOW_QUERY_MS > 0, get_conn entrega conexiones cuyos cursores registran
+en el logger "hotel.slow_query" cada sentencia que tarde mas que el umbral,
+con su SQL, los tipos de sus parametros y el metodo del DAO que la ejecuto. Se mide execute;
+en cursores sin buffer la lectura de filas queda fuera. Con 0 la conexion se
+entrega tal cual y no hay costo. Los valores de los parametros (contrasenas,
+datos de clientes) solo se escriben con SLOW_QUERY_PARAMS=values, y aun asi
+no los de sentencias que tocan una columna de contrasena.
+
+Los mensajes van por `logging` con formato perezoso (%s): si el nivel esta
+desactivado no se arma el texto.
+"""
+import bisect
+import functools
+import json
+import logging
+import re
+import threading
+import time
+import types
+from collections.abc import Sequence, Sized
+
+from mysql_env import LOG_LEVEL, LOG_FORMAT, SLOW_QUERY_MS, SLOW_QUERY_LOG, SLOW_QUERY_PARAMS, DAO_METRICS
+
+slow_log = logging.getLogger("hotel.slow_query")
+
+# Limites superiores (ms) de cada cubeta del histograma; la ultima junta todo lo demas.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+# Largo maximo de los parametros escritos en el registro de consultas lentas.
+MAX_PARAMS_CHARS = 500
+
+_WHITESPACE = re.compile(r"\s+")
+_SECRET_COLUMNS = re.compile(r"password|passwd|secret|token", re.IGNORECASE)
+_context = threading.local()
+
+
+class MethodStats:
+    __slots__ = ('calls', 'errors', 'total', 'max', 'rows', 'pool_wait', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.pool_wait = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def percentile(self, pct):
+        """Limite superior (ms) de la cubeta donde cae el percentil; es una cota, no el valor exacto."""
+        if not self.calls:
+            return 0.0
+        target = self.calls * pct / 100.0
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else self.max * 1000
+        return self.max * 1000
+
+
+class DAOMetrics:
+    """Contadores por metodo de DAO; seguros entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def record(self, name, elapsed, rows, pool_wait, failed):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed * 1000)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = MethodStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.rows += rows
+            stats.pool_wait += pool_wait
+            stats.buckets[bucket] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'avg_ms': 1000 * stats.total / stats.calls,
+                    'p50_ms': stats.percentile(50),
+                    'p99_ms': stats.percentile(99),
+                    'max_ms': 1000 * stats.max,
+                    'rows': stats.rows,
+                    'pool_wait_ms': 1000 * stats.pool_wait,
+                    'histogram': dict(zip([f"<={b}ms" for b in LATENCY_BUCKETS_MS] + ["mas"], stats.buckets)),
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def format(self):
+        lines = ["DAO: llamadas  errores  prom_ms  p50<=ms  p99<=ms  max_ms  filas  espera_pool_ms"]
+        for name, snap in sorted(self.snapshot().items()):
+            lines.append(f"  {name}: {snap['calls']} {snap['errors']} {snap['avg_ms']:.2f} {snap['p50_ms']:.0f} "
+                         f"{snap['p99_ms']:.0f} {snap['max_ms']:.2f} {snap['rows']} {snap['pool_wait_ms']:.2f}")
+        return "\n".join(lines)
+
+
+metrics = DAOMetrics()
+
+
+class _Call:
+    __slots__ = ('name', 'pool_wait')
+
+    def __init__(self, name):
+        self.name = name
+        self.pool_wait = 0.0
+
+
+def _stack():
+    stack = getattr(_context, 'stack', None)
+    if stack is None:
+        stack = _context.stack = []
+    return stack
+
+
+def current_method():
+    stack = getattr(_context, 'stack', None)
+    return stack[-1].name if stack else None
+
+
+def record_pool_wait(seconds):
+    """Lo llama get_conn: suma la espera por conexion al metodo de DAO en curso."""
+    stack = getattr(_context, 'stack', None)
+    if stack:
+        stack[-1].pool_wait += seconds
+
+
+def _count_rows(result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        # get_changed_since y similares: (filas, marca_de_agua).
+        return len(result[0])
+    if result is None or isinstance(result, (bool, int, float)):
+        return 0
+    return 1
+
+
+def _timed_generator(name, generator):
+    # Solo cuenta el tiempo dentro de next(): lo que haga el consumidor entre filas no es costo del DAO.
+    call = _Call(name)
+    stack = _stack()
+    elapsed = 0.0
+    rows = 0
+    failed = False
+    try:
+        while True:
+            stack.append(call)
+            started = time.perf_counter()
+            try:
+                row = next(generator)
+            except StopIteration:
+                return
+            except Exception:
+                failed = True
+                raise
+            finally:
+                elapsed += time.perf_counter() - started
+                stack.pop()
+            rows += 1
+            yield row
+    finally:
+        generator.close()
+        metrics.record(name, elapsed, rows, call.pool_wait, failed)
+
+
+def _wrap(name, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        stack = _stack()
+        if stack and stack[-1].name == name:
+            # Llamada reentrante (create sin sesion se llama a si mismo con una): se mide una sola vez.
+            return method(*args, **kwargs)
+        call = _Call(name)
+        stack.append(call)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = method(*args, **kwargs)
+            failed = False
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            if failed:
+                metrics.record(name, elapsed, 0, call.pool_wait, True)
+        if isinstance(result, types.GeneratorType):
+            return _timed_generator(name, result)
+        metrics.record(name, elapsed, _count_rows(result), call.pool_wait, False)
+        return result
+    return wrapper
+
+
+def instrumented(cls):
+    """Decorador de clase: mide cada metodo publico definido en el DAO."""
+    if not DAO_METRICS:
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith('_') and isinstance(value, types.FunctionType):
+            setattr(cls, attr, _wrap(f"{cls.__name__}.{attr}", value))
+    return cls
+
+
+def _params_text(query, values, mode=None):
+    """
+    Parametros para el registro: sus tipos, o con mode="values" sus valores,
+    salvo en sentencias con contrasenas.
+    """
+    values = tuple(values) if values is not None else ()
+    mode = SLOW_QUERY_PARAMS if mode is None else mode
+    if mode == "values" and not _SECRET_COLUMNS.search(query):
+        text = repr(values)
+    else:
+        text = "(" + ", ".join(type(value).__name__ for value in values) + ("," if len(values) == 1 else "") + ")"
+    return text if len(text) <= MAX_PARAMS_CHARS else text[:MAX_PARAMS_CHARS] + "..."
+
+
+class TracedCursor:
+    """Cursor que registra en slow_log las sentencias mas lentas que el umbral."""
+
+    def __init__(self, cursor, threshold):
+        self._cursor = cursor
+        self._threshold = threshold
+
+    def _report(self, query, params, elapsed, rows=None):
+        if elapsed < self._threshold:
+            return
+        sql = _WHITESPACE.sub(" ", query).strip()
+        slow_log.warning("Consulta lenta (%.1f ms) en %s: %s", elapsed * 1000, current_method() or "<sin DAO>", sql,
+                         extra={'elapsed_ms': round(elapsed * 1000, 3), 'dao_method': current_method(),
+                                'sql': sql, 'params': params, 'batch_rows': rows})
+
+    def execute(self, query, values=(), *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, values, *args, **kwargs)
+        finally:
+            self._report(query, _params_text(query, values), time.perf_counter() - started)
+
+    def executemany(self, query, seq_values, *args, **kwargs):
+        # Las filas pasan tal cual (sin copiar el lote); se cuentan solo si el lote sabe su largo.
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, seq_values, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed >= self._threshold:
+                first = seq_values[0] if isinstance(seq_values, Sequence) and seq_values else None
+                rows = len(seq_values) if isinstance(seq_values, Sized) else None
+                self._report(query, _params_text(query, first), elapsed, rows)
+
+    def __getattr__(self, attr):
+        return getattr(self._cursor, attr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+        return False
+
+
+class TracedConnection:
+    """Conexion prestada cuyos cursores son TracedCursor; lo demas se delega."""
+
+    def __init__(self, conn, threshold):
+        self.raw = conn
+        self._threshold = threshold
+
+    def cursor(self, *args, **kwargs):
+        return TracedCursor(self.raw.cursor(*args, **kwargs), self._threshold)
+
+    def __getattr__(self, attr):
+        return getattr(self.raw, attr)
+
+
+def traced(conn, threshold_ms=None):
+    """Envuelve la conexion si el registro de consultas lentas esta activo."""
+    threshold_ms = SLOW_QUERY_MS if threshold_ms is None else threshold_ms
+    return TracedConnection(conn, threshold_ms / 1000.0) if threshold_ms > 0 else conn
+
+
+def untraced(conn):
+    return conn.raw if isinstance(conn, TracedConnection) else conn
+
+
+class JSONFormatter(logging.Formatter):
+    """Una linea JSON por mensaje, con los campos pasados en `extra`."""
+    _STANDARD = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in self._STANDARD)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level=LOG_LEVEL, fmt=LOG_FORMAT, slow_query_log=SLOW_QUERY_LOG):
+    """
+    Configura el logger raiz: `fmt` "text" imprime "NIVEL: mensaje" como hasta
+    ahora; "json" escribe una linea JSON por evento. Con `slow_query_log` las
+    consultas lentas van ademas a ese archivo, siempre en JSON.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JSONFormatter() if fmt == "json" else logging.Formatter("%(levelname)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    if slow_query_log:
+        file_handler = logging.FileHandler(slow_query_log, encoding='utf-8')
+        file_handler.setFormatter(JSONFormatter())
+        slow_log.addHandler(file_handler)
@@ -1,14 +1,25 @@
+import logging
 import mysql.connector
-from db_connection import get_conn, close_conn
 from payment import Payment
+from dao.unit_of_work import UnitOfWork
 from typing import Optional
+from dao.instrumentation import instrumented
 
+log = logging.getLogger(__name__)
+
+@instrumented
 class PaymentDAO:
 
-    def create(self, payment: Payment) -> Optional[int]:
-        conn = None
-        cursor = None
-        
+    def create(self, payment: Payment, session: Optional[UnitOfWork] = None) -> Optional[int]:
+        """Guarda el pago; con `session` forma parte de esa transaccion y no hace commit."""
+        if session is None:
+            try:
+                with UnitOfWork() as session:
+                    return self.create(payment, session)
+            except mysql.connector.Error as err:
+                log.error("No se pudo guardar el pago en la BD: %s", err)
+                return None
+
         query = """
             INSERT INTO PAYMENTS 
             (amount, payment_method, payment_date) 
@@ -20,25 +31,9 @@ class PaymentDAO:
             payment.getDate()
         )
 
-        try:
-            conn = get_conn()
-            cursor = conn.cursor()
-            cursor.execute(query, values)
-            conn.commit()
-            
-            payment_id = cursor.lastrowid
-            payment.setId(payment_id)
-            
-            print(f"INFO: Pago #{payment_id} por ${payment.getAmount()} guardado en la BD.")
-            return payment_id
-
-        except mysql.connector.Error as err:
-            print(f"ERROR: No se pudo guardar el pago en la BD: {err}")
-            if conn:
-                conn.rollback()
-            return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                close_conn(conn)
\ No newline at end of file
+        previous_id = payment.getId()
+        payment_id = session.execute(query, values).lastrowid
+        payment.setId(payment_id)
+        session.on_rollback(lambda: payment.setId(previous_id))
+        session.on_commit(lambda: log.debug("Pago #%s por $%s guardado en la BD.", payment_id, payment.getAmount()))
+        return payment_id
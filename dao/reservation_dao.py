@@ -1,21 +1,49 @@
+import logging
 import mysql.connector
+from datetime import date
 from db_connection import get_conn, close_conn
 from customer import Customer
 from room import Room
 from reservation import Reservation
-from typing import Optional, List
+from dao.batching import insert_many, BATCH_SIZE
+from dao.streaming import stream_rows, CHUNK_SIZE
+from dao.identity_map import IdentityMap
+from dao.change_log import fetch_changed
+from dao.unit_of_work import UnitOfWork
+from room_availability import to_ordinal
+from mysql_env import PAGE_SIZE
+from typing import Iterable, Iterator, Optional, List, Tuple
+from dao.instrumentation import instrumented
 
+log = logging.getLogger(__name__)
+
+# ER_DUP_ENTRY: la llave (room_id, night) de ROOM_NIGHTS ya existe.
+DUPLICATE_ENTRY = 1062
+
+
+class RoomNotAvailableError(LookupError):
+    """Otra reserva ya tiene la habitacion en alguna de las noches pedidas."""
+
+
+def stay_nights(check_in, check_out) -> List[date]:
+    """Noches de la estancia [check_in, check_out): una fecha por noche."""
+    first, last = to_ordinal(check_in), to_ordinal(check_out)
+    if last <= first:
+        raise ValueError("La fecha de salida debe ser posterior a la fecha de entrada.")
+    return [date.fromordinal(night) for night in range(first, last)]
+
+
+@instrumented
 class ReservationDAO:
+    _INSERT = """
+        INSERT INTO RESERVATIONS 
+        (customer_id, room_id, check_in_date, check_out_date, status, total_cost) 
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    _CLAIM_NIGHT = "INSERT INTO ROOM_NIGHTS (room_id, night, reservation_id) VALUES (%s, %s, %s)"
 
-    def create(self, res: Reservation, total_cost: float) -> Optional[int]:
-        conn = None
-        cursor = None
-        query = """
-            INSERT INTO RESERVATIONS 
-            (customer_id, room_id, check_in_date, check_out_date, status, total_cost) 
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        values = (
+    def _to_values(self, res: Reservation, total_cost: float) -> tuple:
+        return (
             res.getCustomer().getId(),
             res.getRoom().getId(),
             res.getCheckIn(),
@@ -24,64 +52,284 @@ class ReservationDAO:
             total_cost
         )
 
+    def _assign_id(self, res: Reservation, res_id: int, total_cost: float):
+        res.setId(res_id)
+        res.setTotalCost(total_cost)
+        IdentityMap.get_instance().add(Reservation, res_id, res)
+
+    def _night_values(self, res: Reservation, res_id: int) -> List[tuple]:
+        room_id = res.getRoom().getId()
+        return [(room_id, night, res_id) for night in stay_nights(res.getCheckIn(), res.getCheckOut())]
+
+    def _claim_nights(self, session: UnitOfWork, res: Reservation, res_id: int):
+        """
+        Reclama cada noche de la estancia en ROOM_NIGHTS. La llave (room_id, night)
+        es unica: si otra terminal ya confirmo alguna de esas noches el INSERT
+        falla y toda la transaccion se revierte, sin bloquear la tabla.
+        """
+        values = self._night_values(res, res_id)
+        # Una sentencia fija para cualquier largo de estancia: no ocupa una preparada por cada numero de noches.
+        try:
+            session.executemany(self._CLAIM_NIGHT, values)
+        except mysql.connector.IntegrityError as err:
+            if getattr(err, 'errno', None) != DUPLICATE_ENTRY:
+                raise
+            raise RoomNotAvailableError(
+                f"La habitacion {res.getRoom().getRoomNumber()} ya esta reservada entre {res.getCheckIn()} y {res.getCheckOut()}."
+            ) from err
+        return len(values)
+
+    def create(self, res: Reservation, total_cost: float, session: Optional[UnitOfWork] = None) -> Optional[int]:
+        """
+        Guarda la reserva y reclama sus noches; con `session` forma parte de esa
+        transaccion y no hace commit. Lanza RoomNotAvailableError si alguna noche
+        ya esta tomada.
+        """
+        if session is None:
+            try:
+                with UnitOfWork() as session:
+                    return self.create(res, total_cost, session)
+            except mysql.connector.Error as err:
+                log.error("No se pudo crear la reserva en la BD: %s", err)
+                return None
+
+        previous_id = res.getId()
+        res_id = session.execute(self._INSERT, self._to_values(res, total_cost)).lastrowid
+        self._assign_id(res, res_id, total_cost)
+
+        def undo():
+            IdentityMap.get_instance().discard(Reservation, res_id)
+            res.setId(previous_id)
+        session.on_rollback(undo)
+        nights = self._claim_nights(session, res, res_id)
+        session.on_commit(lambda: log.debug("Reserva #%s creada en la BD (%s noches).", res_id, nights))
+        return res_id
+
+    def create_many(self, reservations: Iterable[Tuple[Reservation, float]], batch_size: int = BATCH_SIZE) -> List[int]:
+        """Recibe pares (reserva, costo_total). Un lote con alguna noche ya tomada se revierte completo."""
+        def claim(cursor, batch, batch_ids):
+            cursor.executemany(self._CLAIM_NIGHT, [values for (res, _), res_id in zip(batch, batch_ids)
+                                                   for values in self._night_values(res, res_id)])
+
+        return insert_many(self._INSERT, reservations, lambda pair: self._to_values(*pair),
+                           lambda pair, res_id: self._assign_id(pair[0], res_id, pair[1]), batch_size, "reservas",
+                           before_commit=claim)
+
+    _SELECT = """
+        SELECT 
+            r.reservation_id, r.check_in_date, r.check_out_date, r.status, r.total_cost,
+            c.customer_id, c.first_name, c.second_name, c.last_name, c.second_last_name, c.phone, c.email, c.state, c.curp, c.password_hash,
+            rm.room_id, rm.room_number, rm.room_type, rm.status, rm.cost_per_night, rm.description
+        FROM RESERVATIONS r
+        JOIN CUSTOMERS c ON r.customer_id = c.customer_id
+        JOIN ROOMS rm ON r.room_id = rm.room_id
+    """
+
+    def _related(self, record):
+        # Cliente y habitacion se comparten entre filas: un huesped con 50 estancias es un solo objeto.
+        identity = IdentityMap.get_instance()
+        customer = identity.resolve(Customer, record[5], Customer, *record[5:15])
+        room = identity.resolve(Room, record[15], Room, *record[15:21])
+        return customer, room
+
+    def _from_record(self, record) -> Reservation:
+        customer, room = self._related(record)
+        identity = IdentityMap.get_instance()
+        loaded = identity.get(Reservation, record[0])
+        previous_customer = loaded.getCustomer() if loaded is not None else None
+        reservation = identity.resolve(Reservation, record[0], Reservation, record[0], str(record[1]), str(record[2]),
+                                       customer, room, None, record[4])
+        # Si la reserva cambio de huesped, el anterior deja de tenerla.
+        if previous_customer is not None and previous_customer is not customer:
+            previous_customer.unlinkReservation(reservation.getId())
+        customer.linkReservation(reservation)
+        return reservation
+
+    def _fetch(self, where: str = "", values: tuple = ()) -> List[Reservation]:
+        conn = None
+        cursor = None
+        reservations = []
         try:
             conn = get_conn()
             cursor = conn.cursor()
-            cursor.execute(query, values)
-            conn.commit()
-            
-            res_id = cursor.lastrowid
-            res.setId(res_id)
-            
-            print(f"INFO: Reserva #{res_id} creada en la BD.")
-            return res_id
-
+            cursor.execute(self._SELECT + where, values)
+            for record in cursor.fetchall():
+                reservations.append(self._from_record(record))
         except mysql.connector.Error as err:
-            print(f"ERROR: No se pudo crear la reserva en la BD: {err}")
-            if conn:
-                conn.rollback()
-            return None
+            log.error("No se pudieron obtener las reservas de la BD: %s", err)
         finally:
             if cursor:
                 cursor.close()
             if conn:
                 close_conn(conn)
+        return reservations
 
     def get_all(self) -> List[Reservation]:
-        conn = None
-        cursor = None
-        reservations = []
-        query = """
-            SELECT 
-                r.reservation_id, r.check_in_date, r.check_out_date, r.status, r.total_cost,
-                c.customer_id, c.first_name, c.second_name, c.last_name, c.second_last_name, c.phone, c.email, c.state, c.curp, c.password_hash,
-                rm.room_id, rm.room_number, rm.room_type, rm.status, rm.cost_per_night, rm.description
+        reservations = self._fetch()
+        log.info("Se cargaron %s reservas desde la BD.", len(reservations))
+        return reservations
+
+    def get_by_id(self, reservation_id: int) -> Optional[Reservation]:
+        found = self._fetch(" WHERE r.reservation_id = %s", (reservation_id,))
+        return found[0] if found else None
+
+    def get_page(self, after_id: int = 0, limit: int = 100) -> List[Reservation]:
+        return list(self.iter_page(after_id, limit))
+
+    def get_by_date_window(self, start, end=None) -> List[Reservation]:
+        """Reservas cuya estancia se cruza con [start, end); end=None deja el rango abierto."""
+        if end is None:
+            return self._fetch(" WHERE r.check_out_date > %s", (start,))
+        return self._fetch(" WHERE r.check_out_date > %s AND r.check_in_date < %s", (start, end))
+
+    def iter_all(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Reservation]:
+        for record in stream_rows(self._SELECT, chunk_size=chunk_size, label="reservas"):
+            yield self._from_record(record)
+
+    _SELECT_CHANGED = """
+        SELECT 
+            r.reservation_id, r.check_in_date, r.check_out_date, r.status, r.total_cost,
+            c.customer_id, c.first_name, c.second_name, c.last_name, c.second_last_name, c.phone, c.email, c.state, c.curp, c.password_hash,
+            rm.room_id, rm.room_number, rm.room_type, rm.status, rm.cost_per_night, rm.description,
+            r.updated_at
+        FROM RESERVATIONS r
+        JOIN CUSTOMERS c ON r.customer_id = c.customer_id
+        JOIN ROOMS rm ON r.room_id = rm.room_id
+        WHERE r.updated_at > %s
+        ORDER BY r.updated_at
+    """
+
+    def get_changed_since(self, since) -> Tuple[List[Reservation], object]:
+        """Reservas modificadas despues de `since` como instancias nuevas; cliente y habitacion salen del mapa de identidad."""
+        records, watermark = fetch_changed(self._SELECT_CHANGED, since, "reservas")
+        changed = []
+        for record in records:
+            customer, room = self._related(record)
+            changed.append(Reservation(record[0], str(record[1]), str(record[2]), customer, room, None, record[4]))
+        return changed, watermark
+
+    def iter_page(self, after_id: int = 0, limit: int = CHUNK_SIZE) -> Iterator[Reservation]:
+        """Pagina por llave: filas con id mayor a after_id, en orden de id."""
+        query = self._SELECT + " WHERE r.reservation_id > %s ORDER BY r.reservation_id LIMIT %s"
+        for record in stream_rows(query, (after_id, limit), chunk_size=limit, label="reservas"):
+            yield self._from_record(record)
+
+    # Dias como ordinales de Python: TO_DAYS('0001-01-01') es 366 y date(1, 1, 1).toordinal() es 1.
+    _FACT_SELECT = """
+        SELECT reservation_id, room_id, customer_id,
+               TO_DAYS(check_in_date) - 365, TO_DAYS(check_out_date) - 365,
+               CAST(COALESCE(total_cost, 0) AS DOUBLE)
+        FROM RESERVATIONS
+        ORDER BY reservation_id
+    """
+
+    def iter_fact_rows(self, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Filas numericas para analitica, sin construir entidades:
+        (id, room_id, customer_id, check_in, check_out, total_cost) con fechas en ordinal.
+        """
+        return stream_rows(self._FACT_SELECT, chunk_size=chunk_size, label="reservas")
+
+    # Columnas exportables -> expresion SQL. Es la lista blanca completa: password_hash no esta y no puede pedirse.
+    EXPORT_COLUMNS = {
+        'reservation_id': "r.reservation_id",
+        'check_in': "r.check_in_date",
+        'check_out': "r.check_out_date",
+        'nights': "TO_DAYS(r.check_out_date) - TO_DAYS(r.check_in_date)",
+        'status': "r.status",
+        'total_cost': "r.total_cost",
+        'payment_id': "r.payment_id",
+        'updated_at': "r.updated_at",
+        'customer_id': "c.customer_id",
+        'customer_first_name': "c.first_name",
+        'customer_last_name': "c.last_name",
+        'customer_email': "c.email",
+        'customer_phone': "c.phone",
+        'customer_state': "c.state",
+        'customer_curp': "c.curp",
+        'room_id': "rm.room_id",
+        'room_number': "rm.room_number",
+        'room_type': "rm.room_type",
+        'room_cost_per_night': "rm.cost_per_night",
+    }
+    DEFAULT_EXPORT_COLUMNS = ('reservation_id', 'check_in', 'check_out', 'nights', 'status', 'total_cost', 'payment_id',
+                              'customer_id', 'customer_first_name', 'customer_last_name', 'customer_email',
+                              'room_id', 'room_number', 'room_type')
+
+    def iter_export_rows(self, columns: Optional[Iterable[str]] = None, start=None, end=None,
+                         chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Filas del JOIN reserva-cliente-habitacion tal como llegan del cursor, sin
+        construir entidades, con las columnas pedidas de EXPORT_COLUMNS y en orden
+        de id. start/end filtran por fecha de entrada en [start, end).
+        """
+        columns = list(columns or self.DEFAULT_EXPORT_COLUMNS)
+        unknown = [name for name in columns if name not in self.EXPORT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Columnas no exportables: {', '.join(unknown)}")
+        conditions = []
+        values = []
+        if start is not None:
+            conditions.append("r.check_in_date >= %s")
+            values.append(start)
+        if end is not None:
+            conditions.append("r.check_in_date < %s")
+            values.append(end)
+        query = f"""
+            SELECT {", ".join(self.EXPORT_COLUMNS[name] for name in columns)}
             FROM RESERVATIONS r
             JOIN CUSTOMERS c ON r.customer_id = c.customer_id
             JOIN ROOMS rm ON r.room_id = rm.room_id
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY r.reservation_id
         """
-        try:
-            conn = get_conn()
-            cursor = conn.cursor()
-            cursor.execute(query)
-            records = cursor.fetchall()
+        return stream_rows(query, tuple(values), chunk_size=chunk_size, label="reservas", strict=True)
 
-            for record in records:
-                customer = Customer(record[5], record[6], record[7], record[8], record[9], record[10], record[11], record[12], record[13], record[14])
-                room = Room(record[15], record[16], record[17], record[18], record[19], record[20])
+    # Columnas por las que el listado puede ordenarse; la llave del diccionario es lo unico que llega de la GUI.
+    SUMMARY_SORT_COLUMNS = {
+        'id': "r.reservation_id",
+        'customer': "CONCAT_WS(' ', c.first_name, c.last_name)",
+        'room': "rm.room_number",
+        'check_in': "r.check_in_date",
+        'check_out': "r.check_out_date",
+        'cost': "COALESCE(r.total_cost, 0)",
+    }
 
-                reservation = Reservation(record[0], str(record[1]), str(record[2]), customer, room)
-                reservations.append(reservation)
+    def get_summary_page(self, sort: str = 'id', descending: bool = False, search: str = "",
+                         after: Optional[tuple] = None, limit: int = PAGE_SIZE) -> List[tuple]:
+        """
+        Filas ligeras para el listado: (id, cliente, habitacion, check_in, check_out, costo_total).
 
-            print(f"INFO: Se cargaron {len(reservations)} reservas desde la BD.")
-        except mysql.connector.Error as err:
-            print(f"ERROR: No se pudieron obtener las reservas de la BD: {err}")
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                close_conn(conn)
-        return reservations
+        Ordena y filtra en el servidor y pagina por llave: `after` es la pareja
+        (valor_de_orden, id) de la ultima fila mostrada. No construye entidades.
+        """
+        if sort not in self.SUMMARY_SORT_COLUMNS:
+            raise ValueError(f"Columna de orden invalida: {sort}")
+        column = self.SUMMARY_SORT_COLUMNS[sort]
+        direction, op = ("DESC", "<") if descending else ("ASC", ">")
+        conditions = []
+        values = []
+        if search:
+            # '!' como escape: MySQL y SQLite interpretan distinto la diagonal invertida en ESCAPE.
+            pattern = "%" + search.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+            conditions.append("(c.first_name LIKE %s ESCAPE '!' OR c.last_name LIKE %s ESCAPE '!' "
+                              "OR c.email LIKE %s ESCAPE '!' OR rm.room_number LIKE %s ESCAPE '!')")
+            values.extend([pattern] * 4)
+        if after is not None:
+            conditions.append(f"({column}, r.reservation_id) {op} (%s, %s)")
+            values.extend(after)
+        query = f"""
+            SELECT r.reservation_id, CONCAT_WS(' ', c.first_name, c.last_name), rm.room_number,
+                   r.check_in_date, r.check_out_date, COALESCE(r.total_cost, 0)
+            FROM RESERVATIONS r
+            JOIN CUSTOMERS c ON r.customer_id = c.customer_id
+            JOIN ROOMS rm ON r.room_id = rm.room_id
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY {column} {direction}, r.reservation_id {direction}
+            LIMIT %s
+        """
+        values.append(limit)
+        return list(stream_rows(query, tuple(values), chunk_size=limit, label="reservas"))
 
     def delete(self, reservation_id: int) -> bool:
         conn = None
@@ -94,11 +342,16 @@ class ReservationDAO:
             conn.commit()
             
             if cursor.rowcount > 0:
-                print(f"INFO: Reserva #{reservation_id} eliminada de la BD.")
+                identity = IdentityMap.get_instance()
+                loaded = identity.get(Reservation, reservation_id)
+                if loaded is not None:
+                    loaded.getCustomer().unlinkReservation(reservation_id)
+                identity.discard(Reservation, reservation_id)
+                log.debug("Reserva #%s eliminada de la BD.", reservation_id)
                 return True
             return False
         except mysql.connector.Error as err:
-            print(f"ERROR: No se pudo eliminar la reserva #{reservation_id}: {err}")
+            log.error("No se pudo eliminar la reserva #%s: %s", reservation_id, err)
             if conn:
                 conn.rollback()
             return False
@@ -108,32 +361,18 @@ class ReservationDAO:
             if conn:
                 close_conn(conn)
 
-    def link_payment(self, reservation_id: int, payment_id: int) -> bool:
-        conn = None
-        cursor = None
-        query = "UPDATE RESERVATIONS SET payment_id = %s WHERE reservation_id = %s"
-        values = (payment_id, reservation_id)
-
-        try:
-            conn = get_conn()
-            cursor = conn.cursor()
-            cursor.execute(query, values)
-            conn.commit()
-            
-            if cursor.rowcount > 0:
-                print(f"INFO: Pago #{payment_id} asociado a la Reserva #{reservation_id}.")
-                return True
-            else:
-                print(f"WARN: No se encontró la Reserva #{reservation_id} para asociar el pago.")
+    def link_payment(self, reservation_id: int, payment_id: int, session: Optional[UnitOfWork] = None) -> bool:
+        if session is None:
+            try:
+                with UnitOfWork() as session:
+                    return self.link_payment(reservation_id, payment_id, session)
+            except mysql.connector.Error as err:
+                log.error("No se pudo asociar el pago a la reserva: %s", err)
                 return False
 
-        except mysql.connector.Error as err:
-            print(f"ERROR: No se pudo asociar el pago a la reserva: {err}")
-            if conn:
-                conn.rollback()
-            return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                close_conn(conn)
\ No newline at end of file
+        query = "UPDATE RESERVATIONS SET payment_id = %s WHERE reservation_id = %s"
+        if session.execute(query, (payment_id, reservation_id)).rowcount > 0:
+            session.on_commit(lambda: log.debug("Pago #%s asociado a la Reserva #%s.", payment_id, reservation_id))
+            return True
+        log.warning("No se encontró la Reserva #%s para asociar el pago.", reservation_id)
+        return False
@@ -1,9 +1,27 @@
+import logging
 import mysql.connector
 from db_connection import get_conn, close_conn
 from room import Room
-from typing import List, Optional
+from dao.batching import insert_many, BATCH_SIZE
+from dao.streaming import stream_rows, CHUNK_SIZE
+from dao.identity_map import IdentityMap
+from dao.change_log import fetch_changed
+from typing import Iterable, Iterator, List, Optional, Tuple
+from dao.instrumentation import instrumented
 
+log = logging.getLogger(__name__)
+
+@instrumented
 class RoomDAO:
+    _SELECT = "SELECT room_id, room_number, room_type, status, cost_per_night, description FROM ROOMS"
+    _INSERT = "INSERT INTO ROOMS (room_number, room_type, status, cost_per_night, description) VALUES (%s, %s, %s, %s, %s)"
+
+    def _to_values(self, room: Room) -> tuple:
+        return (room.getRoomNumber(), room.getType(), room.getStatus(), room.getCost(), room.getDescription())
+
+    def _assign_id(self, room: Room, room_id: int):
+        room.setId(room_id)
+        IdentityMap.get_instance().add(Room, room_id, room)
 
     def create(self, room: Room) -> Optional[int]:
         conn = None
@@ -11,18 +29,15 @@ class RoomDAO:
         try:
             conn = get_conn()
             cursor = conn.cursor()
-            query = "INSERT INTO ROOMS (room_number, room_type, status, cost_per_night, description) VALUES (%s, %s, %s, %s, %s)"
-            values = (room.getRoomNumber(), room.getType(), room.getStatus(), room.getCost(), room.getDescription())
-            
-            cursor.execute(query, values)
+            cursor.execute(self._INSERT, self._to_values(room))
             conn.commit()
             
             room_id = cursor.lastrowid
-            room.setId(room_id)
-            print(f"INFO: Habitacion creada en la BD con ID: {room_id}.")
+            self._assign_id(room, room_id)
+            log.debug("Habitacion creada en la BD con ID: %s.", room_id)
             return room.getId()
         except mysql.connector.Error as err:
-            print(f"ERROR: No se pudo crear la habitacion {room.getId()}: {err}")
+            log.error("No se pudo crear la habitacion %s: %s", room.getId(), err)
             if conn:
                 conn.rollback()
             return None
@@ -32,6 +47,12 @@ class RoomDAO:
             if conn:
                 close_conn(conn)
 
+    def create_many(self, rooms: Iterable[Room], batch_size: int = BATCH_SIZE) -> List[int]:
+        return insert_many(self._INSERT, rooms, self._to_values, self._assign_id, batch_size, "habitaciones")
+
+    def _from_record(self, record) -> Room:
+        return IdentityMap.get_instance().resolve(Room, record[0], Room, *record)
+
     def get_all(self) -> List[Room]:
         conn = None
         cursor = None
@@ -39,18 +60,36 @@ class RoomDAO:
         try:
             conn = get_conn()
             cursor = conn.cursor()
-            query = "SELECT room_id, room_number, room_type, status, cost_per_night, description FROM ROOMS"
-            cursor.execute(query)
+            cursor.execute(self._SELECT)
             records = cursor.fetchall()
             for record in records:
-                (room_id, room_number, room_type, status, cost, description) = record
-                rooms.append(Room(room_id, room_number, room_type, status, cost, description))
-            print(f"INFO: Se cargaron {len(rooms)} habitaciones desde la BD.")
+                rooms.append(self._from_record(record))
+            log.info("Se cargaron %s habitaciones desde la BD.", len(rooms))
         except mysql.connector.Error as err:
-            print(f"ERROR: No se pudieron obtener las habitaciones de la BD: {err}")
+            log.error("No se pudieron obtener las habitaciones de la BD: %s", err)
         finally:
             if cursor:
                 cursor.close()
             if conn:
                 close_conn(conn)
-        return rooms
\ No newline at end of file
+        return rooms
+
+    def iter_all(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Room]:
+        for record in stream_rows(self._SELECT, chunk_size=chunk_size, label="habitaciones"):
+            yield self._from_record(record)
+
+    _SELECT_CHANGED = """
+        SELECT room_id, room_number, room_type, status, cost_per_night, description, updated_at
+        FROM ROOMS WHERE updated_at > %s ORDER BY updated_at
+    """
+
+    def get_changed_since(self, since) -> Tuple[List[Room], object]:
+        """Filas modificadas despues de `since` como instancias nuevas (fuera del mapa de identidad) y la nueva marca de agua."""
+        records, watermark = fetch_changed(self._SELECT_CHANGED, since, "habitaciones")
+        return [Room(*record) for record in records], watermark
+
+    def iter_page(self, after_id: int = 0, limit: int = CHUNK_SIZE) -> Iterator[Room]:
+        """Pagina por llave: filas con id mayor a after_id, en orden de id."""
+        query = self._SELECT + " WHERE room_id > %s ORDER BY room_id LIMIT %s"
+        for record in stream_rows(query, (after_id, limit), chunk_size=limit, label="habitaciones"):
+            yield self._from_record(record)
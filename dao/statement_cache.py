@@ -0,0 +1,124 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import mysql.connector
+from mysql_env import STATEMENT_CACHE_SIZE
+
+# ER_UNKNOWN_STMT_HANDLER: el servidor ya no conoce la sentencia (la conexion se reabrio).
+UNKNOWN_STATEMENT = 1243
+
+
+class StatementCache:
+    """
+    Sentencias preparadas en el servidor, reutilizadas por conexion real del pool.
+
+    Cada conexion fisica guarda hasta `max_size` cursores preparados, uno por
+    texto SQL, y descarta el usado hace mas tiempo. Repetir una consulta solo
+    envia los parametros: el servidor no vuelve a analizarla ni a planearla.
+
+    Una conexion la usa un solo hilo a la vez, asi que solo el registro de
+    conexiones necesita candado.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        cls._instance = None
+
+    def __init__(self, max_size=STATEMENT_CACHE_SIZE):
+        if max_size <= 0:
+            raise ValueError("max_size debe ser mayor a cero.")
+        self.max_size = max_size
+        self._by_connection = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.prepares = 0
+        self.hits = 0
+        self.evictions = 0
+        self.reprepares = 0
+
+    @staticmethod
+    def _physical(conn):
+        # La conexion prestada por el pool cambia en cada prestamo; la fisica (_cnx) es la que guarda las sentencias.
+        return getattr(conn, '_cnx', None) or conn
+
+    def _statements(self, conn):
+        physical = self._physical(conn)
+        with self._lock:
+            statements = self._by_connection.get(physical)
+            if statements is None:
+                statements = self._by_connection[physical] = OrderedDict()
+            return statements
+
+    def _entry(self, conn, query):
+        statements = self._statements(conn)
+        entry = statements.get(query)
+        if entry is not None:
+            statements.move_to_end(query)
+            with self._lock:
+                self.hits += 1
+            return entry
+        # Se guarda el mismo objeto str: el cursor preparado compara la consulta por identidad.
+        entry = (query, conn.cursor(prepared=True))
+        statements[query] = entry
+        with self._lock:
+            self.prepares += 1
+        while len(statements) > self.max_size:
+            _, (_, evicted) = statements.popitem(last=False)
+            with self._lock:
+                self.evictions += 1
+            try:
+                evicted.close()
+            except mysql.connector.Error:
+                pass
+        return entry
+
+    def discard(self, conn):
+        """Olvida las sentencias de una conexion (por ejemplo tras reconectarla)."""
+        with self._lock:
+            self._by_connection.pop(self._physical(conn), None)
+
+    def run(self, conn, query, values=()):
+        """Ejecuta con la sentencia preparada de esta conexion y devuelve su cursor."""
+        canonical, cursor = self._entry(conn, query)
+        try:
+            cursor.execute(canonical, values)
+        except mysql.connector.Error as err:
+            if getattr(err, 'errno', None) != UNKNOWN_STATEMENT:
+                raise
+            self.discard(conn)
+            with self._lock:
+                self.reprepares += 1
+            canonical, cursor = self._entry(conn, query)
+            cursor.execute(canonical, values)
+        return cursor
+
+    def fetch_one(self, conn, query, values=()):
+        # Se leen todas las filas para no dejar resultados pendientes en la conexion.
+        rows = self.run(conn, query, values).fetchall()
+        return rows[0] if rows else None
+
+    def fetch_all(self, conn, query, values=()):
+        return self.run(conn, query, values).fetchall()
+
+    def stats(self):
+        with self._lock:
+            connections = len(self._by_connection)
+            cached = sum(len(statements) for statements in self._by_connection.values())
+        executions = self.prepares + self.hits
+        return {
+            'connections': connections,
+            'statements': cached,
+            'max_size': self.max_size,
+            'prepares': self.prepares,
+            'hits': self.hits,
+            'hit_ratio': self.hits / executions if executions else 0.0,
+            'evictions': self.evictions,
+            'reprepares': self.reprepares,
+        }
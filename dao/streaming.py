@@ -0,0 +1,48 @@
+import logging
+import mysql.connector
+from db_connection import get_conn, close_conn
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+
+def stream_rows(query: str, values: tuple = (), chunk_size: int = CHUNK_SIZE, label: str = "registros",
+                strict: bool = False):
+    """
+    Generador de filas con cursor sin buffer: el servidor envia el resultado
+    conforme se lee y fetchmany trae `chunk_size` filas a la vez, asi que la
+    memoria no crece con el tamano de la tabla.
+
+    La conexion queda prestada mientras el generador esta abierto; si el
+    consumidor se detiene antes, las filas pendientes se descartan al cerrarlo.
+    Un error de la BD corta la lectura y se registra; con `strict` ademas se
+    propaga, para quien no puede aceptar un resultado incompleto (exportaciones).
+    """
+    conn = None
+    cursor = None
+    finished = False
+    try:
+        conn = get_conn()
+        cursor = conn.cursor(buffered=False)
+        cursor.execute(query, values)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                finished = True
+                break
+            yield from rows
+    except mysql.connector.Error as err:
+        log.error("Fallo la lectura por bloques de %s: %s", label, err)
+        if strict:
+            raise
+    finally:
+        if conn and not finished:
+            try:
+                conn.consume_results()
+            except mysql.connector.Error:
+                pass
+        if cursor:
+            cursor.close()
+        if conn:
+            close_conn(conn)
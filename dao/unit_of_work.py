@@ -0,0 +1,81 @@
+from db_connection import get_conn, close_conn
+from dao.statement_cache import StatementCache
+
+
+class UnitOfWork:
+    """
+    Sesion de escritura: una conexion prestada del pool y una sola transaccion
+    para varias operaciones de distintos DAOs.
+
+        with UnitOfWork() as session:
+            reservation_dao.create(res, total, session=session)
+            payment_dao.create(payment, session=session)
+
+    Al salir sin error hace commit; si algo falla hace rollback de todo y la
+    excepcion sigue su curso. Los DAOs no hacen commit cuando reciben `session`.
+    Las sentencias se ejecutan preparadas (ver StatementCache); las de muchas
+    filas, con executemany sobre un cursor normal.
+    """
+
+    def __init__(self, timeout=None):
+        self._timeout = timeout
+        self._conn = None
+        self._on_commit = []
+        self._on_rollback = []
+
+    def __enter__(self):
+        self._conn = get_conn(self._timeout)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            close_conn(self._conn)
+            self._conn = None
+        return False
+
+    def execute(self, query, values=()):
+        """Ejecuta dentro de la transaccion; devuelve el cursor (lastrowid, rowcount)."""
+        if self._conn is None:
+            raise RuntimeError("La sesion no esta abierta; usela dentro de un bloque with.")
+        return StatementCache.get_instance().run(self._conn, query, values)
+
+    def executemany(self, query, seq_values):
+        """
+        Ejecuta la sentencia una vez por fila con un cursor normal, fuera de la
+        cache de sentencias preparadas; devuelve el cursor ya cerrado (rowcount).
+        """
+        if self._conn is None:
+            raise RuntimeError("La sesion no esta abierta; usela dentro de un bloque with.")
+        cursor = self._conn.cursor()
+        try:
+            cursor.executemany(query, seq_values)
+        finally:
+            cursor.close()
+        return cursor
+
+    def on_commit(self, callback):
+        """Registra trabajo en memoria que solo debe ocurrir si la transaccion se confirma."""
+        self._on_commit.append(callback)
+
+    def on_rollback(self, callback):
+        """Registra como deshacer un cambio en memoria si la transaccion se revierte."""
+        self._on_rollback.append(callback)
+
+    def commit(self):
+        self._conn.commit()
+        callbacks, self._on_commit, self._on_rollback = self._on_commit, [], []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        try:
+            self._conn.rollback()
+        finally:
+            callbacks, self._on_commit, self._on_rollback = self._on_rollback, [], []
+            for callback in reversed(callbacks):
+                callback()
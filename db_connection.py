@@ -1,9 +1,151 @@
+import logging
+import sys
+import threading
+import time
+from collections import deque
 import mysql.connector
+from mysql.connector.errors import InterfaceError, PoolError
 from mysql.connector.pooling import MySQLConnectionPool
-from mysql_env import HOST, PORT, DATABASE, USER, PASSWORD, POOL_SIZE
+from mysql_env import (HOST, PORT, DATABASE, USER, PASSWORD, POOL_SIZE, POOL_METRICS_INTERVAL,
+                       POOL_TIMEOUT, POOL_MAX_WAITERS, DB_BACKEND)
+from sqlite_backend import SQLiteDatabase
+from dao.instrumentation import traced, untraced, record_pool_wait, metrics as dao_metrics
+
+log = logging.getLogger(__name__)
+
+# Intentos por prestamo cuando la conexion entregada estaba rota y no pudo reabrirse.
+RECONNECT_ATTEMPTS = 2
+
+# Modulos auxiliares que piden conexiones en nombre de un DAO; se saltan al identificar al llamador.
+_HELPER_MODULES = {__name__, "dao.batching", "dao.streaming", "dao.unit_of_work"}
+
+
+class PoolMetrics:
+    """Contadores del pool: espera al pedir conexion, tiempo retenida por llamador, agotamientos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_out = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._checked_out.clear()
+            self.checkouts = 0
+            self.returns = 0
+            self.exhaustion_events = 0
+            self.timeouts = 0
+            self.replaced_connections = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.hold_by_caller = {}
+            self.connections_created = 0
+            self.creation_total = 0.0
+            self.creation_max = 0.0
+            self.pings = 0
+            self.ping_total = 0.0
+            self.ping_max = 0.0
+
+    def record_creation(self, seconds, count=1):
+        with self._lock:
+            self.connections_created += count
+            self.creation_total += seconds
+            self.creation_max = max(self.creation_max, seconds / count if count else seconds)
+
+    def record_ping(self, seconds):
+        with self._lock:
+            self.pings += 1
+            self.ping_total += seconds
+            self.ping_max = max(self.ping_max, seconds)
+
+    def record_checkout(self, conn, caller, wait):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self._checked_out[id(conn)] = (caller, time.perf_counter())
+
+    def record_return(self, conn):
+        with self._lock:
+            entry = self._checked_out.pop(id(conn), None)
+            if entry is None:
+                return
+            self.returns += 1
+            caller, started = entry
+            held = time.perf_counter() - started
+            stats = self.hold_by_caller.setdefault(caller, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += held
+            stats[2] = max(stats[2], held)
+
+    def record_exhausted(self):
+        with self._lock:
+            self.exhaustion_events += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_replaced(self):
+        with self._lock:
+            self.replaced_connections += 1
+
+    def snapshot(self, pool_size=POOL_SIZE):
+        with self._lock:
+            active = len(self._checked_out)
+            return {
+                'pool_size': pool_size,
+                'active': active,
+                'idle': max(pool_size - active, 0),
+                'checkouts': self.checkouts,
+                'returns': self.returns,
+                'exhaustion_events': self.exhaustion_events,
+                'timeouts': self.timeouts,
+                'replaced_connections': self.replaced_connections,
+                'wait_avg_ms': 1000 * self.wait_total / self.checkouts if self.checkouts else 0.0,
+                'wait_max_ms': 1000 * self.wait_max,
+                'connections_created': self.connections_created,
+                'creation_avg_ms': 1000 * self.creation_total / self.connections_created if self.connections_created else 0.0,
+                'creation_max_ms': 1000 * self.creation_max,
+                'pings': self.pings,
+                'ping_avg_ms': 1000 * self.ping_total / self.pings if self.pings else 0.0,
+                'ping_max_ms': 1000 * self.ping_max,
+                'hold_by_caller': {
+                    caller: {'count': count, 'avg_ms': 1000 * total / count, 'max_ms': 1000 * longest}
+                    for caller, (count, total, longest) in self.hold_by_caller.items()
+                },
+            }
+
+    def format(self, pool_size=POOL_SIZE):
+        snap = self.snapshot(pool_size)
+        lines = [
+            f"POOL: activas={snap['active']} libres={snap['idle']} prestamos={snap['checkouts']} "
+            f"agotado={snap['exhaustion_events']} timeouts={snap['timeouts']} espera_prom={snap['wait_avg_ms']:.2f}ms "
+            f"espera_max={snap['wait_max_ms']:.2f}ms creacion_prom={snap['creation_avg_ms']:.2f}ms"
+        ]
+        for caller, stats in sorted(snap['hold_by_caller'].items()):
+            lines.append(f"  {caller}: n={stats['count']} retenida_prom={stats['avg_ms']:.2f}ms max={stats['max_ms']:.2f}ms")
+        return "\n".join(lines)
+
+
+def _caller_name():
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get('__name__') in _HELPER_MODULES:
+        frame = frame.f_back
+    if frame is None:
+        return "<desconocido>"
+    code = frame.f_code
+    return getattr(code, 'co_qualname', code.co_name)
+
 
 class DBConnection:
     _instance = None
+    metrics = PoolMetrics()
+    _dump_timer = None
+    # Fila FIFO de llamadores esperando una conexion libre.
+    _available = threading.Condition()
+    _waiters = deque()
+    _releases = 0
 
     @classmethod
     def get_instance(cls):
@@ -15,36 +157,185 @@ class DBConnection:
                     "database": DATABASE,
                     "user": USER,
                     "password": PASSWORD,
-                    "pool_size": POOL_SIZE
+                    "pool_size": POOL_SIZE,
+                    # Reiniciar la sesion al devolver la conexion descartaria sus sentencias preparadas;
+                    # la transaccion abierta la cierra release().
+                    "pool_reset_session": False
                 }
+                # El pool abre todas sus conexiones al construirse.
+                started = time.perf_counter()
                 pool = MySQLConnectionPool(pool_name="hotel_pool", **dbconfig)
-                print("Pool de conexiones a MySQL creado exitosamente.")
+                cls.metrics.record_creation(time.perf_counter() - started, POOL_SIZE)
+                log.info("Pool de conexiones a MySQL creado exitosamente.")
                 cls._instance = pool
+                if POOL_METRICS_INTERVAL > 0:
+                    cls.start_metrics_dump(POOL_METRICS_INTERVAL)
             except mysql.connector.Error as err:
-                print(f"Error al conectar con MySQL: {err}")
+                log.error("Error al conectar con MySQL: %s", err)
                 raise
             except (ValueError, TypeError) as err:
-                print(f"Error en configuracion de conexion: {err}")
+                log.error("Error en configuracion de conexion: %s", err)
                 raise
         return cls._instance
 
+    @classmethod
+    def start_metrics_dump(cls, interval, sink=log.info):
+        """Registra (o envia a `sink`) las metricas del pool y de los DAOs cada `interval` segundos."""
+        cls.stop_metrics_dump()
+
+        def dump():
+            sink(cls.metrics.format() + "\n" + dao_metrics.format())
+            cls._dump_timer = threading.Timer(interval, dump)
+            cls._dump_timer.daemon = True
+            cls._dump_timer.start()
+
+        cls._dump_timer = threading.Timer(interval, dump)
+        cls._dump_timer.daemon = True
+        cls._dump_timer.start()
+
+    @classmethod
+    def stop_metrics_dump(cls):
+        if cls._dump_timer is not None:
+            cls._dump_timer.cancel()
+            cls._dump_timer = None
+
+    @classmethod
+    def _try_checkout(cls, pool):
+        """Una conexion libre del pool, o None si esta agotado."""
+        for attempt in range(RECONNECT_ATTEMPTS):
+            try:
+                return pool.get_connection()
+            except PoolError:
+                return None
+            except InterfaceError:
+                # El pool devolvio una conexion caida que no pudo reabrir; se intenta con la siguiente.
+                cls.metrics.record_replaced()
+                if attempt == RECONNECT_ATTEMPTS - 1:
+                    raise
+        return None
+
+    @classmethod
+    def acquire(cls, timeout=None):
+        """
+        Presta una conexion. Si el pool esta agotado el llamador se forma en una
+        fila FIFO (de a lo mas POOL_MAX_WAITERS) y espera hasta `timeout` segundos.
+
+        El candado solo cuida la fila: pool.get_connection() (que hace ping y
+        puede reconectar) corre fuera de el, asi que una reconexion lenta no
+        detiene a release() ni a los plazos de los demas.
+        """
+        pool = cls.get_instance()
+        timeout = POOL_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with cls._available:
+            first_in_line = not cls._waiters
+        if first_in_line:
+            conn = cls._try_checkout(pool)
+            if conn is not None:
+                return conn
+        with cls._available:
+            cls.metrics.record_exhausted()
+            if len(cls._waiters) >= POOL_MAX_WAITERS:
+                raise PoolError(f"Pool agotado y {len(cls._waiters)} llamadores en espera.")
+            ticket = object()
+            cls._waiters.append(ticket)
+        # Devoluciones vistas en el ultimo intento: sin una nueva no tiene caso volver a pedir.
+        seen = None
+        try:
+            while True:
+                with cls._available:
+                    while cls._waiters[0] is not ticket or cls._releases == seen:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            cls.metrics.record_timeout()
+                            raise PoolError(f"No se libero ninguna conexion en {timeout:.1f}s.")
+                        cls._available.wait(remaining)
+                    seen = cls._releases
+                conn = cls._try_checkout(pool)
+                if conn is not None:
+                    return conn
+        finally:
+            with cls._available:
+                cls._waiters.remove(ticket)
+                cls._available.notify_all()
+
+    @classmethod
+    def release(cls, connection):
+        # Sin autocommit cada lectura deja abierta una transaccion REPEATABLE READ y el pool
+        # no reinicia la sesion: si no se cierra aqui, el siguiente prestamo leeria esa foto vieja.
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except mysql.connector.Error as err:
+            log.warning("No se pudo revertir la transaccion al devolver la conexion: %s", err)
+        connection.close()
+        with cls._available:
+            cls._releases += 1
+            cls._available.notify_all()
+
+    @classmethod
+    def warm_up(cls):
+        """
+        Crea el pool al arrancar y verifica cada conexion con un ping,
+        reabriendo las caidas. Devuelve cuantas quedaron sanas.
+        """
+        pool = cls.get_instance()
+        borrowed = []
+        healthy = 0
+        try:
+            for _ in range(POOL_SIZE):
+                conn = cls._try_checkout(pool)
+                if conn is None:
+                    break
+                borrowed.append(conn)
+                started = time.perf_counter()
+                try:
+                    conn.ping(reconnect=True, attempts=RECONNECT_ATTEMPTS, delay=0)
+                    healthy += 1
+                except mysql.connector.Error as err:
+                    log.warning("Conexion del pool sin respuesta: %s", err)
+                    continue
+                # Las conexiones ya se contaron al crear el pool; aqui solo se mide el ping.
+                cls.metrics.record_ping(time.perf_counter() - started)
+        finally:
+            for conn in borrowed:
+                cls.release(conn)
+        log.info("Pool precalentado: %d/%d conexiones sanas.", healthy, POOL_SIZE)
+        return healthy
+
     def get_connection(self):
-        pool = self.get_instance()
-        return pool.get_connection()
+        return self.acquire()
 
     def close_connection(self, connection):
-        connection.close()
+        self.release(connection)
+
+def backend():
+    """Clase que presta las conexiones segun DB_BACKEND: el pool de MySQL o SQLite."""
+    return SQLiteDatabase if DB_BACKEND == "sqlite" else DBConnection
 
-def get_conn():
-    return DBConnection.get_instance().get_connection()
+def get_conn(timeout=None):
+    started = time.perf_counter()
+    conn = traced(backend().acquire(timeout))
+    wait = time.perf_counter() - started
+    DBConnection.metrics.record_checkout(conn, _caller_name(), wait)
+    record_pool_wait(wait)
+    return conn
 
 def close_conn(connection):
-    connection.close()
+    DBConnection.metrics.record_return(connection)
+    backend().release(untraced(connection))
+
+def warm_up():
+    return backend().warm_up()
+
+def get_pool_metrics():
+    return DBConnection.metrics.snapshot()
 
 if __name__ == '__main__':
     try:
         conn_test = get_conn()
         print(f"Conexion de prueba exitosa. ID: {conn_test.connection_id}")
         close_conn(conn_test)
+        print(DBConnection.metrics.format())
     except Exception as e:
-        print(f"CRITICAL: No se pudo inicializar el pool de conexiones a la BD: {e}")
\ No newline at end of file
+        print(f"CRITICAL: No se pudo inicializar el pool de conexiones a la BD: {e}")
@@ -1,4 +1,9 @@
+from interning import intern_value
+
 class Employee:
+    __slots__ = ('__id', '__firstName', '__secondName', '__lastName', '__secondLastName', '__phone', '__email',
+                 '__status', '__curp', '__password', '__weakref__')
+
     def __init__(self, id, firstName, secondName, lastName, secondLastName, phone, email, status, curp, password=""):
         self.__id = id
         self.__firstName = firstName
@@ -7,7 +12,7 @@ class Employee:
         self.__secondLastName = secondLastName
         self.__phone = phone
         self.__email = email
-        self.__status = status
+        self.__status = intern_value(status)
         self.__curp = curp
         self.__password = password
 
@@ -36,7 +41,7 @@ class Employee:
     def setPassword(self, password): self.__password = password
 
     def getStatus(self): return self.__status
-    def setStatus(self, status): self.__status = status
+    def setStatus(self, status): self.__status = intern_value(status)
 
     def getCurp(self): return self.__curp
     def setCurp(self, curp): self.__curp = curp
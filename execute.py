@@ -1,25 +1,24 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-from datetime import date
+from datetime import date, timedelta
 import re 
-import uuid 
+import gc
+import logging
 
-from customer import Customer
-from service import Service 
 from reservationService import ServiceReservation 
-from reservation import Reservation 
-from room import Room
-from employee import Employee
-from receptionist import Receptionist
-from bellboy import Bellboy
-from payment import Payment
-
-from dao.employee_dao import EmployeeDAO
-from dao.ServiceDAO import ServiceDAO
-from dao.customer_dao import CustomerDAO
-from dao.room_dao import RoomDAO
-from dao.payment_dao import PaymentDAO
-from dao.reservation_dao import ReservationDAO
+from room_availability import RoomAvailabilityIndex
+from reservation_list import ReservationListModel, COLUMNS
+from pricing import RateCalendar, PricingEngine
+from mysql_env import PAGE_SIZE, SYNC_INTERVAL, BOOKING_SERVICE_URL
+from task_runner import TaskRunner
+from booking_service import BookingService, load_data, make_sync, customer_from_dict, employee_from_dict
+from booking_client import BookingClient, load_remote_data
+
+from db_connection import warm_up
+from dao.instrumentation import configure_logging, metrics as dao_metrics
+from dao.reservation_dao import RoomNotAvailableError
+
+log = logging.getLogger(__name__)
 
 COLOR_PRIMARY = '#1A237E'
 COLOR_SECONDARY = '#283593'
@@ -38,29 +37,24 @@ FONT_BUTTON = ('Segoe UI', 10, 'bold')
 
 #inicializar datos desde la base de datos
 def init_data_from_db():
-    print("--- Cargando datos iniciales desde la Base de Datos ---")
-    customer_dao = CustomerDAO()
-    employee_dao = EmployeeDAO()
-    service_dao = ServiceDAO()
-    room_dao = RoomDAO()
-    reservation_dao = ReservationDAO()
-
-    all_customers = customer_dao.get_all()
-    all_employees = employee_dao.get_all()
-    all_services = service_dao.get_all()
-    all_rooms = room_dao.get_all()
-    all_reservations = reservation_dao.get_all()
-
-    service_reservations = {}
-
-    return {
-        'customers': {c.getEmail(): c for c in all_customers}, 
-        'employees': {e.getEmail(): e for e in all_employees}, 
-        'rooms': {r.getId(): r for r in all_rooms},
-        'reservations': {r.getId(): r for r in all_reservations},
-        'service_reservations': service_reservations,
-        'services': {s.getId(): s for s in all_services}
-    }
+    log.info("Cargando datos iniciales desde la Base de Datos.")
+    # Habitaciones y servicios son catalogos pequenos; clientes, empleados y
+    # reservas se cargan bajo demanda para no depender del tamano de las tablas.
+    return load_data()
+
+def init_data_from_service(booking):
+    log.info("Cargando catalogos desde el servicio de reservas.")
+    try:
+        return load_remote_data(booking)
+    except Exception as err:
+        log.error("No se pudieron cargar los catalogos del servicio: %s", err)
+        return {'customers': {}, 'employees': {}, 'rooms': {}, 'reservations': {}, 'service_reservations': {}, 'services': {}}
+
+def freeze_startup_heap():
+    # Catalogos e indice de clientes viven lo que la aplicacion: se sacan de las
+    # colecciones completas del GC, que si no pausan la interfaz al recorrerlos.
+    gc.collect()
+    gc.freeze()
 
 def center_window(window, width, height):
     screen_width = window.winfo_screenwidth()
@@ -103,24 +97,58 @@ class HotelGUI:
         self.style.configure('TEntry', padding=5, relief="flat", borderwidth=1)
         self.style.map('TEntry', bordercolor=[('focus', COLOR_PRIMARY)])
 
+        status_bar = tk.Frame(master, bg=COLOR_BG)
+        status_bar.pack(side='bottom', fill='x', padx=10)
+        self.status_label = tk.Label(status_bar, text="", font=FONT_BODY, bg=COLOR_BG, fg=COLOR_TEXT_LIGHT, anchor='w')
+        self.status_label.pack(side='left', fill='x', expand=True)
+        # Deja de esperar las consultas en curso; las escrituras que ya empezaron terminan igual.
+        self.cancel_button = tk.Button(status_bar, text="Cancelar", font=FONT_BODY, bg=COLOR_BG, fg=COLOR_DANGER,
+                                       relief="flat", bd=0, cursor="hand2", command=lambda: self.tasks.cancel_all())
+
         self.container = ttk.Frame(master)
         self.container.pack(fill="both", expand=True)
+
+        # Las llamadas a la BD corren en segundo plano para no congelar la interfaz.
+        self.tasks = TaskRunner(master, on_busy_change=self.set_busy, on_orphan=self.orphan_finished)
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Con BOOKING_SERVICE_URL la GUI es cliente ligero: catalogos, acceso, disponibilidad, tarifas,
+        # reservas y sus bajas, listado, reporte de ocupacion y registros viven en el servicio, que ya
+        # sincroniza con las demas terminales.
+        self.remote_booking = bool(BOOKING_SERVICE_URL)
+        # La marca de agua se toma antes de la carga inicial: lo que cambie mientras tanto llega en la primera sincronizacion.
+        self.sync = None if self.remote_booking else make_sync()
+        self._sync_job = None
+        if self.sync is not None and SYNC_INTERVAL > 0:
+            try:
+                self.sync.start()
+            except Exception as err:
+                # La primera sincronizacion vuelve a intentar tomar la marca de agua.
+                log.warning("No se pudo iniciar la sincronizacion incremental: %s", err)
+
+        if self.remote_booking:
+            self.booking = BookingClient(BOOKING_SERVICE_URL)
+            self.data = init_data_from_service(self.booking)
+            self.availability = None
+            self.pricing = None
+        else:
+            self.data = init_data_from_db()
+            # Solo las estancias vigentes o futuras afectan la disponibilidad.
+            self.availability = RoomAvailabilityIndex(self.data['rooms'].values(), self.data['reservations'].between(date.today()))
+            self.pricing = PricingEngine(RateCalendar.from_rooms(self.data['rooms'].values()))
         
-        self.data = init_data_from_db()
-        
-        self.next_reservation_id = max(self.data['reservations'].keys()) + 1 if self.data['reservations'] else 1
         self.next_service_reservation_id = max(self.data['service_reservations'].keys()) + 1 if self.data['service_reservations'] else 1
         self.next_payment_id = 1
         self.data['payments'] = {}
         
         self.frames = {}
 
-        self.employee_dao = EmployeeDAO()
-        self.service_dao = ServiceDAO()
-        self.customer_dao = CustomerDAO()
-        self.room_dao = RoomDAO()
-        self.payment_dao = PaymentDAO()
-        self.reservation_dao = ReservationDAO()
+        # Las ventanas solo hablan con self.booking; los DAOs viven en BookingService y el cliente ligero no crea ninguno.
+        if not self.remote_booking:
+            self.booking = BookingService(self.data, self.availability, self.pricing)
+            # La busqueda de clientes de recepcion se arma en segundo plano desde el arranque.
+            self.tasks.submit(self.booking.load_customer_index, quiet=True, on_success=lambda index: freeze_startup_heap(),
+                              on_error=lambda err: log.warning("No se pudo construir la busqueda de clientes: %s", err))
 
         for F in (WelcomeScreen, LoginFormScreen, LoginSuccessScreen, MainMenuScreen):
             page_name = F.__name__
@@ -129,6 +157,58 @@ class HotelGUI:
             frame.grid(row=0, column=0, sticky="nsew") 
 
         self.show_frame("WelcomeScreen")
+        self.schedule_sync()
+
+    def set_busy(self, busy):
+        cursor = "watch" if busy else ""
+        self.status_label.config(text="⏳ Procesando..." if busy else "")
+        if busy:
+            self.cancel_button.pack(side='right')
+        else:
+            self.cancel_button.pack_forget()
+        windows = [self.master] + [w for w in self.master.winfo_children() if isinstance(w, tk.Toplevel)]
+        for window in windows:
+            try:
+                window.config(cursor=cursor)
+            except tk.TclError:
+                pass
+
+    def orphan_finished(self, error):
+        # Una escritura termino despues de cerrarse la ventana que la pidio; se avisa desde aqui.
+        if error is None:
+            messagebox.showinfo("Operacion Terminada", "Una operacion pendiente de una ventana cerrada se guardo correctamente.")
+        else:
+            log.error("Escritura pendiente de una ventana cerrada fallo: %s", error)
+            messagebox.showerror("Error de Base de Datos", f"Una operacion pendiente de una ventana cerrada no se guardo: {error}")
+
+    def schedule_sync(self):
+        # Sin el esquema de cambios en la BD start() la desactiva y no se vuelve a consultar.
+        if self.sync is not None and self.sync.enabled and SYNC_INTERVAL > 0:
+            self._sync_job = self.master.after(int(SYNC_INTERVAL * 1000), self.run_sync)
+
+    def run_sync(self):
+        self.tasks.submit(self.sync.fetch, quiet=True, on_success=self.apply_sync, on_error=self.sync_failed)
+
+    def apply_sync(self, changes):
+        try:
+            applied = self.booking.apply_changes(self.sync, changes)
+            if applied:
+                log.info("Sincronizacion: %s cambios aplicados desde otras terminales.", applied)
+        except Exception as err:
+            log.warning("No se pudieron aplicar los cambios de otras terminales: %s", err)
+        finally:
+            self.schedule_sync()
+
+    def sync_failed(self, err):
+        log.warning("Fallo la sincronizacion incremental: %s", err)
+        self.schedule_sync()
+
+    def on_close(self):
+        if self._sync_job is not None:
+            self.master.after_cancel(self._sync_job)
+        self.tasks.shutdown()
+        log.debug("Metricas de los DAOs:\n%s", dao_metrics.format())
+        self.master.destroy()
 
     def show_frame(self, page_name, user_type=None, user_obj=None, login_type=None):
         frame = self.frames[page_name]
@@ -140,18 +220,26 @@ class HotelGUI:
             
         frame.tkraise()
         
-    def add_new_reservation(self, new_reservation):
-        res_id = self.next_reservation_id
-        self.data['reservations'][res_id] = new_reservation
-        self.next_reservation_id += 1
-        return res_id
-
     def add_new_service_reservation(self, new_service_reservation):
         res_id = self.next_service_reservation_id
         self.data['service_reservations'][res_id] = new_service_reservation
         self.next_service_reservation_id += 1
         return res_id
 
+    def remember_service_reservation(self, result, service_obj, customer):
+        """
+        Cliente ligero: la solicitud vive en el servicio; aqui se guarda una copia
+        para mostrarla en "Servicios Activos" de esta terminal.
+        """
+        menu = self.frames['MainMenuScreen']
+        customer_obj = menu.user_obj if menu.user_type == 'Customer' and menu.user_obj else None
+        if customer_obj is None or customer_obj.getEmail() != customer['email']:
+            customer_obj = customer_from_dict(customer)
+        reservation = ServiceReservation(result['service_reservation_id'], result['date_time'], customer_obj, service_obj)
+        reservation.createReservation()
+        self.data['service_reservations'][reservation.getId()] = reservation
+        return reservation
+
     def add_new_customer(self, customer_obj):
         self.data['customers'][customer_obj.getEmail()] = customer_obj
         return customer_obj
@@ -232,34 +320,41 @@ class CreateServiceReservationWindow(tk.Toplevel):
             messagebox.showerror("Error", "Formato de fecha invalido.")
             return
 
-        customer_obj = self.controller.data['customers'].get(email)
-        if not customer_obj:
-            messagebox.showerror("Error", "Cliente no encontrado.")
-            return
-
         try:
             service_id = int(service_info.split(':')[0])
             service_obj = self.services.get(service_id)
         except:
             return
 
-        new_res_id = self.controller.next_service_reservation_id
-        reservation = ServiceReservation(new_res_id, date_time_str, customer_obj, service_obj)
+        if service_obj is None:
+            messagebox.showerror("Error", "Servicio no encontrado.")
+            return
 
-        if reservation.createReservation():
-            self.controller.add_new_service_reservation(reservation)
-            PaymentServiceWindow(self.master, self.controller, reservation, service_obj.getCost(), customer_obj, room_number)
-            self.destroy()
-        else:
-            messagebox.showerror("Error", "No se pudo crear la reserva.")
+        def on_error(err):
+            if isinstance(err, LookupError):
+                messagebox.showerror("Error", "Cliente no encontrado.")
+            else:
+                messagebox.showerror("Error", f"No se pudo buscar al cliente: {err}")
+
+        self.controller.tasks.submit(self.controller.booking.customer, email, owner=self,
+                                     on_success=lambda customer: self.finish_service_reservation(customer, service_obj, date_time_str, room_number),
+                                     on_error=on_error)
+
+    def finish_service_reservation(self, customer, service_obj, date_time_str, room_number):
+        # La solicitud se registra junto con su pago, en PaymentServiceWindow.
+        PaymentServiceWindow(self.master, self.controller, service_obj, date_time_str, customer, room_number)
+        self.destroy()
 
 
 class PaymentServiceWindow(tk.Toplevel):
-    def __init__(self, master, controller, reservation, service_cost, customer, room_number):
+    def __init__(self, master, controller, service, date_time, customer, room_number):
         tk.Toplevel.__init__(self, master)
         self.controller = controller
-        self.reservation = reservation
-        self.service_cost = service_cost
+        self.service = service
+        self.date_time = date_time
+        self.customer = customer
+        self.service_cost = service.getCost()
+        service_cost = self.service_cost
         
         self.title("Pasarela de Pago")
         center_window(self, 450, 550)
@@ -273,8 +368,8 @@ class PaymentServiceWindow(tk.Toplevel):
         info_frame = ttk.Frame(card, style='Card.TFrame')
         info_frame.pack(fill='x', pady=10)
         
-        ttk.Label(info_frame, text=f"Servicio: {reservation._ServiceReservation__service.getType()}", style='Card.TLabel').pack(anchor='w')
-        ttk.Label(info_frame, text=f"Cliente: {customer.getName()}", style='Card.TLabel').pack(anchor='w')
+        ttk.Label(info_frame, text=f"Servicio: {service.getType()}", style='Card.TLabel').pack(anchor='w')
+        ttk.Label(info_frame, text=f"Cliente: {customer['name']}", style='Card.TLabel').pack(anchor='w')
         
         ttk.Separator(card, orient='horizontal').pack(fill='x', pady=15)
         
@@ -290,22 +385,25 @@ class PaymentServiceWindow(tk.Toplevel):
         ttk.Radiobutton(card, text="Tarjeta de Credito", variable=self.payment_method_var, value="Tarjeta de Credito").pack(anchor='w')
         ttk.Radiobutton(card, text="Efectivo", variable=self.payment_method_var, value="Efectivo").pack(anchor='w')
         
-        ModernButton(card, text="PAGAR AHORA", type="accent", command=self.process_payment).pack(fill='x', pady=(30, 5))
+        self.pay_button = ModernButton(card, text="PAGAR AHORA", type="accent", command=self.process_payment)
+        self.pay_button.pack(fill='x', pady=(30, 5))
         ModernButton(card, text="CANCELAR", type="secondary", command=self.destroy).pack(fill='x', pady=5)
 
     def process_payment(self):
-        payment = Payment(
-            self.controller.next_payment_id,
-            self.service_cost,
-            self.payment_method_var.get(),
-            self.reservation
-        )
-        payment.processPayment()
-        new_payment_id = self.controller.payment_dao.create(payment)
-        if new_payment_id:
-            messagebox.showinfo("Pago Exitoso", f"El pago #{new_payment_id} ha sido procesado y guardado.")
-        else:
-            messagebox.showerror("Error de Base de Datos", "El pago fue procesado pero no se pudo guardar en la base de datos.")
+        self.controller.tasks.submit(self.controller.booking.book_service, self.customer['email'], self.service.getId(),
+                                     self.date_time, self.payment_method_var.get(), owner=self,
+                                     lock=(self.pay_button,), cancellable=False,
+                                     on_success=self.payment_saved, on_error=self.payment_failed)
+
+    def payment_saved(self, result):
+        if self.controller.remote_booking:
+            self.controller.remember_service_reservation(result, self.service, self.customer)
+        messagebox.showinfo("Pago Exitoso", f"El pago #{result['payment_id']} ha sido procesado y guardado.")
+        self.destroy()
+
+    def payment_failed(self, err):
+        log.error("No se pudo guardar el pago del servicio: %s", err)
+        messagebox.showerror("Error de Base de Datos", "El pago no se pudo guardar en la base de datos.")
         self.destroy()
 
 class WelcomeScreen(ttk.Frame):
@@ -388,19 +486,35 @@ class LoginFormScreen(ttk.Frame):
         email = self.email_entry.get().strip()
         password = self.password_entry.get()
 
-        if self.login_type == "Customer":
-            user_obj = self.controller.data['customers'].get(email)
-            if user_obj and user_obj.getPassword() == password:
-                self.controller.show_frame("MainMenuScreen", user_type="Customer", user_obj=user_obj)
-            else:
-                messagebox.showerror("Error", "Credenciales inválidas.")
-        else: 
-            user_obj = self.controller.data['employees'].get(email)
+        login_type = self.login_type
+        if self.controller.remote_booking:
+            self.remote_login(login_type, email, password)
+            return
+        users = self.controller.data['customers'] if login_type == "Customer" else self.controller.data['employees']
+
+        def check(user_obj):
             if user_obj and user_obj.getPassword() == password:
-                self.controller.show_frame("MainMenuScreen", user_type="Employee", user_obj=user_obj)
+                self.controller.show_frame("MainMenuScreen", user_type=login_type, user_obj=user_obj)
             else:
                 messagebox.showerror("Error", "Credenciales invalidas.")
 
+        self.controller.tasks.submit(users.get, email, on_success=check,
+                                     on_error=lambda err: messagebox.showerror("Error", f"No se pudo validar el acceso: {err}"))
+
+    def remote_login(self, login_type, email, password):
+        """Cliente ligero: el servicio valida las credenciales y devuelve al usuario sin su contrasena."""
+        to_user = customer_from_dict if login_type == "Customer" else employee_from_dict
+
+        def on_error(err):
+            if isinstance(err, LookupError):
+                messagebox.showerror("Error", "Credenciales invalidas.")
+            else:
+                messagebox.showerror("Error", f"No se pudo validar el acceso: {err}")
+
+        self.controller.tasks.submit(self.controller.booking.login, login_type, email, password,
+                                     on_success=lambda user: self.controller.show_frame("MainMenuScreen", user_type=login_type, user_obj=to_user(user)),
+                                     on_error=on_error)
+
 
 class LoginSuccessScreen(ttk.Frame):
     def __init__(self, parent, controller):
@@ -461,6 +575,8 @@ class MainMenuScreen(ttk.Frame):
         
         self.create_dashboard_card(self.grid_buttons_frame, "🍽️", "Ver Servicios Activos", self.view_service_reservation, 1, 0)
         self.create_dashboard_card(self.grid_buttons_frame, "ℹ️", "Info de las habitaciones", self.view_room_info, 1, 1)
+        if user_type == "Employee":
+            self.create_dashboard_card(self.grid_buttons_frame, "📊", "Reporte de Ocupacion", self.view_occupancy_report, 1, 2)
 
     def open_create_reservation(self): CreateReservationWindow(self.controller.master, self.controller)
     def open_create_service_reservation(self): CreateServiceReservationWindow(self.controller.master, self.controller)
@@ -475,6 +591,9 @@ class MainMenuScreen(ttk.Frame):
     def view_room_info(self):
         RoomInfoWindow(self.controller.master, self.controller)
 
+    def view_occupancy_report(self):
+        OccupancyReportWindow(self.controller.master, self.controller)
+
 
 class CreateReservationWindow(tk.Toplevel):
     def __init__(self, master, controller):
@@ -494,29 +613,39 @@ class CreateReservationWindow(tk.Toplevel):
         f.pack(fill='both', expand=True)
 
         self.create_field(f, "Email Cliente:", 0)
-        self.email_entry = ttk.Entry(f, width=30); self.email_entry.grid(row=0, column=1, pady=10)
+        email_frame = ttk.Frame(f, style='Card.TFrame'); email_frame.grid(row=0, column=1, pady=10)
+        self.email_entry = ttk.Entry(email_frame, width=30); self.email_entry.pack(fill='x')
+        # Recepcion busca al huesped por nombre, apellidos, telefono, email o CURP mientras escribe.
+        self.matches_list = tk.Listbox(email_frame, height=5, font=FONT_BODY, activestyle='none')
+        self.matches_list.bind("<<ListboxSelect>>", self.choose_customer)
+        self._matches = []
+        self._search_job = None
+        self._search_task = None
         if controller.frames['MainMenuScreen'].user_type == 'Customer':
             self.email_entry.insert(0, controller.frames['MainMenuScreen'].user_obj.getEmail())
+        else:
+            self.email_entry.bind("<KeyRelease>", self.schedule_customer_search)
 
         self.create_field(f, "Tipo Habitacion:", 1)
-        self.room_type_var = tk.StringVar(value="Suite")
-        self.cb_type = ttk.Combobox(f, textvariable=self.room_type_var, values=["Suite", "Doble", "Individual"], state="readonly")
+        self.room_type_var = tk.StringVar(value="Todas")
+        self.cb_type = ttk.Combobox(f, textvariable=self.room_type_var, values=["Todas"] + sorted({r.getType() for r in self.controller.data['rooms'].values()}), state="readonly")
         self.cb_type.grid(row=1, column=1, pady=10)
+        self.cb_type.bind("<<ComboboxSelected>>", lambda e: self.refresh_available_rooms())
         
         self.create_field(f, "Registro entrada (AAAA-MM-DD):", 2)
         self.in_entry = ttk.Entry(f); self.in_entry.insert(0, str(date.today())); self.in_entry.grid(row=2, column=1, pady=10)
+        self.in_entry.bind("<FocusOut>", lambda e: self.refresh_available_rooms())
 
         self.create_field(f, "Registro salida (AAAA-MM-DD):", 3)
         self.out_entry = ttk.Entry(f); self.out_entry.insert(0, "2025-12-31"); self.out_entry.grid(row=3, column=1, pady=10)
+        self.out_entry.bind("<FocusOut>", lambda e: self.refresh_available_rooms())
 
         self.create_field(f, "Habitacion Disponible:", 4)
-        all_rooms = self.controller.data.get('rooms', {}).values()
-        available_rooms = [r for r in all_rooms if r.getStatus().lower() == 'available']
-        room_options = [f"{r.getId()}: {r.getType()} (${r.getCost():.2f})" for r in available_rooms]
         self.room_var = tk.StringVar()
-        self.room_cb = ttk.Combobox(f, textvariable=self.room_var, values=room_options, state='readonly')
+        self.room_cb = ttk.Combobox(f, textvariable=self.room_var, values=[], state='readonly')
         self.room_cb.grid(row=4, column=1, pady=10)
-        if room_options: self.room_cb.set(room_options[0])
+        self._rooms_task = None
+        self.refresh_available_rooms()
         
         ttk.Label(f, text="Servicio Adicional:", style='Card.TLabel', font=FONT_BODY_BOLD).grid(row=5, column=0, sticky='w', padx=10)
         services = self.controller.data.get('services', {})
@@ -525,12 +654,68 @@ class CreateReservationWindow(tk.Toplevel):
         self.service_cb = ttk.Combobox(f, textvariable=self.service_var, values=service_options, state='readonly')
         self.service_cb.grid(row=5, column=1, pady=10)
 
-        ModernButton(container, text="CONFIRMAR RESERVA", type="primary", command=self.process).pack(fill='x', pady=(10,8))
+        self.confirm_button = ModernButton(container, text="CONFIRMAR RESERVA", type="primary", command=self.process)
+        self.confirm_button.pack(fill='x', pady=(10,8))
         ModernButton(container, text="REGRESAR", type="secondary", command=self.destroy).pack(fill='x', pady=(0,10))
 
     def create_field(self, parent, text, row):
         ttk.Label(parent, text=text, style='Card.TLabel', font=FONT_BODY_BOLD).grid(row=row, column=0, sticky='w', padx=10)
 
+    def schedule_customer_search(self, event=None):
+        if event is not None and event.keysym in ("Return", "Tab", "Up", "Down", "Left", "Right"):
+            return
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self.search_customers)
+
+    def search_customers(self):
+        self._search_job = None
+        if self._search_task is not None:
+            self._search_task.cancel()
+        query = self.email_entry.get().strip()
+        if len(query) < 2:
+            self.show_customer_matches([])
+            return
+        self._search_task = self.controller.tasks.submit(
+            self.controller.booking.search_customers, query, owner=self, quiet=True,
+            on_success=self.show_customer_matches, on_error=lambda err: self.show_customer_matches([]))
+
+    def show_customer_matches(self, matches):
+        self._matches = matches
+        self.matches_list.delete(0, tk.END)
+        for match in matches:
+            self.matches_list.insert(tk.END, f"{match['name']} — {match['email']}")
+        if matches and self.email_entry.get().strip() != matches[0]['email']:
+            self.matches_list.pack(fill='x')
+        else:
+            self.matches_list.pack_forget()
+
+    def choose_customer(self, event=None):
+        selection = self.matches_list.curselection()
+        if not selection:
+            return
+        self.email_entry.delete(0, tk.END)
+        self.email_entry.insert(0, self._matches[selection[0]]['email'])
+        self.matches_list.pack_forget()
+
+    def refresh_available_rooms(self):
+        room_type = self.room_type_var.get()
+        # Solo cuenta la respuesta a las fechas que el usuario dejo al final.
+        if self._rooms_task is not None:
+            self._rooms_task.cancel()
+        self._rooms_task = self.controller.tasks.submit(
+            self.controller.booking.available_rooms, self.in_entry.get().strip(), self.out_entry.get().strip(),
+            None if room_type == "Todas" else room_type,
+            owner=self, quiet=True, on_success=self.show_available_rooms, on_error=lambda err: self.show_available_rooms([]))
+
+    def show_available_rooms(self, available_rooms):
+        room_options = [f"{r['room_id']}: {r['room_type']} (${r['total']:.2f} total)" if r.get('total') is not None
+                        else f"{r['room_id']}: {r['room_type']} (${r['cost_per_night']:.2f})"
+                        for r in available_rooms]
+        self.room_cb.configure(values=room_options)
+        if self.room_var.get() not in room_options:
+            self.room_var.set(room_options[0] if room_options else "")
+
     def process(self):
         room_info = self.room_var.get()
         try:
@@ -539,10 +724,9 @@ class CreateReservationWindow(tk.Toplevel):
             messagebox.showerror("Error", "Debe seleccionar una habitacion valida.")
             return
 
-        room = self.controller.data.get('rooms', {}).get(rid)
-        cust = self.controller.data['customers'].get(self.email_entry.get())
+        email = self.email_entry.get().strip()
 
-        if not room or not cust:
+        if not email:
             messagebox.showerror("Error", "Datos invalidos: cliente o habitacion no encontrados.")
             return
 
@@ -558,51 +742,56 @@ class CreateReservationWindow(tk.Toplevel):
             messagebox.showerror("Fechas invalidas", "La fecha de salida debe ser posterior a la fecha de entrada.")
             return
 
-        try:
-            res = Reservation(self.controller.next_reservation_id, self.in_entry.get().strip(), self.out_entry.get().strip(), cust, room)
-            if not res.createReservation():
-                messagebox.showerror("Error", "Habitacion no disponible.")
-                return
+        additional_service = None
+        sel = self.service_var.get()
+        svc_dict = self.controller.data.get('services', {})
+        if sel and sel != "Ninguno":
+            try:
+                sid = int(sel.split(':')[0])
+                additional_service = svc_dict.get(sid)
+            except Exception:
+                additional_service = None
 
-            num_nights = (check_out - check_in).days
-            room_subtotal = room.getCost() * num_nights
+        booking = {'email': email, 'room_id': rid, 'check_in': check_in.isoformat(), 'check_out': check_out.isoformat(),
+                   'service_id': additional_service.getId() if additional_service else None}
 
-            additional_service = None
-            service_subtotal = 0
-            sel = self.service_var.get()
-            svc_dict = self.controller.data.get('services', {})
-            if sel and sel != "Ninguno":
-                try:
-                    sid = int(sel.split(':')[0])
-                    additional_service = svc_dict.get(sid)
-                    if additional_service:
-                        service_subtotal = additional_service.getCost()
-                except Exception:
-                    additional_service = None
+        def on_success(result):
+            customer, quote = result
+            PaymentWindow(self.master, self.controller, booking, quote, customer, additional_service)
+            self.destroy()
 
-            total_cost = room_subtotal + service_subtotal
+        def on_error(err):
+            if isinstance(err, ValueError):
+                messagebox.showerror("Sin tarifa", str(err))
+            else:
+                messagebox.showerror("Error", str(err) or "Error procesando datos.")
+            self.refresh_available_rooms()
 
-            new_res_id = self.controller.reservation_dao.create(res, total_cost)
-            if not new_res_id:
-                messagebox.showerror("Error de Base de Datos", "No se pudo registrar la reserva. Intente de nuevo.")
-                return
-            
-            self.controller.data['reservations'][new_res_id] = res
+        self.controller.tasks.submit(self.prepare, booking, owner=self, lock=(self.confirm_button,),
+                                     on_success=on_success, on_error=on_error)
 
-            PaymentWindow(self.master, self.controller, res, total_cost, cust, additional_service, room_subtotal, service_subtotal)
-            self.destroy()
-        except Exception:
-            messagebox.showerror("Error", "Error procesando datos.")
+    def prepare(self, booking):
+        """
+        Corre en segundo plano: busca al cliente y cotiza la estancia. La reserva
+        se guarda junto con su pago en PaymentWindow.pay.
+        """
+        try:
+            customer = self.controller.booking.customer(booking['email'])
+        except LookupError:
+            raise LookupError("Datos invalidos: cliente o habitacion no encontrados.") from None
+        quote = self.controller.booking.quote(booking['room_id'], booking['check_in'], booking['check_out'], booking['service_id'])
+        return customer, quote
 
 
 class PaymentWindow(tk.Toplevel):
-    def __init__(self, master, controller, reservation, total_cost, customer, additional_service=None, room_subtotal=None, service_subtotal=0):
+    def __init__(self, master, controller, booking, quote, customer, additional_service=None):
         tk.Toplevel.__init__(self, master)
         self.controller = controller
-        self.reservation = reservation
-        self.total_cost = total_cost
-        self.room_subtotal = room_subtotal
-        self.service_subtotal = service_subtotal
+        self.booking = booking
+        self.customer = customer
+        self.total_cost = quote['total']
+        self.room_subtotal = quote['room_subtotal'] - quote['discount']
+        self.service_subtotal = quote['service_subtotal']
         self.additional_service = additional_service
         
         self.title("Check-out y Pago")
@@ -614,16 +803,6 @@ class PaymentWindow(tk.Toplevel):
         
         ttk.Label(card, text="Pago de Habitacion", style='Title.TLabel').pack(pady=10)
 
-        if self.room_subtotal is None:
-            try:
-                from datetime import datetime
-                check_in = datetime.strptime(self.reservation.getCheckIn(), "%Y-%m-%d").date()
-                check_out = datetime.strptime(self.reservation.getCheckOut(), "%Y-%m-%d").date()
-                nights = (check_out - check_in).days
-                self.room_subtotal = self.reservation.getRoom().getCost() * max(1, nights)
-            except Exception:
-                self.room_subtotal = self.total_cost
-
         ttk.Label(card, text=f"Habitacion: ${self.room_subtotal:.2f}", style='Card.TLabel').pack(pady=(8,2))
         if self.additional_service and self.service_subtotal:
             try:
@@ -640,45 +819,62 @@ class PaymentWindow(tk.Toplevel):
 
         btn_frame = ttk.Frame(card)
         btn_frame.pack(fill='x', pady=(12,0))
-        ModernButton(btn_frame, text="PAGAR", command=self.pay).pack(side='left', fill='x', expand=True, padx=(0,6))
+        self.pay_button = ModernButton(btn_frame, text="PAGAR", command=self.pay)
+        self.pay_button.pack(side='left', fill='x', expand=True, padx=(0,6))
         ModernButton(btn_frame, text="REGRESAR", type='secondary', command=self.destroy).pack(side='right', fill='x', expand=True, padx=(6,0))
         
     def pay(self):
-        p = Payment(self.controller.next_payment_id, self.total_cost, self.method.get(), self.reservation)
-        p.processPayment()
-        new_payment_id = self.controller.payment_dao.create(p)
-        if new_payment_id:
-            messagebox.showinfo("Exito", f"Pago #{new_payment_id} completado y guardado.")
-            self.controller.reservation_dao.link_payment(self.reservation.getId(), new_payment_id)
-        else:
-            messagebox.showerror("Error de Base de Datos", "El pago fue procesado pero no se pudo guardar en la base de datos.")
+        # Reserva, pago y enlace se guardan en una sola transaccion (BookingService.book).
+        b = self.booking
+        self.controller.tasks.submit(self.controller.booking.book, b['email'], b['room_id'], b['check_in'], b['check_out'],
+                                     self.method.get(), b['service_id'], owner=self,
+                                     lock=(self.pay_button,), cancellable=False,
+                                     on_success=self.booking_saved, on_error=self.booking_failed)
+
+    def booking_saved(self, result):
+        # El servicio ya registro la reserva en la disponibilidad y la asocio al cliente.
+        messagebox.showinfo("Exito", f"Reserva #{result['reservation_id']} y pago #{result['payment_id']} guardados.")
         self.destroy()
 
+    def booking_failed(self, err):
+        if isinstance(err, RoomNotAvailableError):
+            log.warning("Habitacion ya reservada por otra terminal: %s", err)
+            messagebox.showerror("Habitacion no disponible", f"{err}\nOtra terminal la reservo primero; elija otra habitacion o fechas.")
+            self.destroy()
+            return
+        log.error("No se pudo guardar la reserva con su pago: %s", err)
+        messagebox.showerror("Error de Base de Datos", "No se guardo la reserva ni el pago. Intente de nuevo.")
+
 
 class ViewReservationsWindow(tk.Toplevel):
+    HEADINGS = {'id': 'ID', 'customer': 'Cliente', 'room': 'Habitación',
+                'check_in': 'Check-In', 'check_out': 'Check-Out', 'cost': 'Costo Total'}
+
     def __init__(self, master, controller):
         tk.Toplevel.__init__(self, master)
         self.controller = controller
         self.title("Reservas")
-        center_window(self, 600, 420)
+        center_window(self, 640, 460)
         self.configure(bg=COLOR_BG)
         
         card = ttk.Frame(self, style='Card.TFrame', padding=20)
         card.pack(fill='both', expand=True, padx=20, pady=20)
         ttk.Label(card, text="Reservas", style='Title.TLabel').pack(pady=(0,10))
+
+        search_frame = ttk.Frame(card, style='Card.TFrame')
+        search_frame.pack(fill='x', pady=(0, 5))
+        ttk.Label(search_frame, text="Buscar (cliente, email o habitación):", style='Card.TLabel').pack(side='left')
+        self.search_entry = ttk.Entry(search_frame)
+        self.search_entry.pack(side='left', fill='x', expand=True, padx=(6, 0))
+        self.search_entry.bind('<KeyRelease>', self.schedule_search)
+        self._search_job = None
         
         tree_frame = ttk.Frame(card)
         tree_frame.pack(fill='both', expand=True, pady=5)
         
-        columns = ('id', 'customer', 'room', 'check_in', 'check_out', 'cost')
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
-        
-        self.tree.heading('id', text='ID')
-        self.tree.heading('customer', text='Cliente')
-        self.tree.heading('room', text='Habitación')
-        self.tree.heading('check_in', text='Check-In')
-        self.tree.heading('check_out', text='Check-Out')
-        self.tree.heading('cost', text='Costo Total')
+        self.tree = ttk.Treeview(tree_frame, columns=COLUMNS, show='headings')
+        for column in COLUMNS:
+            self.tree.heading(column, text=self.HEADINGS[column], command=lambda c=column: self.sort_by(c))
         
         self.tree.column('id', width=50, anchor='center')
         self.tree.column('customer', width=150)
@@ -689,30 +885,95 @@ class ViewReservationsWindow(tk.Toplevel):
 
         self.tree.pack(side='left', fill='both', expand=True)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
+        self.scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
 
-        self.load_reservations()
+        # Solo se traen las filas que el usuario alcanza a ver; al acercarse al final se pide la siguiente pagina.
+        self.model = ReservationListModel(self.controller.booking, PAGE_SIZE)
+        self.loading = False
 
         btn_frame = ttk.Frame(card, style='Card.TFrame')
         btn_frame.pack(fill='x', pady=(10, 0))
 
+        ModernButton(btn_frame, text="Actualizar", type="secondary", command=self.refresh).pack(side='left', padx=(0, 6))
+
         if self.controller.frames['MainMenuScreen'].user_type == 'Employee':
-            ModernButton(btn_frame, text="Eliminar Reserva Seleccionada", type="secondary", command=self.delete_selected_reservation).pack(side='left')
+            self.delete_button = ModernButton(btn_frame, text="Eliminar Reserva Seleccionada", type="secondary", command=self.delete_selected_reservation)
+            self.delete_button.pack(side='left')
 
         ModernButton(btn_frame, text="Cerrar", command=self.destroy).pack(side='right')
 
+        self.load_reservations()
+
+    @staticmethod
+    def display_values(row):
+        res_id, customer_name, room_number, check_in, check_out, total_cost = row
+        return (res_id, customer_name, room_number, check_in, check_out, f"${total_cost:.2f}")
+
     def load_reservations(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        
-        reservations = self.controller.data.get('reservations', {}).values()
-        for res in sorted(reservations, key=lambda r: r.getId()):
-            customer_name = res.getCustomer().getName()
-            room_number = res.getRoom().getRoomNumber()
-            total_cost = f"${res.getRoom().getCost():.2f}" # Simplificado, el costo real está en la tabla RESERVATIONS
-            self.tree.insert('', 'end', values=(res.getId(), customer_name, room_number, res.getCheckIn(), res.getCheckOut(), total_cost))
+        self.tree.delete(*self.tree.get_children())
+        self.loading = False
+        self.load_more()
+
+    def load_more(self):
+        if self.loading or self.model.exhausted:
+            return
+        self.loading = True
+        self.controller.tasks.submit(self.model.fetch_next, owner=self, on_success=self.show_page,
+                                     on_error=self.show_load_error)
+
+    def show_load_error(self, err):
+        self.loading = False
+        messagebox.showerror("Error de Base de Datos", f"No se pudieron cargar las reservas: {err}")
+
+    def show_page(self, result):
+        self.loading = False
+        for row in self.model.append(result):
+            self.tree.insert('', 'end', iid=str(row[0]), values=self.display_values(row))
+
+    def on_scroll(self, first, last):
+        # Tk la llama al desplazarse y al cambiar el contenido, asi que tambien rellena una vista que quedo corta.
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.9:
+            self.load_more()
+
+    def sort_by(self, column):
+        self.model.set_sort(column)
+        for c in COLUMNS:
+            arrow = (" ▼" if self.model.descending else " ▲") if c == column else ""
+            self.tree.heading(c, text=self.HEADINGS[c] + arrow)
+        self.load_reservations()
+
+    def schedule_search(self, event=None):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(300, self.apply_search)
+
+    def apply_search(self):
+        self._search_job = None
+        if self.model.set_search(self.search_entry.get()):
+            self.load_reservations()
+
+    def refresh(self):
+        """Vuelve a consultar lo cargado y aplica solo las diferencias a la tabla."""
+        self.controller.tasks.submit(self.model.fetch_window, owner=self, on_success=self.apply_changes,
+                                     on_error=self.show_load_error)
+
+    def apply_changes(self, result):
+        deleted, inserted, updated = self.model.apply(result)
+        for res_id in deleted:
+            if self.tree.exists(str(res_id)):
+                self.tree.delete(str(res_id))
+        for row in updated:
+            self.tree.item(str(row[0]), values=self.display_values(row))
+        for row in inserted:
+            self.tree.insert('', self.model.index_of(row[0]), iid=str(row[0]), values=self.display_values(row))
+        if updated:
+            # Un cambio de valor puede mover la fila cuando se ordena por esa columna.
+            for index, row in enumerate(self.model.rows):
+                if self.tree.index(str(row[0])) != index:
+                    self.tree.move(str(row[0]), '', index)
 
     def delete_selected_reservation(self):
         selected_item = self.tree.focus()
@@ -725,13 +986,21 @@ class ViewReservationsWindow(tk.Toplevel):
         customer_name = values[1]
 
         if messagebox.askyesno("Confirmar Eliminacion", f"¿Esta seguro de que desea eliminar la reserva #{reservation_id} de {customer_name}?"):
-            if self.controller.reservation_dao.delete(reservation_id):
+            def on_deleted(result):
                 messagebox.showinfo("Exito", f"La reserva #{reservation_id} ha sido eliminada.")
-                self.tree.delete(selected_item)
-                del self.controller.data['reservations'][reservation_id]
-            else:
+                if self.tree.exists(selected_item):
+                    self.tree.delete(selected_item)
+                self.model.remove(reservation_id)
+
+            def on_error(err):
+                log.error("No se pudo eliminar la reserva #%s: %s", reservation_id, err)
                 messagebox.showerror("Error de Base de Datos", "No se pudo eliminar la reserva.")
 
+            # El servicio (local o remoto) borra la reserva y libera sus noches en la disponibilidad.
+            self.controller.tasks.submit(self.controller.booking.cancel_reservation, reservation_id, owner=self,
+                                         lock=(self.delete_button,), cancellable=False,
+                                         on_success=on_deleted, on_error=on_error)
+
 
 class ViewServicesWindow(tk.Toplevel):
     def __init__(self, master, controller):
@@ -808,6 +1077,63 @@ class RoomInfoWindow(tk.Toplevel):
         ModernButton(card, text="REGRESAR", type='secondary', command=self.destroy).pack(fill='x', pady=10)
 
 
+class OccupancyReportWindow(tk.Toplevel):
+    def __init__(self, master, controller):
+        tk.Toplevel.__init__(self, master)
+        self.controller = controller
+        self.title("Reporte de Ocupacion")
+        center_window(self, 720, 420)
+        self.configure(bg=COLOR_BG)
+
+        card = ttk.Frame(self, style='Card.TFrame', padding=20)
+        card.pack(fill='both', expand=True, padx=20, pady=20)
+        ttk.Label(card, text="Ocupacion, ADR y RevPAR", style='Title.TLabel').pack(pady=(0,10))
+
+        range_frame = ttk.Frame(card, style='Card.TFrame')
+        range_frame.pack(fill='x', pady=(0, 5))
+        ttk.Label(range_frame, text="Desde:", style='Card.TLabel').pack(side='left')
+        self.start_entry = ttk.Entry(range_frame, width=12)
+        self.start_entry.insert(0, str(date.today().replace(day=1)))
+        self.start_entry.pack(side='left', padx=(4, 12))
+        ttk.Label(range_frame, text="Hasta (excluida):", style='Card.TLabel').pack(side='left')
+        self.end_entry = ttk.Entry(range_frame, width=12)
+        self.end_entry.insert(0, str(date.today().replace(day=1) + timedelta(days=31)))
+        self.end_entry.pack(side='left', padx=4)
+        self.generate_button = ModernButton(range_frame, text="Generar", type="accent", command=self.generate)
+        self.generate_button.pack(side='right')
+
+        columns = ('room_type', 'rooms_sold', 'occupancy_pct', 'adr', 'revpar', 'revenue')
+        headings = ('Tipo', 'Noches Vendidas', 'Ocupacion %', 'ADR', 'RevPAR', 'Ingreso')
+        self.tree = ttk.Treeview(card, columns=columns, show='headings', height=8)
+        for column, heading in zip(columns, headings):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=100, anchor='e' if column != 'room_type' else 'w')
+        self.tree.pack(fill='both', expand=True, pady=5)
+
+        ModernButton(card, text="REGRESAR", type='secondary', command=self.destroy).pack(fill='x', pady=10)
+
+        self.generate()
+
+    def generate(self):
+        # El servicio carga las reservas en columnas con el primer reporte; cambiar el rango solo recalcula.
+        start, end = self.start_entry.get().strip(), self.end_entry.get().strip()
+        self.controller.tasks.submit(self.controller.booking.occupancy, start, end, owner=self,
+                                     lock=(self.generate_button,), on_success=self.show_report,
+                                     on_error=self.report_failed)
+
+    def show_report(self, rows):
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert('', 'end', values=(row['room_type'], row['rooms_sold'], f"{row['occupancy_pct']:.1f}",
+                                                f"${row['adr']:.2f}", f"${row['revpar']:.2f}", f"${row['revenue']:.2f}"))
+
+    def report_failed(self, err):
+        if isinstance(err, ValueError):
+            messagebox.showerror("Error de Fecha", f"Rango invalido: {err}")
+        else:
+            messagebox.showerror("Error de Base de Datos", f"No se pudieron leer las reservas: {err}")
+
+
 class RegisterCustomerWindow(tk.Toplevel):
     def __init__(self, master, controller):
         tk.Toplevel.__init__(self, master)
@@ -830,7 +1156,8 @@ class RegisterCustomerWindow(tk.Toplevel):
         ttk.Label(f, text="Password", style='Card.TLabel').grid(row=6, column=0)
         self.pw = ttk.Entry(f, show="*"); self.pw.grid(row=6, column=1, pady=5)
         
-        ModernButton(c, text="REGISTRAR", command=self.save).pack(fill='x', pady=(10,8))
+        self.save_button = ModernButton(c, text="REGISTRAR", command=self.save)
+        self.save_button.pack(fill='x', pady=(10,8))
         ModernButton(c, text="REGRESAR", type='secondary', command=self.destroy).pack(fill='x', pady=(0,10))
 
     def save(self):
@@ -841,16 +1168,23 @@ class RegisterCustomerWindow(tk.Toplevel):
             messagebox.showwarning("Datos Incompletos", "Nombre, apellido, email y contraseña son obligatorios.")
             return
 
-        new_customer = Customer(0, data['first_name'], "", data['last_name'], "", data['phone'], data['email'], data['state'], data['curp'], password)
-        
-        new_id = self.controller.customer_dao.create(new_customer)
-        if new_id:
-            messagebox.showinfo("Registro Exitoso", f"Cliente {new_customer.getName()} registrado con ID: {new_id}.")
-            self.controller.data['customers'][new_customer.getEmail()] = new_customer
+        def on_saved(result):
+            messagebox.showinfo("Registro Exitoso", f"Cliente {result['name']} registrado con ID: {result['customer_id']}.")
             self.destroy()
-        else:
+
+        def on_error(err):
+            if isinstance(err, ValueError):
+                messagebox.showerror("Datos Invalidos", str(err))
+                return
+            log.error("No se pudo registrar al cliente: %s", err)
             messagebox.showerror("Error de Base de Datos", "No se pudo registrar al cliente. Revise la consola.")
 
+        # El servicio (local o remoto) guarda al cliente y lo agrega a los datos compartidos y a la busqueda.
+        self.controller.tasks.submit(self.controller.booking.register_customer, data['first_name'], data['last_name'],
+                                     data['email'], password, data['phone'], data['state'], data['curp'], owner=self,
+                                     lock=(self.save_button,), cancellable=False,
+                                     on_success=on_saved, on_error=on_error)
+
 class RegisterEmployeeWindow(tk.Toplevel):
     def __init__(self, master, controller):
         tk.Toplevel.__init__(self, master)
@@ -884,7 +1218,8 @@ class RegisterEmployeeWindow(tk.Toplevel):
         ttk.Label(f, text="Confirmar Password", style='Card.TLabel').grid(row=len(fields)+2, column=0, sticky='w')
         self.pw_confirm = ttk.Entry(f, show='*'); self.pw_confirm.grid(row=len(fields)+2, column=1, pady=5)
 
-        ModernButton(c, text="REGISTRAR EMPLEADO", command=self.process_registration).pack(fill='x', pady=(10,8))
+        self.save_button = ModernButton(c, text="REGISTRAR EMPLEADO", command=self.process_registration)
+        self.save_button.pack(fill='x', pady=(10,8))
         ModernButton(c, text="REGRESAR", type="secondary", command=self.go_back).pack(fill='x', pady=(0,10))
 
     def process_registration(self):
@@ -900,29 +1235,24 @@ class RegisterEmployeeWindow(tk.Toplevel):
             messagebox.showerror("Contraseña", "Las contraseñas están vacias o no coinciden.")
             return
 
-        try:
-            existing_ids = [int(k) for k in self.controller.data['employees'].keys()]
-            new_id = max(existing_ids) + 1 if existing_ids else 1
-        except Exception:
-            new_id = 1
-
-        role = self.role_var.get()
-        if role == 'Recepcionista':
-            new_emp = Receptionist(new_id, data['first_name'], data.get('middle_name',''), data['last_name'], data.get('second_last_name',''), data['phone'], data['email'], data['status'], data['curp'], password)
-        elif role == 'Botones':
-            new_emp = Bellboy(new_id, data['first_name'], data.get('middle_name',''), data['last_name'], data.get('second_last_name',''), data['phone'], data['email'], data['status'], data['curp'], password)
-        else:
-            new_emp = Employee(new_id, data['first_name'], data.get('middle_name',''), data['last_name'], data.get('second_last_name',''), data['phone'], data['email'], data['status'], data['curp'], password)
-        
-        new_id_from_db = self.controller.employee_dao.create(new_emp)
-        
-        if new_id_from_db:
-            messagebox.showinfo("Registro Exitoso", f"Empleado {new_emp.getFirstName()} registrado en la base de datos con ID: {new_id_from_db}.")
-            self.controller.data['employees'][new_emp.getEmail()] = new_emp
+        def on_saved(result):
+            messagebox.showinfo("Registro Exitoso", f"Empleado {result['first_name']} registrado en la base de datos con ID: {result['employee_id']}.")
             self.destroy()
-        else:
+
+        def on_error(err):
+            if isinstance(err, ValueError):
+                messagebox.showerror("Datos Invalidos", str(err))
+                return
+            log.error("No se pudo registrar al empleado: %s", err)
             messagebox.showerror("Error de Base de Datos", "No se pudo registrar al empleado. Revise la consola para más detalles.")
 
+        # El puesto elige la clase (Receptionist, Bellboy o Employee) dentro del servicio.
+        self.controller.tasks.submit(self.controller.booking.register_employee, self.role_var.get(), data['first_name'],
+                                     data['last_name'], data['email'], password, data['phone'], data['status'], data['curp'],
+                                     data.get('middle_name', ''), data.get('second_last_name', ''), owner=self,
+                                     lock=(self.save_button,), cancellable=False,
+                                     on_success=on_saved, on_error=on_error)
+
     def go_back(self):
         try:
             self.controller.show_frame("WelcomeScreen")
@@ -938,5 +1268,12 @@ if __name__ == '__main__':
         windll.shcore.SetProcessDpiAwareness(1)
     except:
         pass
+    configure_logging()
+    if not BOOKING_SERVICE_URL:
+        try:
+            warm_up()
+        except Exception as err:
+            # Sin BD la interfaz arranca con los catalogos vacios en lugar de cerrarse.
+            log.error("No se pudo precalentar el pool de conexiones: %s", err)
     aplicacion = HotelGUI(raiz)
     raiz.mainloop()
\ No newline at end of file
@@ -0,0 +1,6 @@
+import sys
+
+
+def intern_value(value):
+    """Internaliza textos que se repiten en miles de entidades (tipos, estados, fechas)."""
+    return sys.intern(value) if type(value) is str else value
@@ -11,4 +11,49 @@ PASSWORD = os.getenv("DB_PASSWORD", "")
 POOL_SIZE = int(os.getenv("POOL_SIZE", "5"))
 
 if not HOST or not DATABASE or not USER:
-    raise ValueError("Variables de entorno criticas no configuradas: DB_HOST, DB_NAME, DB_USER son obligatorias.")
\ No newline at end of file
+    raise ValueError("Variables de entorno criticas no configuradas: DB_HOST, DB_NAME, DB_USER son obligatorias.")
+
+# Tamano del conjunto de trabajo en memoria de los repositorios (entidades por tabla).
+CACHE_SIZE = int(os.getenv("CACHE_SIZE", "1000"))
+# Filas por pagina al cargar listados desde la BD.
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "100"))
+# Cache de lecturas por id para catalogos que cambian poco (servicios, empleados).
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "256"))
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "300")) or None
+# Segundos entre volcados periodicos de metricas del pool (0 = desactivado).
+POOL_METRICS_INTERVAL = float(os.getenv("POOL_METRICS_INTERVAL", "0"))
+# Espera maxima (segundos) por una conexion libre y cuantos llamadores pueden esperar en fila.
+POOL_TIMEOUT = float(os.getenv("POOL_TIMEOUT", "5"))
+POOL_MAX_WAITERS = int(os.getenv("POOL_MAX_WAITERS", "32"))
+# Sentencias preparadas que conserva cada conexion del pool.
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", "64"))
+# Dias que cubre el calendario de tarifas y recargo de las noches de viernes y sabado (1.0 = sin recargo).
+RATE_CALENDAR_DAYS = int(os.getenv("RATE_CALENDAR_DAYS", "730"))
+WEEKEND_RATE_FACTOR = float(os.getenv("WEEKEND_RATE_FACTOR", "1.0"))
+# Sincronizacion incremental: segundos entre consultas de cambios (0 = desactivada) y
+# margen hacia atras de cada consulta, para no perder filas de transacciones que confirmaron tarde.
+SYNC_INTERVAL = float(os.getenv("SYNC_INTERVAL", "5"))
+SYNC_OVERLAP = float(os.getenv("SYNC_OVERLAP", "2"))
+# Motor de la BD: "mysql" (servidor compartido) o "sqlite" (archivo local, una sola terminal;
+# SQLITE_PATH=":memory:" crea una BD en memoria para pruebas y benchmarks).
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").strip().lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "hotel_le_villa.sqlite3")
+# Logging: nivel (DEBUG, INFO, WARNING...) y formato ("text" o "json").
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+# Sentencias mas lentas que SLOW_QUERY_MS se registran con su SQL y parametros (0 = desactivado);
+# SLOW_QUERY_LOG las escribe ademas en ese archivo. DAO_METRICS=0 quita la medicion por metodo.
+# De los parametros se escriben solo sus tipos; SLOW_QUERY_PARAMS=values escribe los valores
+# (nunca los de sentencias con contrasenas).
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "")
+SLOW_QUERY_PARAMS = os.getenv("SLOW_QUERY_PARAMS", "types").strip().lower()
+DAO_METRICS = os.getenv("DAO_METRICS", "1").strip() not in ("0", "false", "no")
+# Servicio de reservas (booking_server.py): direccion, hilos para la BD (por defecto, uno por conexion del pool)
+# y espera maxima de los clientes. Con BOOKING_SERVICE_URL (p. ej. http://127.0.0.1:8765) la GUI reserva a traves
+# del servicio en lugar de abrir su propio pool.
+BOOKING_HOST = os.getenv("BOOKING_HOST", "127.0.0.1")
+BOOKING_PORT = int(os.getenv("BOOKING_PORT", "8765"))
+BOOKING_WORKERS = int(os.getenv("BOOKING_WORKERS", str(POOL_SIZE)))
+BOOKING_SERVICE_URL = os.getenv("BOOKING_SERVICE_URL", "").strip().rstrip("/")
+BOOKING_TIMEOUT = float(os.getenv("BOOKING_TIMEOUT", "10"))
@@ -0,0 +1,192 @@
+"""
+Reporte de ocupacion e ingresos por dia y por tipo de habitacion.
+
+Para cada dia del rango [start, end) y cada room_type calcula habitaciones
+vendidas, ocupacion (%), ADR (tarifa promedio por noche vendida) y RevPAR
+(ingreso por habitacion disponible). El ingreso de una estancia se reparte
+por igual entre sus noches.
+
+Uso sin interfaz:
+
+    python occupancy_report.py --start 2025-01-01 --end 2026-01-01 [--daily] [--csv reporte.csv]
+"""
+import argparse
+import csv
+import sys
+from datetime import date
+
+import numpy as np
+
+from room_availability import to_ordinal, OUT_OF_SERVICE_STATUSES
+
+TOTAL = "Total"
+
+
+class OccupancyReport:
+    """Matrices (tipos x dias) de noches vendidas e ingreso, mas el inventario por tipo."""
+
+    def __init__(self, start, room_types, available, sold, revenue):
+        self.start = start
+        self.room_types = room_types
+        self.available = available
+        self.sold = sold
+        self.revenue = revenue
+
+    @property
+    def days(self):
+        return self.sold.shape[1]
+
+    def dates(self):
+        return [date.fromordinal(self.start + offset) for offset in range(self.days)]
+
+    @staticmethod
+    def _ratio(numerator, denominator):
+        numerator, denominator = np.broadcast_arrays(numerator, denominator)
+        out = np.zeros(numerator.shape, dtype=np.float64)
+        np.divide(numerator, denominator, out=out, where=denominator > 0)
+        return out
+
+    def occupancy(self):
+        """Porcentaje de habitaciones vendidas por tipo y dia."""
+        return 100.0 * self._ratio(self.sold, self.available[:, None])
+
+    def adr(self):
+        return self._ratio(self.revenue, self.sold)
+
+    def revpar(self):
+        return self._ratio(self.revenue, self.available[:, None])
+
+    def summary(self):
+        """Totales del rango por tipo, mas una fila 'Total' del hotel completo."""
+        sold = self.sold.sum(axis=1)
+        revenue = self.revenue.sum(axis=1)
+        room_nights = self.available * self.days
+        rows = []
+        names = list(self.room_types) + [TOTAL]
+        sold = np.append(sold, sold.sum())
+        revenue = np.append(revenue, revenue.sum())
+        room_nights = np.append(room_nights, room_nights.sum())
+        occupancy = 100.0 * self._ratio(sold, room_nights)
+        adr = self._ratio(revenue, sold)
+        revpar = self._ratio(revenue, room_nights)
+        for index, name in enumerate(names):
+            rows.append({
+                'room_type': name,
+                'rooms_sold': int(sold[index]),
+                'occupancy_pct': round(float(occupancy[index]), 2),
+                'adr': round(float(adr[index]), 2),
+                'revpar': round(float(revpar[index]), 2),
+                'revenue': round(float(revenue[index]), 2),
+            })
+        return rows
+
+    def daily_rows(self):
+        """Una fila por dia y tipo, para exportar."""
+        occupancy, adr, revpar = self.occupancy(), self.adr(), self.revpar()
+        rows = []
+        for offset, day in enumerate(self.dates()):
+            for index, room_type in enumerate(self.room_types):
+                rows.append({
+                    'date': day.isoformat(),
+                    'room_type': room_type,
+                    'rooms_sold': int(self.sold[index, offset]),
+                    'available': int(self.available[index]),
+                    'occupancy_pct': round(float(occupancy[index, offset]), 2),
+                    'adr': round(float(adr[index, offset]), 2),
+                    'revpar': round(float(revpar[index, offset]), 2),
+                    'revenue': round(float(self.revenue[index, offset]), 2),
+                })
+        return rows
+
+
+def build_report(store, rooms, start, end):
+    """
+    Calcula el reporte para [start, end) con un ReservationStore y la lista de habitaciones.
+
+    Cada estancia suma +1 en su primer dia dentro del rango y -1 al salir; una
+    suma acumulada por fila da las noches vendidas de cada dia. Todo se hace
+    con operaciones de NumPy sobre las columnas del almacen.
+    """
+    start, end = to_ordinal(start), to_ordinal(end)
+    if end <= start:
+        raise ValueError("La fecha final debe ser posterior a la inicial.")
+    days = end - start
+
+    room_types = sorted({room.getType() for room in rooms})
+    type_index = {room_type: index for index, room_type in enumerate(room_types)}
+    available = np.zeros(len(room_types), dtype=np.int64)
+    max_room_id = max((room.getId() for room in rooms), default=0)
+    # Tipo de cada room_id; -1 para ids desconocidos (habitaciones borradas).
+    room_type_of = np.full(max_room_id + 1, -1, dtype=np.int64)
+    for room in rooms:
+        room_type_of[room.getId()] = type_index[room.getType()]
+        if str(room.getStatus()).lower() not in OUT_OF_SERVICE_STATUSES:
+            available[type_index[room.getType()]] += 1
+
+    mask = store.where(start, end)
+    room_ids = store.room_id[mask]
+    check_in = store.check_in[mask]
+    check_out = store.check_out[mask]
+    total_cost = store.total_cost[mask]
+
+    known = room_ids <= max_room_id
+    types = np.full(len(room_ids), -1, dtype=np.int64)
+    types[known] = room_type_of[room_ids[known]]
+    valid = (types >= 0) & (check_out > check_in)
+    types, check_in, check_out, total_cost = types[valid], check_in[valid], check_out[valid], total_cost[valid]
+
+    nightly_rate = total_cost / (check_out - check_in)
+    first = np.maximum(check_in, start) - start
+    last = np.minimum(check_out, end) - start
+
+    sold = np.zeros((len(room_types), days + 1), dtype=np.int64)
+    np.add.at(sold, (types, first), 1)
+    np.add.at(sold, (types, last), -1)
+    revenue = np.zeros((len(room_types), days + 1), dtype=np.float64)
+    np.add.at(revenue, (types, first), nightly_rate)
+    np.add.at(revenue, (types, last), -nightly_rate)
+
+    return OccupancyReport(start, room_types, available,
+                           np.cumsum(sold, axis=1)[:, :days],
+                           np.cumsum(revenue, axis=1)[:, :days])
+
+
+def load_report(start, end, room_dao=None, reservation_dao=None):
+    """Arma el reporte leyendo ROOMS y RESERVATIONS desde la BD."""
+    from dao.room_dao import RoomDAO
+    from dao.reservation_dao import ReservationDAO
+    from reservation_store import ReservationStore
+
+    rooms = (room_dao or RoomDAO()).get_all()
+    store = ReservationStore.from_dao(reservation_dao or ReservationDAO())
+    return build_report(store, rooms, start, end)
+
+
+def write_csv(rows, stream):
+    if not rows:
+        return
+    writer = csv.DictWriter(stream, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reporte de ocupacion, ADR y RevPAR.")
+    parser.add_argument('--start', required=True, help="Fecha inicial AAAA-MM-DD (incluida).")
+    parser.add_argument('--end', required=True, help="Fecha final AAAA-MM-DD (excluida).")
+    parser.add_argument('--daily', action='store_true', help="Detalle por dia en lugar del resumen.")
+    parser.add_argument('--csv', help="Escribe el resultado en este archivo CSV.")
+    args = parser.parse_args(argv)
+
+    report = load_report(args.start, args.end)
+    rows = report.daily_rows() if args.daily else report.summary()
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as stream:
+            write_csv(rows, stream)
+        print(f"INFO: Reporte escrito en {args.csv} ({len(rows)} filas).")
+    else:
+        write_csv(rows, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,13 @@
 from datetime import date
+from interning import intern_value
 
 class Payment:
+    __slots__ = ('__id', '__amount', '__paymentMethod', '__reservation', '__date', '__weakref__')
+
     def __init__(self, id, amount, paymentMethod, reservation=None):
         self.__id = id
         self.__amount = amount
-        self.__paymentMethod = paymentMethod
+        self.__paymentMethod = intern_value(paymentMethod)
         self.__reservation = reservation
         self.__date = date.today()
 
@@ -15,7 +18,7 @@ class Payment:
     def setAmount(self, amount): self.__amount = amount
 
     def getPaymentMethod(self): return self.__paymentMethod
-    def setPaymentMethod(self, method): self.__paymentMethod = method
+    def setPaymentMethod(self, method): self.__paymentMethod = intern_value(method)
 
     def getReservation(self): return self.__reservation
     def setReservation(self, reservation): self.__reservation = reservation
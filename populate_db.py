@@ -9,10 +9,11 @@ def populate_employees(employee_dao):
     receptionist = Receptionist(0, "Brigitte", "", "Herrera", "Rodriguez", "4421111111", "brigitte@mail.com", "Activo", "HERB001122QRO", "brigitte123")
     bellboy = Bellboy(0, "Carlos", "", "Gomez", "Solis", "4422222222", "carlos@mail.com", "Activo", "GOSC001122QRO", "carlos123")
     
-    if employee_dao.create(receptionist):
-        print(f"-> Empleado {receptionist.getFirstName()} creado con ID: {receptionist.getId()}")
-    if employee_dao.create(bellboy):
-        print(f"-> Empleado {bellboy.getFirstName()} creado con ID: {bellboy.getId()}")
+    employees = [receptionist, bellboy]
+    employee_dao.create_many(employees)
+    for emp in employees:
+        if emp.getId():
+            print(f"-> Empleado {emp.getFirstName()} creado con ID: {emp.getId()}")
 
 def populate_customers(customer_dao):
     from customer import Customer
@@ -20,10 +21,11 @@ def populate_customers(customer_dao):
     customer1 = Customer(0, "Andrea", "Sarahi", "Lopez", "Guerrero", "4420000000", "andrea@mail.com", "Querétaro", "LOGA001122QRO", "andrea123")
     customer2 = Customer(0, "Juan", "", "Perez", "Vera", "4423333333", "juan@mail.com", "Querétaro", "PEVJ001122QRO", "juan123")
     
-    if customer_dao.create(customer1):
-        print(f"-> Cliente '{customer1.getName()}' creado con ID: {customer1.getId()}")
-    if customer_dao.create(customer2):
-        print(f"-> Cliente '{customer2.getName()}' creado con ID: {customer2.getId()}")
+    customers = [customer1, customer2]
+    customer_dao.create_many(customers)
+    for cust in customers:
+        if cust.getId():
+            print(f"-> Cliente '{cust.getName()}' creado con ID: {cust.getId()}")
 
 def populate_services(service_dao):
     from service import Service
@@ -36,8 +38,9 @@ def populate_services(service_dao):
         Service(0, "Cama Adicional", 25.00, "Instalacion de una cama supletoria en la habitacion."),
         Service(0, "Parqueo con Valet", 10.00, "Servicio de aparcacoches y recogida del vehiculo.")
     ]
+    service_dao.create_many(services_to_create)
     for svc in services_to_create:
-        if service_dao.create(svc):
+        if svc.getId():
             print(f"-> Servicio '{svc.getType()}' creado con ID: {svc.getId()}")
 
 def populate_rooms(room_dao):
@@ -52,10 +55,9 @@ def populate_rooms(room_dao):
         Room(0, "503", "Suite Presidencial", "Maintenance", 600.00, "La suite mas lujosa, con jacuzzi y comedor privado."),
         Room(0, "108", "Accesible", "Available", 150.00, "Habitacion adaptada para personas con movilidad reducida.")
     ]
-    count = 0
+    count = len(room_dao.create_many(rooms_to_create))
     for room in rooms_to_create:
-        if room_dao.create(room):
-            count += 1
+        if room.getId():
             print(f"-> Habitacion '{room.getType()}' creada con ID: {room.getId()}")
     print(f"-> {count} habitaciones creadas exitosamente.")
 
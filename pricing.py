@@ -0,0 +1,167 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from mysql_env import RATE_CALENDAR_DAYS, WEEKEND_RATE_FACTOR
+from room_availability import to_ordinal
+
+# Noches de viernes y sabado (date.weekday()).
+WEEKEND_NIGHTS = (4, 5)
+# Descuento por duracion de la estancia: (noches minimas, descuento). Vacio = sin descuento.
+LENGTH_OF_STAY_DISCOUNTS = ()
+
+
+class RateCalendar:
+    """
+    Factor de tarifa por noche de cada tipo de habitacion, precalculado para
+    cada dia de [start, end): la tarifa de una noche es el costo por noche de
+    la habitacion por el factor de su tipo ese dia. Guarda tambien las sumas
+    acumuladas por tipo, asi el costo de cualquier estancia es una resta:
+    costo * (acumulado[salida] - acumulado[entrada]).
+
+    El precio base siempre es el costo actual de cada habitacion (dos
+    habitaciones del mismo tipo pueden costar distinto). Fuera del calendario y
+    para tipos que no existian al construirlo el factor es 1.0, asi que esas
+    noches cuestan el costo por noche, como antes de haber calendario.
+    """
+
+    def __init__(self, start, end, room_types):
+        self.start = to_ordinal(start)
+        self.end = to_ordinal(end)
+        if self.end <= self.start:
+            raise ValueError("El calendario debe cubrir al menos un dia.")
+        self.room_types = sorted(set(room_types))
+        # La ultima fila es la de los tipos desconocidos.
+        self._type_index = {room_type: index for index, room_type in enumerate(self.room_types)}
+        self._default_row = len(self.room_types)
+        self._factors = np.ones((len(self.room_types) + 1, self.end - self.start), dtype=np.float64)
+        self._cumulative = None
+
+    @classmethod
+    def from_rooms(cls, rooms, start=None, days=RATE_CALENDAR_DAYS, weekend_factor=WEEKEND_RATE_FACTOR):
+        start = date.today() - timedelta(days=30) if start is None else start
+        calendar = cls(start, to_ordinal(start) + days, {room.getType() for room in rooms})
+        if weekend_factor != 1.0:
+            calendar.apply_factor(weekend_factor, weekdays=WEEKEND_NIGHTS)
+        return calendar
+
+    def _columns(self, start, end):
+        first = self.start if start is None else max(to_ordinal(start), self.start)
+        last = self.end if end is None else min(to_ordinal(end), self.end)
+        return slice(first - self.start, max(last, first) - self.start)
+
+    def _rows(self, room_type):
+        # room_type=None incluye la fila de los tipos desconocidos: un fin de semana es para todos.
+        return slice(None) if room_type is None else self.type_index(room_type)
+
+    def type_index(self, room_type):
+        return self._type_index.get(room_type, self._default_row)
+
+    def set_factor(self, room_type, factor, start=None, end=None):
+        """Fija el factor de un tipo en [start, end)."""
+        self._factors[self._rows(room_type), self._columns(start, end)] = factor
+        self._cumulative = None
+
+    def apply_factor(self, factor, start=None, end=None, room_type=None, weekdays=None):
+        """
+        Multiplica factores (temporadas, fines de semana). room_type=None afecta
+        a todos los tipos; `weekdays` limita a esos dias de la semana (0 = lunes).
+        """
+        columns = self._columns(start, end)
+        if weekdays is not None:
+            ordinals = np.arange(self.start, self.end)[columns]
+            # date.fromordinal(1) es lunes, asi que el dia de la semana es (ordinal - 1) % 7.
+            selected = np.isin((ordinals - 1) % 7, weekdays)
+            columns = np.arange(columns.start, columns.stop)[selected]
+        self._factors[self._rows(room_type), columns] *= factor
+        self._cumulative = None
+
+    def _prefix(self):
+        if self._cumulative is None:
+            cumulative = np.zeros((self._factors.shape[0], self._factors.shape[1] + 1), dtype=np.float64)
+            np.cumsum(self._factors, axis=1, out=cumulative[:, 1:])
+            self._cumulative = cumulative
+        return self._cumulative
+
+    @staticmethod
+    def _stay(check_in, check_out):
+        first, last = to_ordinal(check_in), to_ordinal(check_out)
+        if last <= first:
+            raise ValueError("La fecha de salida debe ser posterior a la fecha de entrada.")
+        return first, last
+
+    def _factor_sums(self, rows, first, last):
+        """Suma de factores de [first, last) por fila; las noches fuera del calendario valen 1.0."""
+        low, high = max(first, self.start), min(last, self.end)
+        covered = max(high - low, 0)
+        outside = (last - first) - covered
+        if not covered:
+            return np.full(np.shape(rows), float(outside))
+        prefix = self._prefix()
+        return prefix[rows, high - self.start] - prefix[rows, low - self.start] + outside
+
+    def nightly_rates(self, room, check_in, check_out):
+        first, last = self._stay(check_in, check_out)
+        rates = np.ones(last - first, dtype=np.float64)
+        low, high = max(first, self.start), min(last, self.end)
+        if low < high:
+            rates[low - first:high - first] = self._factors[self.type_index(room.getType()), low - self.start:high - self.start]
+        return rates * float(room.getCost())
+
+    def stay_total(self, room, check_in, check_out):
+        first, last = self._stay(check_in, check_out)
+        return float(room.getCost()) * float(self._factor_sums(self.type_index(room.getType()), first, last))
+
+    def stay_totals(self, rooms, check_in, check_out):
+        """Costo de la misma estancia para varias habitaciones a la vez, en su orden."""
+        first, last = self._stay(check_in, check_out)
+        rows = np.array([self.type_index(room.getType()) for room in rooms], dtype=np.int64)
+        costs = np.array([float(room.getCost()) for room in rooms], dtype=np.float64)
+        return costs * self._factor_sums(rows, first, last)
+
+
+class Quote:
+    """Desglose del precio de una estancia."""
+    __slots__ = ('room', 'nights', 'room_subtotal', 'discount', 'service_subtotal', 'total')
+
+    def __init__(self, room, nights, room_subtotal, discount, service_subtotal):
+        self.room = room
+        self.nights = nights
+        self.room_subtotal = room_subtotal
+        self.discount = discount
+        self.service_subtotal = service_subtotal
+        self.total = room_subtotal - discount + service_subtotal
+
+
+class PricingEngine:
+    """Cotiza estancias con el calendario de tarifas y los descuentos por duracion."""
+
+    def __init__(self, calendar, length_of_stay_discounts=LENGTH_OF_STAY_DISCOUNTS):
+        self.calendar = calendar
+        # De mayor a menor: aplica el primer umbral que la estancia alcance.
+        self.length_of_stay_discounts = sorted(length_of_stay_discounts, reverse=True)
+
+    def discount_rate(self, nights):
+        for min_nights, rate in self.length_of_stay_discounts:
+            if nights >= min_nights:
+                return rate
+        return 0.0
+
+    def _nights(self, check_in, check_out):
+        return to_ordinal(check_out) - to_ordinal(check_in)
+
+    def quote(self, room, check_in, check_out, service=None):
+        room_subtotal = self.calendar.stay_total(room, check_in, check_out)
+        nights = self._nights(check_in, check_out)
+        discount = round(room_subtotal * self.discount_rate(nights), 2)
+        service_subtotal = float(service.getCost()) if service is not None else 0.0
+        return Quote(room, nights, round(room_subtotal, 2), discount, service_subtotal)
+
+    def quote_many(self, rooms, check_in, check_out):
+        """Total de la estancia (sin servicios) para cada habitacion: {room_id: total}."""
+        rooms = list(rooms)
+        if not rooms:
+            return {}
+        totals = self.calendar.stay_totals(rooms, check_in, check_out)
+        totals = totals * (1.0 - self.discount_rate(self._nights(check_in, check_out)))
+        return {room.getId(): round(float(total), 2) for room, total in zip(rooms, totals)}
@@ -1,6 +1,8 @@
 from employee import Employee
 
 class Receptionist(Employee):
+    __slots__ = ()
+
     def createReservation(self, reservation):
         super().createReservation(reservation)
 
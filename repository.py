@@ -0,0 +1,79 @@
+from cache import LRUCache
+from mysql_env import CACHE_SIZE, PAGE_SIZE
+
+
+class LazyRepository:
+    """
+    Acceso a entidades bajo demanda con un conjunto de trabajo acotado.
+
+    Se comporta como el diccionario que usaba la GUI (get, [], in, del) pero
+    solo consulta la BD cuando la entidad no esta en memoria, y descarta las
+    menos usadas al superar max_size.
+    """
+
+    def __init__(self, loader, max_size=CACHE_SIZE):
+        self._loader = loader
+        self._cache = LRUCache(max_size)
+
+    def get(self, key, default=None):
+        obj = self._cache.get(key)
+        if obj is None:
+            obj = self._loader(key)
+            if obj is None:
+                return default
+            self._cache.put(key, obj)
+        return obj
+
+    def __getitem__(self, key):
+        obj = self.get(key)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def __setitem__(self, key, obj):
+        self._cache.put(key, obj)
+
+    def __delitem__(self, key):
+        self._cache.pop(key)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._cache)
+
+    def keys(self):
+        return self._cache.keys()
+
+    def values(self):
+        """Solo las entidades cargadas actualmente, no la tabla completa."""
+        return self._cache.values()
+
+
+class CustomerRepository(LazyRepository):
+    def __init__(self, customer_dao, max_size=CACHE_SIZE):
+        super().__init__(customer_dao.get_by_email, max_size)
+
+
+class EmployeeRepository(LazyRepository):
+    def __init__(self, employee_dao, max_size=CACHE_SIZE):
+        super().__init__(employee_dao.get_by_email, max_size)
+
+
+class ReservationRepository(LazyRepository):
+    def __init__(self, reservation_dao, max_size=CACHE_SIZE):
+        super().__init__(reservation_dao.get_by_id, max_size)
+        self._dao = reservation_dao
+
+    def _remember(self, reservations):
+        for res in reservations:
+            self._cache.put(res.getId(), res)
+        return reservations
+
+    def page(self, after_id=0, limit=PAGE_SIZE):
+        """Siguiente pagina ordenada por id, a partir de after_id."""
+        return self._remember(self._dao.get_page(after_id, limit))
+
+    def between(self, start, end=None):
+        """Reservas que se cruzan con el rango [start, end)."""
+        return self._remember(self._dao.get_by_date_window(start, end))
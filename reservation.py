@@ -1,21 +1,27 @@
+from interning import intern_value
+
 class Reservation:
-    def __init__(self, id, checkIn, checkOut, customer, room, payment=None):
+    __slots__ = ('__id', '__checkIn', '__checkOut', '__customer', '__room', '__payment', '__totalCost',
+                 '__services', '__weakref__')
+
+    def __init__(self, id, checkIn, checkOut, customer, room, payment=None, totalCost=None):
         self.__id = id
-        self.__checkIn = checkIn
-        self.__checkOut = checkOut
+        self.__checkIn = intern_value(checkIn)
+        self.__checkOut = intern_value(checkOut)
         self.__customer = customer
         self.__room = room
         self.__payment = payment
-        self.__services = []
+        self.__totalCost = totalCost
+        self.__services = None
 
     def getId(self): return self.__id
     def setId(self, id): self.__id = id
 
     def getCheckIn(self): return self.__checkIn
-    def setCheckIn(self, checkIn): self.__checkIn = checkIn
+    def setCheckIn(self, checkIn): self.__checkIn = intern_value(checkIn)
 
     def getCheckOut(self): return self.__checkOut
-    def setCheckOut(self, checkOut): self.__checkOut = checkOut
+    def setCheckOut(self, checkOut): self.__checkOut = intern_value(checkOut)
 
     def getCustomer(self): return self.__customer
     def setCustomer(self, customer): self.__customer = customer
@@ -26,9 +32,24 @@ class Reservation:
     def getPayment(self): return self.__payment
     def setPayment(self, payment): self.__payment = payment
 
-    def getServices(self): return self.__services
+    def getTotalCost(self): return self.__totalCost
+    def setTotalCost(self, totalCost): self.__totalCost = totalCost
+
+    def getServices(self):
+        if self.__services is None:
+            self.__services = []
+        return self.__services
+
+    def createReservation(self, availability=None):
+        if availability is not None:
+            # Con indice de disponibilidad se validan las fechas reales, no el estado de la habitacion.
+            if availability.is_available(self.__room.getId(), self.__checkIn, self.__checkOut):
+                self.__customer.makeReservation(self)
+                print(f"Reservation #{self.__id} created successfully for {self.__customer.getName()}")
+                return True
+            print(f"Unable to create reservation. Room {self.__room.getId()} is booked for those dates.")
+            return False
 
-    def createReservation(self):
         if self.__room.getStatus() == "Available":
             self.__room.assignCustomer(self.__customer)
             self.__customer.makeReservation(self)
@@ -44,14 +65,14 @@ class Reservation:
 
     def modifyReservation(self, newCheckIn=None, newCheckOut=None):
         if newCheckIn:
-            self.__checkIn = newCheckIn
+            self.__checkIn = intern_value(newCheckIn)
             print(f"Reservation #{self.__id} check-in date updated to {newCheckIn}.")
         if newCheckOut:
-            self.__checkOut = newCheckOut
+            self.__checkOut = intern_value(newCheckOut)
             print(f"Reservation #{self.__id} check-out date updated to {newCheckOut}.")
 
     def addService(self, service):
-        self.__services.append(service)
+        self.getServices().append(service)
         print(f"Service '{service.getType()}' added to reservation #{self.__id}.")
         
     def showInfo(self):
@@ -62,7 +83,7 @@ class Reservation:
             f"  Customer: {customer_name}\n"
             f"  Room: {room_id} ({self.__room.getType()})\n"
             f"  Check-in: {self.__checkIn} | Check-out: {self.__checkOut}\n"
-            f"  Additional Services: {len(self.__services)}"
+            f"  Additional Services: {len(self.__services or ())}"
         )
         print(info)
         return info
\ No newline at end of file
@@ -1,4 +1,6 @@
 class ServiceReservation:
+    __slots__ = ('__id', '__date_time', '__customer', '__service', '__weakref__')
+
     def __init__(self, id, date_time, customer, service):
         self.__id = id
         self.__date_time = date_time
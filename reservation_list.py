@@ -0,0 +1,115 @@
+from mysql_env import PAGE_SIZE
+
+# Orden de las columnas en cada fila del listado (ver ReservationDAO.get_summary_page).
+COLUMNS = ('id', 'customer', 'room', 'check_in', 'check_out', 'cost')
+
+
+def diff_rows(old_rows, new_rows):
+    """
+    Compara dos listados por id (primera columna) y devuelve
+    (ids_eliminados, filas_nuevas, filas_cambiadas).
+    """
+    old_by_id = {row[0]: row for row in old_rows}
+    new_ids = set()
+    inserted = []
+    updated = []
+    for row in new_rows:
+        new_ids.add(row[0])
+        previous = old_by_id.get(row[0])
+        if previous is None:
+            inserted.append(row)
+        elif previous != row:
+            updated.append(row)
+    deleted = [row_id for row_id in old_by_id if row_id not in new_ids]
+    return deleted, inserted, updated
+
+
+class ReservationListModel:
+    """
+    Estado del listado de reservas sin dependencias de Tk: orden, filtro y
+    las filas ya cargadas. Las consultas (fetch_*) pueden correr en un hilo de
+    fondo; los metodos que modifican las filas se llaman en el hilo de la GUI.
+
+    Cada cambio de orden o filtro abre una nueva generacion, y las paginas que
+    lleguen de una generacion anterior se ignoran.
+    """
+
+    def __init__(self, dao, page_size=PAGE_SIZE):
+        self._dao = dao
+        self.page_size = page_size
+        self.sort = 'id'
+        self.descending = False
+        self.search = ""
+        self.rows = []
+        self.exhausted = False
+        self.generation = 0
+
+    def reset(self):
+        self.rows = []
+        self.exhausted = False
+        self.generation += 1
+
+    def set_sort(self, column):
+        """Ordena por `column`; elegir la misma columna invierte el sentido."""
+        if column not in COLUMNS:
+            raise ValueError(f"Columna de orden invalida: {column}")
+        self.descending = not self.descending if column == self.sort else False
+        self.sort = column
+        self.reset()
+
+    def set_search(self, text):
+        text = text.strip()
+        if text == self.search:
+            return False
+        self.search = text
+        self.reset()
+        return True
+
+    def _cursor(self):
+        if not self.rows:
+            return None
+        last = self.rows[-1]
+        return last[COLUMNS.index(self.sort)], last[0]
+
+    def fetch_next(self):
+        """Consulta la pagina siguiente a la ultima fila cargada. Devuelve (generacion, filas)."""
+        generation = self.generation
+        page = self._dao.get_summary_page(self.sort, self.descending, self.search, self._cursor(), self.page_size)
+        return generation, page
+
+    def append(self, result):
+        """Agrega una pagina traida por fetch_next; devuelve las filas agregadas."""
+        generation, page = result
+        if generation != self.generation:
+            return []
+        self.rows.extend(page)
+        if len(page) < self.page_size:
+            self.exhausted = True
+        return page
+
+    def fetch_window(self):
+        """Vuelve a consultar el tramo ya cargado para compararlo con lo mostrado."""
+        generation = self.generation
+        limit = max(len(self.rows), self.page_size)
+        return generation, self._dao.get_summary_page(self.sort, self.descending, self.search, None, limit)
+
+    def apply(self, result):
+        """Reemplaza el tramo cargado con el resultado de fetch_window y devuelve el diff."""
+        generation, rows = result
+        if generation != self.generation:
+            return [], [], []
+        changes = diff_rows(self.rows, rows)
+        self.exhausted = len(rows) < max(len(self.rows), self.page_size)
+        self.rows = rows
+        return changes
+
+    def remove(self, reservation_id):
+        before = len(self.rows)
+        self.rows = [row for row in self.rows if row[0] != reservation_id]
+        return len(self.rows) != before
+
+    def index_of(self, reservation_id):
+        for index, row in enumerate(self.rows):
+            if row[0] == reservation_id:
+                return index
+        return None
@@ -0,0 +1,152 @@
+from itertools import islice
+
+import numpy as np
+
+from dao.streaming import CHUNK_SIZE
+from room_availability import to_ordinal
+
+# Columnas del almacen y su tipo; el orden coincide con ReservationDAO.iter_fact_rows.
+COLUMNS = (
+    ('id', np.int64),
+    ('room_id', np.int32),
+    ('customer_id', np.int32),
+    ('check_in', np.int32),
+    ('check_out', np.int32),
+    ('total_cost', np.float64),
+)
+
+
+class ReservationStore:
+    """
+    Reservas en columnas de NumPy para preguntas agregadas (ingresos, noches
+    vendidas, ocupacion). Las fechas se guardan como ordinales de dia y cada
+    estancia ocupa [check_in, check_out).
+
+    Los filtros devuelven mascaras booleanas que se combinan con & y |, asi un
+    recorrido sobre millones de reservas no crea objetos de Python por fila.
+    """
+
+    def __init__(self, capacity=0):
+        self._size = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS}
+
+    @classmethod
+    def from_rows(cls, rows, chunk_size=CHUNK_SIZE):
+        store = cls()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return store
+            store.extend(chunk)
+
+    @classmethod
+    def from_dao(cls, reservation_dao, chunk_size=CHUNK_SIZE):
+        """Carga la tabla por bloques de `chunk_size` filas sin materializar entidades."""
+        return cls.from_rows(reservation_dao.iter_fact_rows(chunk_size), chunk_size)
+
+    def __len__(self):
+        return self._size
+
+    def column(self, name):
+        """Vista (sin copia) de las filas ocupadas de una columna."""
+        return self._columns[name][:self._size]
+
+    @property
+    def id(self): return self.column('id')
+
+    @property
+    def room_id(self): return self.column('room_id')
+
+    @property
+    def customer_id(self): return self.column('customer_id')
+
+    @property
+    def check_in(self): return self.column('check_in')
+
+    @property
+    def check_out(self): return self.column('check_out')
+
+    @property
+    def total_cost(self): return self.column('total_cost')
+
+    def _reserve(self, needed):
+        capacity = len(self._columns['id'])
+        if needed <= capacity:
+            return
+        # Crecimiento geometrico: cada bloque nuevo se copia un numero constante de veces en promedio.
+        capacity = max(needed, 2 * capacity, CHUNK_SIZE)
+        for name, dtype in COLUMNS:
+            grown = np.empty(capacity, dtype=dtype)
+            grown[:self._size] = self._columns[name][:self._size]
+            self._columns[name] = grown
+
+    def extend(self, rows):
+        """Agrega un bloque de tuplas (id, room_id, customer_id, check_in, check_out, total_cost)."""
+        if not rows:
+            return
+        start, end = self._size, self._size + len(rows)
+        self._reserve(end)
+        for (name, dtype), values in zip(COLUMNS, zip(*rows)):
+            self._columns[name][start:end] = np.fromiter(values, dtype=dtype, count=len(rows))
+        self._size = end
+
+    def append(self, reservation):
+        """Agrega una entidad Reservation recien creada."""
+        self.extend([(
+            reservation.getId(),
+            reservation.getRoom().getId(),
+            reservation.getCustomer().getId(),
+            to_ordinal(reservation.getCheckIn()),
+            to_ordinal(reservation.getCheckOut()),
+            reservation.getTotalCost() or 0.0,
+        )])
+
+    def remove(self, reservation_ids):
+        """Quita las reservas con esos ids; devuelve cuantas se quitaron."""
+        keep = ~np.isin(self.id, np.asarray(reservation_ids, dtype=np.int64))
+        removed = self._size - int(keep.sum())
+        if removed:
+            for name, _ in COLUMNS:
+                kept = self._columns[name][:self._size][keep]
+                self._columns[name][:len(kept)] = kept
+            self._size -= removed
+        return removed
+
+    def overlapping(self, start=None, end=None):
+        """Mascara de estancias que se cruzan con [start, end); un extremo None queda abierto."""
+        mask = np.ones(self._size, dtype=bool)
+        if start is not None:
+            mask &= self.check_out > to_ordinal(start)
+        if end is not None:
+            mask &= self.check_in < to_ordinal(end)
+        return mask
+
+    def in_rooms(self, room_ids):
+        return np.isin(self.room_id, np.asarray(list(room_ids), dtype=np.int32))
+
+    def where(self, start=None, end=None, room_ids=None):
+        mask = self.overlapping(start, end)
+        if room_ids is not None:
+            mask &= self.in_rooms(room_ids)
+        return mask
+
+    def nights(self, start=None, end=None, mask=None):
+        """Noches de cada estancia dentro de [start, end), recortadas a la ventana."""
+        check_in = self.check_in
+        check_out = self.check_out
+        if mask is not None:
+            check_in = check_in[mask]
+            check_out = check_out[mask]
+        if start is not None:
+            check_in = np.maximum(check_in, to_ordinal(start))
+        if end is not None:
+            check_out = np.minimum(check_out, to_ordinal(end))
+        return np.clip(check_out - check_in, 0, None)
+
+    def nights_sold(self, start=None, end=None, room_ids=None):
+        return int(self.nights(start, end, self.where(start, end, room_ids)).sum())
+
+    def revenue(self, start=None, end=None, room_ids=None):
+        """Suma de total_cost de las reservas que se cruzan con la ventana."""
+        return float(self.total_cost[self.where(start, end, room_ids)].sum())
@@ -1,9 +1,13 @@
+from interning import intern_value
+
 class Room:
+    __slots__ = ('__id', '__room_number', '__type', '__status', '__cost', '__description', '__weakref__')
+
     def __init__(self, id, room_number, type, status="Available", cost=0.0, description=""):
         self.__id = id
         self.__room_number = room_number
-        self.__type = type
-        self.__status = status
+        self.__type = intern_value(type)
+        self.__status = intern_value(status)
         self.__cost = cost
         self.__description = description
 
@@ -14,10 +18,10 @@ class Room:
     def setRoomNumber(self, room_number): self.__room_number = room_number
 
     def getType(self): return self.__type
-    def setType(self, type): self.__type = type
+    def setType(self, type): self.__type = intern_value(type)
 
     def getStatus(self): return self.__status
-    def setStatus(self, status): self.__status = status
+    def setStatus(self, status): self.__status = intern_value(status)
 
     def getCost(self): return self.__cost
     def setCost(self, cost): self.__cost = cost
@@ -0,0 +1,144 @@
+from bisect import bisect_left
+from datetime import date, datetime
+
+# Estados de habitacion que la sacan del inventario sin importar las fechas.
+OUT_OF_SERVICE_STATUSES = {"maintenance"}
+
+
+def to_ordinal(value):
+    """Convierte 'AAAA-MM-DD', date o datetime al numero ordinal del dia; un entero ya es ordinal."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return datetime.strptime(str(value).strip(), "%Y-%m-%d").date().toordinal()
+
+
+class RoomAvailabilityIndex:
+    """
+    Indice de intervalos ocupados por habitacion.
+
+    Cada habitacion guarda sus estancias como arreglos paralelos ordenados por
+    fecha de entrada ([check_in, check_out) en ordinales), mas la salida mas
+    tardia entre cada estancia y las anteriores. Asi basta una busqueda binaria
+    para saber si un rango esta libre, aun con estancias traslapadas de datos
+    viejos (una estancia larga puede cubrir a otra que entra despues).
+    """
+
+    def __init__(self, rooms=(), reservations=()):
+        self.__rooms = {}
+        self.__starts = {}
+        self.__ends = {}
+        self.__max_ends = {}
+        self.__ids = {}
+        self.__by_reservation = {}
+        for room in rooms:
+            self.add_room(room)
+        for res in reservations:
+            self.add(res)
+
+    @classmethod
+    def from_dao(cls, room_dao, reservation_dao):
+        return cls(room_dao.get_all(), reservation_dao.get_all())
+
+    def add_room(self, room):
+        room_id = room.getId()
+        self.__rooms[room_id] = room
+        self.__starts.setdefault(room_id, [])
+        self.__ends.setdefault(room_id, [])
+        self.__max_ends.setdefault(room_id, [])
+        self.__ids.setdefault(room_id, [])
+
+    def remove_room(self, room_id):
+        """Quita una habitacion eliminada junto con sus estancias."""
+        for res_id in self.__ids.pop(room_id, []):
+            self.__by_reservation.pop(res_id, None)
+        self.__starts.pop(room_id, None)
+        self.__ends.pop(room_id, None)
+        self.__max_ends.pop(room_id, None)
+        return self.__rooms.pop(room_id, None) is not None
+
+    def add(self, reservation):
+        """Registra una reserva ya persistida (llamar despues de ReservationDAO.create)."""
+        res_id = reservation.getId()
+        if res_id in self.__by_reservation:
+            self.remove(res_id)
+
+        room = reservation.getRoom()
+        room_id = room.getId()
+        if room_id not in self.__rooms:
+            self.add_room(room)
+
+        start = to_ordinal(reservation.getCheckIn())
+        end = to_ordinal(reservation.getCheckOut())
+        starts = self.__starts[room_id]
+        pos = bisect_left(starts, start)
+        starts.insert(pos, start)
+        self.__ends[room_id].insert(pos, end)
+        self.__ids[room_id].insert(pos, res_id)
+        self.__by_reservation[res_id] = (room_id, start)
+        self._refresh_max_ends(room_id, pos)
+
+    def remove(self, reservation_id):
+        """Libera el rango de una reserva eliminada (llamar despues de ReservationDAO.delete)."""
+        entry = self.__by_reservation.pop(reservation_id, None)
+        if entry is None:
+            return False
+        room_id, start = entry
+        starts = self.__starts[room_id]
+        ids = self.__ids[room_id]
+        pos = bisect_left(starts, start)
+        while ids[pos] != reservation_id:
+            pos += 1
+        del starts[pos]
+        del self.__ends[room_id][pos]
+        del ids[pos]
+        self._refresh_max_ends(room_id, pos)
+        return True
+
+    def _refresh_max_ends(self, room_id, pos):
+        """Recalcula la salida mas tardia acumulada desde la posicion `pos`."""
+        ends = self.__ends[room_id]
+        max_ends = self.__max_ends[room_id]
+        del max_ends[pos:]
+        latest = max_ends[-1] if max_ends else None
+        for end in ends[pos:]:
+            latest = end if latest is None or end > latest else latest
+            max_ends.append(latest)
+
+    def is_available(self, room_id, check_in, check_out):
+        room = self.__rooms.get(room_id)
+        if room is None:
+            return False
+        if str(room.getStatus()).lower() in OUT_OF_SERVICE_STATUSES:
+            return False
+        start, end = to_ordinal(check_in), to_ordinal(check_out)
+        if end <= start:
+            return False
+        return self._is_free(room_id, start, end)
+
+    def _is_free(self, room_id, start, end):
+        # Estancias que entran antes de la salida pedida: si la mas tardia de sus
+        # salidas es despues de la entrada pedida, los rangos se traslapan.
+        pos = bisect_left(self.__starts[room_id], end)
+        return pos == 0 or self.__max_ends[room_id][pos - 1] <= start
+
+    def available_rooms(self, check_in, check_out, room_type=None):
+        start = to_ordinal(check_in)
+        end = to_ordinal(check_out)
+        if end <= start:
+            return []
+        result = []
+        for room_id, room in self.__rooms.items():
+            if room_type and room.getType() != room_type:
+                continue
+            if str(room.getStatus()).lower() in OUT_OF_SERVICE_STATUSES:
+                continue
+            if self._is_free(room_id, start, end):
+                result.append(room)
+        return result
+
+    def room_types(self):
+        return sorted({room.getType() for room in self.__rooms.values()})
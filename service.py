@@ -1,7 +1,11 @@
+from interning import intern_value
+
 class Service:
+    __slots__ = ('__id', '__type', '__cost', '__description', '__weakref__')
+
     def __init__(self, id, type, cost, description):
         self.__id = id
-        self.__type = type
+        self.__type = intern_value(type)
         self.__cost = cost
         self.__description = description
 
@@ -9,7 +13,7 @@ class Service:
     def setId(self, id): self.__id = id
 
     def getType(self): return self.__type
-    def setType(self, type): self.__type = type
+    def setType(self, type): self.__type = intern_value(type)
 
     def getCost(self): return self.__cost
     def setCost(self, cost): self.__cost = cost
@@ -0,0 +1,49 @@
+-- Sincronizacion incremental entre terminales (sync.py).
+--
+-- Cada tabla sincronizada lleva updated_at, que MySQL actualiza en cada
+-- INSERT/UPDATE, con un indice para pedir "lo cambiado desde X". Los DELETE
+-- dejan una lapida en CHANGE_TOMBSTONES mediante triggers, para que las
+-- demas terminales sepan que quitar.
+
+ALTER TABLE ROOMS
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_rooms_updated_at (updated_at);
+
+ALTER TABLE SERVICES
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_services_updated_at (updated_at);
+
+ALTER TABLE CUSTOMERS
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_customers_updated_at (updated_at);
+
+ALTER TABLE EMPLOYEES
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_employees_updated_at (updated_at);
+
+ALTER TABLE RESERVATIONS
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_reservations_updated_at (updated_at);
+
+CREATE TABLE IF NOT EXISTS CHANGE_TOMBSTONES (
+    tombstone_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(32) NOT NULL,
+    row_id INT NOT NULL,
+    deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    INDEX idx_tombstones_deleted_at (deleted_at)
+);
+
+CREATE TRIGGER trg_rooms_tombstone AFTER DELETE ON ROOMS
+    FOR EACH ROW INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('ROOMS', OLD.room_id);
+
+CREATE TRIGGER trg_services_tombstone AFTER DELETE ON SERVICES
+    FOR EACH ROW INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('SERVICES', OLD.service_id);
+
+CREATE TRIGGER trg_customers_tombstone AFTER DELETE ON CUSTOMERS
+    FOR EACH ROW INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('CUSTOMERS', OLD.customer_id);
+
+CREATE TRIGGER trg_employees_tombstone AFTER DELETE ON EMPLOYEES
+    FOR EACH ROW INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('EMPLOYEES', OLD.employee_id);
+
+CREATE TRIGGER trg_reservations_tombstone AFTER DELETE ON RESERVATIONS
+    FOR EACH ROW INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('RESERVATIONS', OLD.reservation_id);
@@ -0,0 +1,39 @@
+-- Inventario por noche para reservar sin empalmes entre terminales.
+--
+-- Cada reserva inserta una fila por habitacion y noche dentro de la misma
+-- transaccion que la crea (ReservationDAO.create). La llave primaria
+-- (room_id, night) hace que la BD rechace la segunda reserva de una misma
+-- noche con ER_DUP_ENTRY, sin LOCK TABLES ni SELECT ... FOR UPDATE. Borrar la
+-- reserva libera sus noches por el ON DELETE CASCADE.
+
+CREATE TABLE IF NOT EXISTS ROOM_NIGHTS (
+    room_id INT NOT NULL,
+    night DATE NOT NULL,
+    reservation_id INT NOT NULL,
+    PRIMARY KEY (room_id, night),
+    INDEX idx_room_nights_reservation (reservation_id),
+    CONSTRAINT fk_room_nights_room FOREIGN KEY (room_id) REFERENCES ROOMS (room_id),
+    CONSTRAINT fk_room_nights_reservation FOREIGN KEY (reservation_id)
+        REFERENCES RESERVATIONS (reservation_id) ON DELETE CASCADE
+);
+
+-- Reclama las noches de las reservas existentes. Si ya habia reservas
+-- empalmadas, INSERT IGNORE deja la noche a la primera que la reclamo; la
+-- consulta de abajo lista las que quedaron incompletas para revisarlas a mano.
+INSERT IGNORE INTO ROOM_NIGHTS (room_id, night, reservation_id)
+WITH RECURSIVE nights (reservation_id, room_id, night, check_out_date) AS (
+    SELECT reservation_id, room_id, check_in_date, check_out_date
+    FROM RESERVATIONS
+    WHERE check_out_date > check_in_date
+    UNION ALL
+    SELECT reservation_id, room_id, night + INTERVAL 1 DAY, check_out_date
+    FROM nights
+    WHERE night + INTERVAL 1 DAY < check_out_date
+)
+SELECT room_id, night, reservation_id FROM nights ORDER BY reservation_id, night;
+
+SELECT r.reservation_id, r.room_id, r.check_in_date, r.check_out_date
+FROM RESERVATIONS r
+LEFT JOIN ROOM_NIGHTS n ON n.reservation_id = r.reservation_id
+GROUP BY r.reservation_id, r.room_id, r.check_in_date, r.check_out_date
+HAVING COUNT(n.night) < DATEDIFF(r.check_out_date, r.check_in_date);
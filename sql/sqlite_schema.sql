@@ -0,0 +1,146 @@
+-- Esquema completo para el motor SQLite (DB_BACKEND=sqlite).
+--
+-- Equivale al de MySQL mas las migraciones 001 y 002: updated_at con su
+-- trigger, lapidas de borrados y el inventario por noche. sqlite_backend.py
+-- lo ejecuta al abrir la BD; todo es IF NOT EXISTS, asi que correrlo de nuevo
+-- no cambia nada.
+--
+-- updated_at se guarda como texto 'AAAA-MM-DD HH:MM:SS.ffffff' en UTC, el
+-- mismo formato con el que se envian los datetime como parametro, para que
+-- las comparaciones de texto respeten el orden cronologico.
+
+CREATE TABLE IF NOT EXISTS ROOMS (
+    room_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_number VARCHAR(10) NOT NULL,
+    room_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'Available',
+    cost_per_night REAL NOT NULL DEFAULT 0,
+    description TEXT,
+    updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')
+);
+CREATE INDEX IF NOT EXISTS idx_rooms_updated_at ON ROOMS (updated_at);
+
+CREATE TABLE IF NOT EXISTS SERVICES (
+    service_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL,
+    cost REAL NOT NULL DEFAULT 0,
+    description TEXT,
+    updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')
+);
+CREATE INDEX IF NOT EXISTS idx_services_updated_at ON SERVICES (updated_at);
+
+CREATE TABLE IF NOT EXISTS CUSTOMERS (
+    customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name VARCHAR(50) NOT NULL,
+    second_name VARCHAR(50),
+    last_name VARCHAR(50) NOT NULL,
+    second_last_name VARCHAR(50),
+    phone VARCHAR(20),
+    email VARCHAR(100) NOT NULL UNIQUE,
+    state VARCHAR(50),
+    curp VARCHAR(18),
+    password_hash VARCHAR(255),
+    updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')
+);
+CREATE INDEX IF NOT EXISTS idx_customers_updated_at ON CUSTOMERS (updated_at);
+
+CREATE TABLE IF NOT EXISTS EMPLOYEES (
+    employee_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name VARCHAR(50) NOT NULL,
+    second_name VARCHAR(50),
+    last_name VARCHAR(50) NOT NULL,
+    second_last_name VARCHAR(50),
+    phone VARCHAR(20),
+    email VARCHAR(100) NOT NULL UNIQUE,
+    curp VARCHAR(18),
+    password_hash VARCHAR(255),
+    status VARCHAR(20),
+    role VARCHAR(20) NOT NULL DEFAULT 'Employee',
+    updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')
+);
+CREATE INDEX IF NOT EXISTS idx_employees_updated_at ON EMPLOYEES (updated_at);
+
+CREATE TABLE IF NOT EXISTS PAYMENTS (
+    payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    amount REAL NOT NULL,
+    payment_method VARCHAR(20) NOT NULL,
+    payment_date DATE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS RESERVATIONS (
+    reservation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    customer_id INTEGER NOT NULL REFERENCES CUSTOMERS (customer_id),
+    room_id INTEGER NOT NULL REFERENCES ROOMS (room_id),
+    check_in_date DATE NOT NULL,
+    check_out_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'Confirmed',
+    total_cost REAL,
+    payment_id INTEGER REFERENCES PAYMENTS (payment_id),
+    updated_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_customer ON RESERVATIONS (customer_id);
+CREATE INDEX IF NOT EXISTS idx_reservations_room ON RESERVATIONS (room_id);
+CREATE INDEX IF NOT EXISTS idx_reservations_updated_at ON RESERVATIONS (updated_at);
+
+CREATE TABLE IF NOT EXISTS ROOM_NIGHTS (
+    room_id INTEGER NOT NULL REFERENCES ROOMS (room_id),
+    night DATE NOT NULL,
+    reservation_id INTEGER NOT NULL REFERENCES RESERVATIONS (reservation_id) ON DELETE CASCADE,
+    PRIMARY KEY (room_id, night)
+);
+CREATE INDEX IF NOT EXISTS idx_room_nights_reservation ON ROOM_NIGHTS (reservation_id);
+
+CREATE TABLE IF NOT EXISTS CHANGE_TOMBSTONES (
+    tombstone_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name VARCHAR(32) NOT NULL,
+    row_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')
+);
+CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON CHANGE_TOMBSTONES (deleted_at);
+
+-- SQLite no tiene ON UPDATE CURRENT_TIMESTAMP: un trigger renueva updated_at
+-- salvo que la misma sentencia ya lo haya cambiado.
+CREATE TRIGGER IF NOT EXISTS trg_rooms_updated_at AFTER UPDATE ON ROOMS
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE ROOMS SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' WHERE room_id = NEW.room_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_services_updated_at AFTER UPDATE ON SERVICES
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE SERVICES SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' WHERE service_id = NEW.service_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_customers_updated_at AFTER UPDATE ON CUSTOMERS
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE CUSTOMERS SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' WHERE customer_id = NEW.customer_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_employees_updated_at AFTER UPDATE ON EMPLOYEES
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE EMPLOYEES SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' WHERE employee_id = NEW.employee_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservations_updated_at AFTER UPDATE ON RESERVATIONS
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE RESERVATIONS SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') || '000' WHERE reservation_id = NEW.reservation_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rooms_tombstone AFTER DELETE ON ROOMS
+    FOR EACH ROW BEGIN INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('ROOMS', OLD.room_id); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_services_tombstone AFTER DELETE ON SERVICES
+    FOR EACH ROW BEGIN INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('SERVICES', OLD.service_id); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_customers_tombstone AFTER DELETE ON CUSTOMERS
+    FOR EACH ROW BEGIN INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('CUSTOMERS', OLD.customer_id); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_employees_tombstone AFTER DELETE ON EMPLOYEES
+    FOR EACH ROW BEGIN INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('EMPLOYEES', OLD.employee_id); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservations_tombstone AFTER DELETE ON RESERVATIONS
+    FOR EACH ROW BEGIN INSERT INTO CHANGE_TOMBSTONES (table_name, row_id) VALUES ('RESERVATIONS', OLD.reservation_id); END;
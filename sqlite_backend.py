@@ -0,0 +1,263 @@
+"""
+Motor SQLite para los DAOs (DB_BACKEND=sqlite en mysql_env.py).
+
+La BD vive en un archivo local y corre dentro del proceso: sin servidor ni
+viaje por la red. Sirve para una sola terminal y como BD desechable en
+pruebas y benchmarks (SQLITE_PATH=":memory:").
+
+Los DAOs no cambian: SQLiteConnection y SQLiteCursor exponen el mismo
+subconjunto de mysql.connector que usan (cursor, execute con %s, executemany,
+lastrowid, commit/rollback) y traducen los errores de sqlite3 a los de
+mysql.connector con su errno, asi que los `except mysql.connector.Error`
+siguen funcionando y un empalme en ROOM_NIGHTS sigue siendo ER_DUP_ENTRY.
+"""
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+from mysql.connector import errorcode, errors
+from mysql_env import SQLITE_PATH, POOL_TIMEOUT
+
+log = logging.getLogger(__name__)
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "sqlite_schema.sql")
+# Nombre de la BD en memoria compartida entre las conexiones del proceso.
+MEMORY_URI = "file:hotel_le_villa_memdb?mode=memory&cache=shared"
+
+# Prefijo del mensaje de sqlite3.IntegrityError -> errno equivalente de MySQL.
+INTEGRITY_ERRNOS = (
+    ("UNIQUE", errorcode.ER_DUP_ENTRY),
+    ("FOREIGN KEY", errorcode.ER_NO_REFERENCED_ROW_2),
+    ("NOT NULL", errorcode.ER_BAD_NULL_ERROR),
+)
+
+
+def _timestamp(value):
+    # Mismo formato que el DEFAULT de updated_at en el esquema: siempre seis decimales.
+    return value.isoformat(' ', 'microseconds')
+
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, _timestamp)
+sqlite3.register_converter("DATE", lambda raw: date.fromisoformat(raw.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda raw: datetime.fromisoformat(raw.decode()))
+
+
+def _to_days(value):
+    """TO_DAYS de MySQL: dias desde el anio 0 (date(1, 1, 1) es 366)."""
+    if value is None:
+        return None
+    if not isinstance(value, date):
+        value = date.fromisoformat(str(value)[:10])
+    return value.toordinal() + 365
+
+
+def _concat_ws(separator, *values):
+    return separator.join(str(value) for value in values if value is not None)
+
+
+def _now(precision=0):
+    return _timestamp(datetime.now(timezone.utc).replace(tzinfo=None))
+
+
+@lru_cache(maxsize=256)
+def to_qmark(query):
+    """Cambia los marcadores %s de mysql.connector por los ? de sqlite3."""
+    return query.replace("%%", "\0").replace("%s", "?").replace("\0", "%")
+
+
+def translate_error(err):
+    """Excepcion de mysql.connector equivalente a un sqlite3.Error."""
+    message = str(err)
+    if isinstance(err, sqlite3.IntegrityError):
+        errno = next((code for prefix, code in INTEGRITY_ERRNOS if message.startswith(prefix)), None)
+        return errors.IntegrityError(msg=message, errno=errno)
+    if isinstance(err, sqlite3.OperationalError):
+        return errors.OperationalError(msg=message)
+    if isinstance(err, sqlite3.ProgrammingError):
+        return errors.ProgrammingError(msg=message)
+    return errors.DatabaseError(msg=message)
+
+
+@contextmanager
+def _translated():
+    try:
+        yield
+    except sqlite3.Error as err:
+        raise translate_error(err) from err
+
+
+class SQLiteCursor:
+    """Cursor de sqlite3 con la interfaz de mysql.connector que usan los DAOs."""
+
+    def __init__(self, raw_cursor):
+        self._cursor = raw_cursor
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def execute(self, query, values=()):
+        with _translated():
+            self._cursor.execute(to_qmark(query), tuple(values or ()))
+        self.lastrowid = self._cursor.lastrowid
+        self.rowcount = self._cursor.rowcount
+        return self
+
+    def executemany(self, query, seq_values):
+        """
+        Como el INSERT multi-fila de MySQL: lastrowid es el id de la PRIMERA fila.
+        Dentro de la transaccion nadie mas escribe, asi que los ids son consecutivos.
+        """
+        query = to_qmark(query)
+        first_id = None
+        rowcount = 0
+        with _translated():
+            for values in seq_values:
+                self._cursor.execute(query, tuple(values))
+                if first_id is None:
+                    first_id = self._cursor.lastrowid
+                rowcount += max(self._cursor.rowcount, 0)
+        self.lastrowid = first_id
+        self.rowcount = rowcount
+        return self
+
+    def fetchone(self):
+        with _translated():
+            return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        with _translated():
+            return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        with _translated():
+            return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class SQLiteConnection:
+    """Conexion de sqlite3 vista como una conexion prestada de mysql.connector."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self, buffered=None, prepared=False, **kwargs):
+        # sqlite3 ya lee por pasos y guarda sus sentencias compiladas; buffered/prepared no aplican.
+        with _translated():
+            return SQLiteCursor(self._raw.cursor())
+
+    def commit(self):
+        with _translated():
+            self._raw.commit()
+
+    def rollback(self):
+        with _translated():
+            self._raw.rollback()
+
+    def consume_results(self):
+        pass
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        with _translated():
+            self._raw.execute("SELECT 1").fetchone()
+
+    def close(self):
+        self._raw.close()
+
+
+class SQLiteDatabase:
+    """
+    Conexiones a la BD SQLite, con la misma interfaz de clase que DBConnection
+    (acquire/release/warm_up). Las conexiones devueltas se guardan para el
+    siguiente prestamo; SQLite admite varios lectores y serializa escrituras,
+    asi que no hace falta un limite como el del pool de MySQL.
+    """
+    path = SQLITE_PATH
+    _idle = []
+    _anchor = None
+    _bootstrapped = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, path):
+        """Cambia el archivo (o ":memory:") y cierra las conexiones del anterior."""
+        cls.reset()
+        cls.path = path
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            for conn in cls._idle:
+                conn.close()
+            cls._idle = []
+            if cls._anchor is not None:
+                cls._anchor.close()
+                cls._anchor = None
+            cls._bootstrapped = False
+
+    @classmethod
+    def _connect(cls, timeout):
+        memory = cls.path == ":memory:"
+        raw = sqlite3.connect(MEMORY_URI if memory else cls.path, timeout=timeout, uri=memory,
+                              detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        raw.execute("PRAGMA foreign_keys = ON")
+        if not memory:
+            raw.execute("PRAGMA journal_mode = WAL")
+        raw.create_function("TO_DAYS", 1, _to_days, deterministic=True)
+        raw.create_function("CONCAT_WS", -1, _concat_ws, deterministic=True)
+        raw.create_function("NOW", -1, _now)
+        return raw
+
+    @classmethod
+    def bootstrap(cls, raw):
+        """Crea las tablas que falten; se ejecuta una vez por proceso."""
+        with open(SCHEMA_PATH, encoding='utf-8') as stream:
+            raw.executescript(stream.read())
+        cls._bootstrapped = True
+
+    @classmethod
+    def acquire(cls, timeout=None):
+        timeout = POOL_TIMEOUT if timeout is None else timeout
+        with cls._lock:
+            if cls._idle:
+                return cls._idle.pop()
+            raw = cls._connect(timeout)
+            if cls.path == ":memory:" and cls._anchor is None:
+                # La BD en memoria desaparece al cerrarse su ultima conexion.
+                cls._anchor = cls._connect(timeout)
+            if not cls._bootstrapped:
+                cls.bootstrap(raw)
+        return SQLiteConnection(raw)
+
+    @classmethod
+    def release(cls, connection):
+        try:
+            # Una transaccion olvidada no debe pasar al siguiente prestamo.
+            connection.rollback()
+        except errors.Error:
+            connection.close()
+            return
+        with cls._lock:
+            cls._idle.append(connection)
+
+    @classmethod
+    def warm_up(cls):
+        conn = cls.acquire()
+        try:
+            conn.ping()
+        finally:
+            cls.release(conn)
+        log.info("BD SQLite lista en %s.", cls.path)
+        return 1
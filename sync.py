@@ -0,0 +1,148 @@
+import logging
+from datetime import timedelta
+
+from customer import Customer
+from employee import Employee
+from reservation import Reservation
+from room import Room
+from service import Service
+from dao.identity_map import IdentityMap, MERGE_FIELDS, merge
+from mysql_env import SYNC_OVERLAP
+
+log = logging.getLogger(__name__)
+
+# Tabla de CHANGE_TOMBSTONES -> tipo de entidad.
+TABLE_KINDS = {
+    'ROOMS': Room,
+    'SERVICES': Service,
+    'CUSTOMERS': Customer,
+    'EMPLOYEES': Employee,
+    'RESERVATIONS': Reservation,
+}
+
+# Habitaciones antes que reservas, para que una reserva nueva encuentre su habitacion.
+APPLY_ORDER = (Room, Service, Customer, Employee, Reservation)
+
+
+class ChangeSet:
+    """Cambios traidos del servidor: entidades modificadas y ids borrados por tipo."""
+
+    def __init__(self, watermark):
+        self.watermark = watermark
+        self.changed = {}
+        self.deleted = {}
+
+    def __len__(self):
+        return sum(map(len, self.changed.values())) + sum(map(len, self.deleted.values()))
+
+
+class DeltaSync:
+    """
+    Sincronizacion incremental de HotelGUI.data con la BD.
+
+    fetch() (en segundo plano) pide a cada DAO solo las filas con updated_at
+    posterior a la marca de agua, mas las lapidas de borrados. apply() (en el
+    hilo de la GUI) los aplica sobre las instancias ya cargadas, los catalogos
+    en memoria y el indice de disponibilidad.
+
+    Cada consulta retrocede `overlap` segundos: una transaccion que confirmo
+    tarde pudo dejar un updated_at anterior a la ultima marca. Aplicar una fila
+    dos veces no cambia nada.
+    """
+
+    def __init__(self, daos, change_log_dao, watermark=None, overlap=SYNC_OVERLAP):
+        self._daos = daos
+        self._change_log = change_log_dao
+        self.watermark = watermark
+        self.overlap = timedelta(seconds=overlap)
+        self.enabled = True
+
+    def start(self):
+        """
+        Toma la hora del servidor como punto de partida; llamar antes de la carga
+        inicial. Si la BD no tiene el esquema de cambios la sincronizacion queda
+        desactivada (enabled = False) y devuelve None.
+        """
+        if not self._change_log.has_change_tracking():
+            if self.enabled:
+                log.warning("La BD no tiene updated_at ni CHANGE_TOMBSTONES; aplique sql/001_change_tracking.sql "
+                            "para sincronizar entre terminales. Sincronizacion incremental desactivada.")
+            self.enabled = False
+            return None
+        self.watermark = self._change_log.server_time()
+        return self.watermark
+
+    def fetch(self):
+        """
+        Cambios desde la marca de agua. Si falla alguna tabla falla todo y la
+        marca no avanza, asi que el siguiente intento vuelve a pedir lo mismo.
+        """
+        if self.watermark is None:
+            # start() fallo al arrancar (BD caida): se toma la marca ahora y se sincroniza desde aqui.
+            return ChangeSet(self.start())
+        since = self.watermark - self.overlap
+        changes = ChangeSet(self.watermark)
+        for kind, dao in self._daos.items():
+            entities, watermark = dao.get_changed_since(since)
+            if entities:
+                changes.changed[kind] = entities
+            changes.watermark = max(changes.watermark, watermark)
+
+        tombstones, watermark = self._change_log.get_tombstones_since(since)
+        for table_name, row_id in tombstones:
+            kind = TABLE_KINDS.get(table_name)
+            if kind is not None:
+                changes.deleted.setdefault(kind, []).append(row_id)
+        changes.watermark = max(changes.watermark, watermark)
+        return changes
+
+    def apply(self, changes, data, availability):
+        """Aplica un ChangeSet; devuelve cuantos cambios trajo."""
+        identity = IdentityMap.get_instance()
+        for kind in APPLY_ORDER:
+            for fresh in changes.changed.get(kind, ()):
+                current = identity.get(kind, fresh.getId())
+                if current is not None:
+                    previous_customer = current.getCustomer() if kind is Reservation else None
+                    merge(current, fresh, MERGE_FIELDS[kind])
+                else:
+                    current = identity.add(kind, fresh.getId(), fresh)
+                    previous_customer = None
+                self._apply_changed(kind, current, previous_customer, data, availability)
+
+            for entity_id in changes.deleted.get(kind, ()):
+                self._apply_deleted(kind, entity_id, identity.get(kind, entity_id), data, availability)
+                identity.discard(kind, entity_id)
+
+        if changes.watermark is not None:
+            self.watermark = changes.watermark if self.watermark is None else max(self.watermark, changes.watermark)
+        return len(changes)
+
+    def _apply_changed(self, kind, entity, previous_customer, data, availability):
+        if kind is Room:
+            data['rooms'][entity.getId()] = entity
+            availability.add_room(entity)
+        elif kind is Service:
+            data['services'][entity.getId()] = entity
+        elif kind is Reservation:
+            if previous_customer is not None and previous_customer is not entity.getCustomer():
+                previous_customer.unlinkReservation(entity.getId())
+            entity.getCustomer().linkReservation(entity)
+            data['reservations'][entity.getId()] = entity
+            availability.add(entity)
+
+    def _apply_deleted(self, kind, entity_id, loaded, data, availability):
+        if kind is Room:
+            data['rooms'].pop(entity_id, None)
+            availability.remove_room(entity_id)
+        elif kind is Service:
+            data['services'].pop(entity_id, None)
+        elif kind is Reservation:
+            availability.remove(entity_id)
+            if loaded is not None:
+                loaded.getCustomer().unlinkReservation(entity_id)
+            del data['reservations'][entity_id]
+        elif loaded is not None:
+            # Clientes y empleados se cargan bajo demanda, indexados por email.
+            repository = data['customers' if kind is Customer else 'employees']
+            del repository[loaded.getEmail()]
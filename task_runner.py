@@ -0,0 +1,177 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from mysql_env import POOL_SIZE
+
+POLL_MS = 50
+
+log = logging.getLogger(__name__)
+
+
+class Task:
+    """Trabajo enviado al runner; cancel() evita que su resultado llegue a la interfaz."""
+
+    def __init__(self, future, on_success, on_error, owner, quiet=False, lock=(), cancellable=True):
+        self.future = future
+        self.on_success = on_success
+        self.on_error = on_error
+        self.owner = owner
+        self.quiet = quiet
+        self.lock = tuple(lock)
+        self.cancellable = cancellable
+        self.cancelled = False
+        # Escritura ya en curso cuya ventana se cerro: su resultado va al runner, no a la ventana.
+        self.orphaned = False
+
+    def cancel(self):
+        # Si ya empezo no se puede interrumpir la consulta, pero su resultado se descarta.
+        self.cancelled = True
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+
+class TaskRunner:
+    """
+    Ejecuta llamadas a los DAOs en hilos de fondo y entrega los resultados en
+    el hilo de Tk sondeando con master.after(), porque Tk no admite que otros
+    hilos toquen los widgets.
+    """
+
+    def __init__(self, master, max_workers=POOL_SIZE, poll_ms=POLL_MS, on_busy_change=None, on_orphan=None):
+        self._master = master
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dao-worker")
+        self._poll_ms = poll_ms
+        self._on_busy_change = on_busy_change
+        # on_orphan(error) avisa como termino una escritura cuya ventana ya no existe (error None si se guardo).
+        self._on_orphan = on_orphan
+        self._pending = []
+        self._polling = False
+
+    @property
+    def busy(self):
+        return any(not task.quiet and not task.cancelled for task in self._pending)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, owner=None, quiet=False, lock=(),
+               cancellable=True, **kwargs):
+        """
+        Corre fn(*args, **kwargs) en segundo plano. on_success(resultado) u
+        on_error(excepcion) se llaman despues en el hilo de la interfaz, salvo que
+        la tarea se cancele o su ventana `owner` ya se haya cerrado. Las tareas
+        `quiet` (p. ej. la sincronizacion periodica) no muestran el indicador de ocupado.
+
+        Los widgets de `lock` (el boton que envia) quedan deshabilitados hasta
+        que la tarea termina o se cancela, asi que un doble clic no la repite.
+        Las escrituras van con cancellable=False: cancel_all() y el cierre de su
+        ventana solo las quitan si aun no empezaron, porque una vez en la BD
+        descartar su resultado mentiria; si la ventana ya no esta, el resultado
+        se entrega a on_orphan.
+        """
+        task = Task(self._executor.submit(fn, *args, **kwargs), on_success, on_error, owner, quiet, lock, cancellable)
+        _set_state(task.lock, 'disabled')
+        was_busy = self.busy
+        self._pending.append(task)
+        if not was_busy and not quiet and self._on_busy_change:
+            self._on_busy_change(True)
+        if not self._polling:
+            self._polling = True
+            self._master.after(self._poll_ms, self._poll)
+        return task
+
+    def cancel_owner(self, owner):
+        for task in self._pending:
+            if task.owner is owner and not task.cancelled:
+                self._detach(task)
+
+    def cancel_all(self):
+        """Boton Cancelar de la interfaz: las tareas visibles dejan de esperarse."""
+        was_busy = self.busy
+        for task in self._pending:
+            if task.quiet or task.cancelled:
+                continue
+            if task.cancellable or task.future.cancel():
+                task.cancel()
+                self._unlock(task)
+        if was_busy and not self.busy and self._on_busy_change:
+            self._on_busy_change(False)
+
+    def _detach(self, task):
+        """La ventana de la tarea se cerro: se cancela, salvo una escritura que ya empezo."""
+        if task.cancellable or task.future.cancel():
+            task.cancel()
+        else:
+            task.orphaned = True
+        self._unlock(task)
+
+    @staticmethod
+    def _unlock(task):
+        _set_state(task.lock, 'normal')
+        task.lock = ()
+
+    def _poll(self):
+        was_busy = self.busy
+        still_pending = []
+        finished = []
+        for task in self._pending:
+            if not task.cancelled and not task.orphaned and not _alive(task.owner):
+                self._detach(task)
+            if task.cancelled:
+                self._unlock(task)
+                if task.future.running():
+                    still_pending.append(task)
+            elif task.done():
+                finished.append(task)
+            else:
+                still_pending.append(task)
+        self._pending = still_pending
+
+        for task in finished:
+            self._unlock(task)
+            self._deliver(task)
+
+        if was_busy and not self.busy and self._on_busy_change:
+            self._on_busy_change(False)
+        if self._pending:
+            self._master.after(self._poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, task):
+        error = task.future.exception()
+        if task.orphaned:
+            if self._on_orphan:
+                self._on_orphan(error)
+            elif error is not None:
+                log.error("Escritura en segundo plano fallo tras cerrar su ventana: %s", error)
+            return
+        if error is not None:
+            if task.on_error:
+                task.on_error(error)
+            else:
+                log.error("Tarea en segundo plano fallo: %s", error)
+        elif task.on_success:
+            task.on_success(task.future.result())
+
+    def shutdown(self):
+        for task in self._pending:
+            task.cancel()
+        self._executor.shutdown(wait=False)
+
+
+def _set_state(widgets, state):
+    for widget in widgets:
+        try:
+            widget.config(state=state)
+        except Exception:
+            # La ventana del widget ya se cerro.
+            pass
+
+
+def _alive(owner):
+    if owner is None:
+        return True
+    try:
+        return bool(owner.winfo_exists())
+    except Exception:
+        return False
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from booking_client import BookingClient, load_remote_data
+from booking_server import BookingServer
+from booking_service import BookingService
+from customer import Customer
+from room import Room
+from service import Service
+from sqlite_backend import SQLiteDatabase
+from dao.customer_dao import CustomerDAO
+from dao.identity_map import IdentityMap
+from dao.reservation_dao import RoomNotAvailableError
+from dao.room_dao import RoomDAO
+from dao.ServiceDAO import ServiceDAO
+from dao.statement_cache import StatementCache
+
+
+def day(offset):
+    # Fechas dentro del calendario de tarifas, que empieza hoy.
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+# El servicio y su API HTTP contra una BD SQLite en memoria.
+class TestBookingService(unittest.TestCase):
+
+    def setUp(self):
+        backend = patch('db_connection.DB_BACKEND', 'sqlite')
+        backend.start()
+        self.addCleanup(backend.stop)
+        SQLiteDatabase.configure(":memory:")
+        IdentityMap.reset()
+        StatementCache.reset()
+        ServiceDAO.cache.clear()
+        RoomDAO().create_many([Room(0, "101", "Sencilla", "Available", 100.0, ""),
+                               Room(0, "201", "Suite", "Available", 300.0, "")])
+        ServiceDAO().create(Service(0, "Spa", 50.0, ""))
+        CustomerDAO().create(Customer(0, "Ana", "", "Lopez", "", "1", "ana@mail.com", "Qro", "CURP", "x"))
+        self.service = BookingService.from_db()
+
+    def tearDown(self):
+        SQLiteDatabase.reset()
+
+    def test_01_book_updates_availability(self):
+        self.assertEqual([r['room_number'] for r in self.service.available_rooms(day(10), day(12))], ["101", "201"])
+        result = self.service.book("ana@mail.com", 1, day(10), day(12), "Tarjeta", service_id=1)
+        self.assertEqual(result['quote']['total'], 250.0)
+        self.assertEqual(self.service.reservation(result['reservation_id'])['payment_id'], result['payment_id'])
+        self.assertEqual([r['room_number'] for r in self.service.available_rooms(day(11), day(13))], ["201"])
+        with self.assertRaises(RoomNotAvailableError):
+            self.service.book("ana@mail.com", 1, day(11), day(13), "Tarjeta")
+
+    def test_02_invalid_requests(self):
+        with self.assertRaises(LookupError):
+            self.service.customer("nadie@mail.com")
+        with self.assertRaises(ValueError):
+            self.service.quote(1, day(12), day(10))
+        with self.assertRaises(ValueError):
+            self.service.book_service("ana@mail.com", 1, "manana", "Efectivo")
+
+    def test_03_registration_list_and_occupancy(self):
+        registered = self.service.register_customer("Luis", "Diaz", "luis@mail.com", "y", phone="2")
+        self.assertEqual(self.service.customer("luis@mail.com")['customer_id'], registered['customer_id'])
+        with self.assertRaises(ValueError):
+            self.service.register_customer("Otro", "Diaz", "luis@mail.com", "y")
+        employee = self.service.register_employee("Botones", "Eva", "Ruiz", "eva@hotel.com", "z")
+        self.assertEqual(self.service.login("Employee", "eva@hotel.com", "z")['employee_id'], employee['employee_id'])
+        with self.assertRaises(ValueError):
+            self.service.register_employee("Gerente", "Eva", "Ruiz", "otra@hotel.com", "z")
+
+        self.assertEqual(self.service.occupancy(day(10), day(12))[-1]['rooms_sold'], 0)
+        booked = self.service.book("luis@mail.com", 2, day(10), day(12), "Tarjeta")
+        summary = {row['room_type']: row for row in self.service.occupancy(day(10), day(12))}
+        self.assertEqual((summary['Suite']['rooms_sold'], summary['Suite']['revenue']), (2, 600.0))
+        self.assertEqual([row[0] for row in self.service.get_summary_page()], [booked['reservation_id']])
+        self.service.cancel_reservation(booked['reservation_id'])
+        self.assertEqual(self.service.occupancy(day(10), day(12))[-1]['rooms_sold'], 0)
+
+    def test_04_http_api(self):
+        server = BookingServer(self.service, "127.0.0.1", 0, workers=2)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        client = BookingClient(f"http://127.0.0.1:{server.port}")
+        try:
+            self.assertEqual(client.customer("ana@mail.com")['name'], "Ana")
+            self.assertNotIn('password', client.customer("ana@mail.com"))
+            self.assertEqual(client.search_customers("LÓP")[0]['email'], "ana@mail.com")
+            self.assertEqual(client.room_types(), ["Sencilla", "Suite"])
+            booked = client.book("ana@mail.com", 2, day(20), day(21), "Efectivo")
+            self.assertEqual(client.reservation(booked['reservation_id'])['room_number'], "201")
+            with self.assertRaises(RoomNotAvailableError):
+                client.book("ana@mail.com", 2, day(20), day(22), "Efectivo")
+            with self.assertRaises(LookupError):
+                client.reservation(999)
+            with self.assertRaises(ValueError):
+                client.available_rooms(day(20), "mayo")
+            self.assertEqual(client.book_service("ana@mail.com", 1, day(20) + " 10:00", "Efectivo")['total'], 50.0)
+
+            # Cliente ligero: catalogos, acceso y bajas pasan por el servicio.
+            data = load_remote_data(client)
+            self.assertEqual([room.getRoomNumber() for room in data['rooms'].values()], ["101", "201"])
+            self.assertEqual(data['services'][1].getType(), "Spa")
+            self.assertEqual(client.login("Customer", "ana@mail.com", "x")['customer_id'], 1)
+            self.assertNotIn('password', client.login("Customer", "ana@mail.com", "x"))
+            with self.assertRaises(LookupError):
+                client.login("Customer", "ana@mail.com", "otra")
+            client.cancel_reservation(booked['reservation_id'])
+            self.assertEqual(client.book("ana@mail.com", 2, day(20), day(22), "Efectivo")['room_id'], 2)
+            with self.assertRaises(LookupError):
+                client.cancel_reservation(999)
+
+            # Listado paginado, reporte de ocupacion y registros tambien pasan por el servicio.
+            client.book("ana@mail.com", 1, day(23), day(24), "Efectivo")
+            first = client.get_summary_page('cost', limit=1)
+            self.assertEqual(first[0][5], 100.0)
+            self.assertEqual(client.get_summary_page('cost', after=(first[0][5], first[0][0]))[0][5], 600.0)
+            self.assertEqual(client.occupancy(day(20), day(22))[-1]['rooms_sold'], 2)
+            with self.assertRaises(ValueError):
+                client.occupancy(day(22), day(20))
+            self.assertEqual(client.register_customer("Luis", "Diaz", "luis@mail.com", "y")['email'], "luis@mail.com")
+            self.assertEqual(client.login("Customer", "luis@mail.com", "y")['name'], "Luis")
+            with self.assertRaises(ValueError):
+                client.register_customer("Luis", "Diaz", "luis@mail.com", "y")
+            self.assertIn('employee_id', client.register_employee("Recepcionista", "Eva", "Ruiz", "eva@hotel.com", "z"))
+        finally:
+            client.close()
+            asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
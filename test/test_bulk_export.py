@@ -0,0 +1,68 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from bulk_export import export_file, export_reservations, split_path
+from customer import Customer
+from reservation import Reservation
+from room import Room
+from sqlite_backend import SQLiteDatabase
+from dao.customer_dao import CustomerDAO
+from dao.identity_map import IdentityMap
+from dao.reservation_dao import ReservationDAO
+from dao.room_dao import RoomDAO
+from dao.statement_cache import StatementCache
+
+
+# Exportacion contra una BD SQLite en memoria.
+class TestBulkExport(unittest.TestCase):
+
+    def setUp(self):
+        backend = patch('db_connection.DB_BACKEND', 'sqlite')
+        backend.start()
+        self.addCleanup(backend.stop)
+        SQLiteDatabase.configure(":memory:")
+        self.addCleanup(SQLiteDatabase.reset)
+        IdentityMap.reset()
+        StatementCache.reset()
+        room = Room(0, "101", "Sencilla", "Available", 120.0, "")
+        customer = Customer(0, "Ana", "", "Lopez", "", "1", "ana@mail.com", "Qro", "CURP", "secreto")
+        RoomDAO().create(room)
+        CustomerDAO().create(customer)
+        for check_in, check_out in (("2025-03-01", "2025-03-03"), ("2025-04-01", "2025-04-02")):
+            ReservationDAO().create(Reservation(None, check_in, check_out, customer, room), 120.0)
+
+    def test_split_path(self):
+        self.assertEqual(split_path("reservas.csv.gz")[0], "csv")
+        self.assertEqual(split_path("reservas.ndjson.xz")[0], "ndjson")
+        self.assertIsNone(split_path("reservas.csv")[1])
+
+    def test_csv_with_columns_and_range(self):
+        out = io.StringIO()
+        count = export_reservations(out, "csv", ['reservation_id', 'check_in', 'nights', 'customer_email'],
+                                    start=date(2025, 3, 1), end=date(2025, 4, 1))
+        self.assertEqual(count, 1)
+        self.assertEqual(out.getvalue().splitlines(), ["reservation_id,check_in,nights,customer_email",
+                                                       "1,2025-03-01,2,ana@mail.com"])
+
+    def test_compressed_ndjson_never_has_password(self):
+        with self.assertRaises(ValueError):
+            export_reservations(io.StringIO(), "csv", ['reservation_id', 'password_hash'])
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "reservas.ndjson.gz")
+            self.assertEqual(export_file(path, columns=list(ReservationDAO.EXPORT_COLUMNS)), 2)
+            with gzip.open(path, 'rt', encoding='utf-8') as stream:
+                text = stream.read()
+        rows = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([(row['reservation_id'], row['total_cost'], row['room_number']) for row in rows],
+                         [(1, 120.0, "101"), (2, 120.0, "101")])
+        self.assertNotIn("secreto", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+
+from bulk_import import Lookups, import_records, read_csv, read_ndjson, renamed
+from sqlite_backend import SQLiteDatabase
+from dao.customer_dao import CustomerDAO
+from dao.identity_map import IdentityMap
+from dao.reservation_dao import ReservationDAO
+from dao.statement_cache import StatementCache
+
+ROOMS_CSV = """room_number,room_type,status,cost_per_night,description
+101,Sencilla,Available,100,
+102,Doble,,150.5,Vista al jardin
+101,Suite,Available,300,
+103,Suite,Available,caro,
+"""
+
+CUSTOMERS_NDJSON = "\n".join(json.dumps(row) for row in [
+    {"nombre": "Andrea", "last_name": "Lopez", "email": "Andrea@Mail.com", "curp": "LOGA001122MQTRPN09"},
+    {"nombre": "Juan", "last_name": "Perez", "email": "juan@mail"},
+    {"nombre": "Ana", "last_name": "Ruiz", "email": "andrea@mail.com"},
+    {"nombre": "Luis", "last_name": "Vera", "email": "luis@mail.com", "curp": "PEVJ001122QRO"},
+    {"nombre": "Eva", "last_name": "Sol", "email": "eva@mail.com"},
+]) + "\n[1, 2]\n"
+
+RESERVATIONS_CSV = """email,room_number,check_in,check_out,total_cost
+andrea@mail.com,101,2025-03-01,2025-03-03,
+eva@mail.com,101,2025-03-02,2025-03-04,
+eva@mail.com,102,2025-03-05,2025-03-04,
+nadie@mail.com,102,2025-03-01,2025-03-02,
+eva@mail.com,999,2025-03-01,2025-03-02,
+eva@mail.com,102,2025-03-01,2025-03-02,99.5
+"""
+
+
+# Importacion contra una BD SQLite en memoria.
+class TestBulkImport(unittest.TestCase):
+
+    def setUp(self):
+        backend = patch('db_connection.DB_BACKEND', 'sqlite')
+        backend.start()
+        self.addCleanup(backend.stop)
+        SQLiteDatabase.configure(":memory:")
+        self.addCleanup(SQLiteDatabase.reset)
+        IdentityMap.reset()
+        StatementCache.reset()
+
+    def test_import_validates_and_resolves_keys(self):
+        lookups = Lookups()
+        rooms = import_records('rooms', read_csv(io.StringIO(ROOMS_CSV)), lookups)
+        self.assertEqual((rooms.inserted, rooms.rejected), (2, 2))
+        self.assertEqual([number for number, _ in rooms.errors], [3, 4])
+
+        sink = io.StringIO()
+        records = renamed(read_ndjson(io.StringIO(CUSTOMERS_NDJSON)), {'nombre': 'first_name'})
+        customers = import_records('customers', records, lookups, error_sink=sink)
+        self.assertEqual((customers.read, customers.inserted, customers.rejected), (6, 2, 4))
+        self.assertEqual(CustomerDAO().get_by_email("andrea@mail.com").getName(), "Andrea")
+        rejected = [json.loads(line) for line in sink.getvalue().splitlines()]
+        self.assertEqual([entry['record'] for entry in rejected], [2, 3, 4, 6])
+        self.assertIn("CURP", rejected[2]['error'])
+
+        # La segunda reserva choca con la primera en la noche del 2: su lote se reintenta uno por uno.
+        reservations = import_records('reservations', read_csv(io.StringIO(RESERVATIONS_CSV)), Lookups(), batch_size=10)
+        self.assertEqual((reservations.inserted, reservations.rejected), (2, 4))
+        self.assertEqual(sorted(number for number, _ in reservations.errors), [2, 3, 4, 5])
+        saved = sorted((r.getRoom().getRoomNumber(), r.getCheckIn(), r.getTotalCost()) for r in ReservationDAO().get_all())
+        self.assertEqual(saved, [("101", "2025-03-01", 200.0), ("102", "2025-03-01", 99.5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
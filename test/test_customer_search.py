@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import patch
+
+from booking_service import BookingService
+from customer import Customer
+from customer_search import CustomerSearchIndex
+from sqlite_backend import SQLiteDatabase
+from dao.customer_dao import CustomerDAO
+from dao.identity_map import IdentityMap
+from dao.ServiceDAO import ServiceDAO
+from dao.statement_cache import StatementCache
+
+
+def emails(results):
+    return [result['email'] for result in results]
+
+
+# Busqueda de clientes de recepcion: en memoria y alimentada por CustomerDAO.
+class TestCustomerSearch(unittest.TestCase):
+
+    def setUp(self):
+        backend = patch('db_connection.DB_BACKEND', 'sqlite')
+        backend.start()
+        self.addCleanup(backend.stop)
+        SQLiteDatabase.configure(":memory:")
+        IdentityMap.reset()
+        StatementCache.reset()
+        ServiceDAO.cache.clear()
+
+    def tearDown(self):
+        SQLiteDatabase.reset()
+
+    def test_01_prefix_accents_and_typos(self):
+        index = CustomerSearchIndex(watch=False)
+        index.add_rows([
+            (1, "María José", "", "Muñoz", "Pérez", "+52 442 123 4567", "mjmunoz@mail.com", "MUPM900101MQTXRR01"),
+            (2, "Mario", "", "Gonzalez", "Ruiz", "4429876543", "mario@mail.com", "GORM850505HQTXZR02"),
+            (3, "Ana", "", "Gonzalo", "Díaz", "5511112222", "ana.g@mail.com", "GODA920202MDFXZN03"),
+        ])
+        self.assertEqual(emails(index.search("munoz")), ["mjmunoz@mail.com"])
+        self.assertEqual(emails(index.search("MARÍA pér")), ["mjmunoz@mail.com"])
+        self.assertEqual(emails(index.search("442 123")), ["mjmunoz@mail.com"])
+        self.assertEqual(emails(index.search("gorm85")), ["mario@mail.com"])
+        self.assertEqual(emails(index.search("ana.g@")), ["ana.g@mail.com"])
+        # Exacto antes que prefijo, y con un error de dedo cuando nada empieza asi.
+        self.assertEqual(emails(index.search("gonzalo")), ["ana.g@mail.com"])
+        self.assertEqual(emails(index.search("gonza")), ["ana.g@mail.com", "mario@mail.com"])
+        self.assertEqual(emails(index.search("gonzales")), ["mario@mail.com"])
+        self.assertEqual(emails(index.search("mrio gonz")), ["mario@mail.com"])
+        index.remove(2)
+        self.assertEqual(index.search("gorm85"), [])
+        self.assertFalse(any("mario" in words for words in index._fuzzy.values()))
+        self.assertEqual(emails(index.search("mario")), ["mjmunoz@mail.com"])
+        self.assertEqual(index.search(""), [])
+
+    def test_02_new_customers_are_indexed(self):
+        CustomerDAO().create(Customer(0, "Renée", "", "Álvarez", "", "1", "renee@mail.com", "Qro", "CURP1", "x"))
+        service = BookingService.from_db()
+        self.assertEqual(emails(service.search_customers("alvarez")), ["renee@mail.com"])
+        self.assertNotIn('password', service.search_customers("renee")[0])
+
+        CustomerDAO().create(Customer(0, "Raúl", "", "Alvarado", "", "2", "raul@mail.com", "Qro", "CURP2", "x"))
+        CustomerDAO().create_many([Customer(0, "Rena", "", "Soto", "", "3", "rena@mail.com", "Qro", "CURP3", "x")])
+        self.assertEqual(emails(service.search_customers("alva")), ["raul@mail.com", "renee@mail.com"])
+        self.assertEqual(emails(service.search_customers("ren", limit=5)), ["rena@mail.com", "renee@mail.com"])
+
+
+if __name__ == '__main__':
+    unittest.main()
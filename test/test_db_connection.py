@@ -53,6 +53,24 @@ def test_connection_is_returned_to_pool(mock_db_pool):
     mock_conn.close.assert_called_once()
 
 
+def test_open_transaction_is_rolled_back_on_return(mock_db_pool):
+    """
+    Sin reinicio de sesion, la transaccion que dejo una lectura se revierte al
+    devolver la conexion para que el siguiente prestamo no lea una foto vieja.
+    """
+    reading = get_conn()
+    reading.in_transaction = True
+    close_conn(reading)
+    reading.rollback.assert_called_once()
+    reading.close.assert_called_once()
+
+    idle = get_conn()
+    idle.rollback.reset_mock()
+    idle.in_transaction = False
+    close_conn(idle)
+    idle.rollback.assert_not_called()
+
+
 def test_initialization_failure_raises_exception(mocker):
     """
     Prueba que si la inicialización del Pool falla (ej. DB caida o credenciales invalidas), 
@@ -69,4 +87,138 @@ def test_initialization_failure_raises_exception(mocker):
     )
 
     with pytest.raises(InterfaceError):
-        get_conn()
\ No newline at end of file
+        get_conn()
+
+def test_pool_metrics_track_checkout_hold_and_caller(mock_db_pool):
+    """
+    Verifica la instrumentacion del pool: cada prestamo queda registrado con el
+    metodo que lo pidio y al devolver la conexion se acumula el tiempo retenido.
+    """
+    DBConnection.metrics.reset()
+
+    def fake_dao_method():
+        conn = get_conn()
+        assert DBConnection.metrics.snapshot(pool_size=5)['active'] == 1
+        close_conn(conn)
+
+    fake_dao_method()
+
+    snap = DBConnection.metrics.snapshot(pool_size=5)
+    assert snap['checkouts'] == 1 and snap['returns'] == 1
+    assert snap['active'] == 0 and snap['idle'] == 5
+    callers = list(snap['hold_by_caller'])
+    assert len(callers) == 1 and callers[0].endswith('fake_dao_method')
+
+
+def test_pool_exhaustion_waits_until_deadline(mocker):
+    """
+    Con el pool agotado el llamador espera en fila hasta el plazo; al vencer se
+    cuenta el agotamiento y el timeout, y se propaga el PoolError.
+    """
+    from mysql.connector.errors import PoolError
+    DBConnection._instance = None
+    DBConnection.metrics.reset()
+    pool = mocker.MagicMock()
+    pool.get_connection.side_effect = PoolError("Failed getting connection; pool exhausted")
+    mocker.patch('db_connection.MySQLConnectionPool', return_value=pool)
+
+    with pytest.raises(PoolError):
+        get_conn(timeout=0.05)
+    snap = DBConnection.metrics.snapshot()
+    assert snap['exhaustion_events'] == 1 and snap['timeouts'] == 1
+
+
+def test_waiters_are_served_in_fifo_order(mocker):
+    """
+    Cuando se libera una conexion la recibe el primero que llego a la fila,
+    no el ultimo en pedirla.
+    """
+    import threading
+    import time
+    from mysql.connector.errors import PoolError
+    DBConnection._instance = None
+    free = []
+    pool = mocker.MagicMock()
+
+    def checkout():
+        if not free:
+            raise PoolError("Failed getting connection; pool exhausted")
+        return free.pop()
+    pool.get_connection.side_effect = checkout
+    mocker.patch('db_connection.MySQLConnectionPool', return_value=pool)
+
+    served = []
+    def worker(name):
+        get_conn(timeout=2)
+        served.append(name)
+
+    threads = []
+    for name in ("primero", "segundo"):
+        t = threading.Thread(target=worker, args=(name,))
+        t.start()
+        threads.append(t)
+        time.sleep(0.05)
+
+    for _ in threads:
+        free.append(mocker.MagicMock())
+        close_conn(mocker.MagicMock())
+        time.sleep(0.05)
+    for t in threads:
+        t.join(timeout=2)
+    assert served == ["primero", "segundo"]
+
+
+
+def test_slow_checkout_does_not_block_release(mocker):
+    """
+    Mientras un llamador espera a que el pool le entregue (y haga ping a) una
+    conexion, otro hilo puede devolver la suya sin quedarse esperando el candado.
+    """
+    import threading
+    import time
+    DBConnection._instance = None
+    entered, proceed = threading.Event(), threading.Event()
+    pool = mocker.MagicMock()
+
+    def slow_checkout():
+        entered.set()
+        proceed.wait(2)
+        return mocker.MagicMock()
+    pool.get_connection.side_effect = slow_checkout
+    mocker.patch('db_connection.MySQLConnectionPool', return_value=pool)
+
+    worker = threading.Thread(target=get_conn, kwargs={"timeout": 2})
+    worker.start()
+    assert entered.wait(2)
+    started = time.monotonic()
+    close_conn(mocker.MagicMock(in_transaction=False))
+    released_in = time.monotonic() - started
+    proceed.set()
+    worker.join(timeout=2)
+    assert released_in < 0.5
+
+def test_broken_connection_is_replaced_transparently(mocker):
+    """Si el pool entrega una conexion caida que no puede reabrir, se pide la siguiente."""
+    DBConnection._instance = None
+    good = mocker.MagicMock()
+    pool = mocker.MagicMock()
+    pool.get_connection.side_effect = [InterfaceError("Lost connection"), good]
+    mocker.patch('db_connection.MySQLConnectionPool', return_value=pool)
+
+    assert get_conn() is good
+
+
+def test_warm_up_counts_each_connection_once(mocker):
+    """El pool cuenta sus conexiones al crearse; el precalentamiento solo mide los pings."""
+    from mysql.connector.errors import PoolError
+    from mysql_env import POOL_SIZE
+    DBConnection._instance = None
+    DBConnection.metrics.reset()
+    pool = mocker.MagicMock()
+    pool.get_connection.side_effect = [mocker.MagicMock(in_transaction=False) for _ in range(POOL_SIZE)] + [PoolError("agotado")]
+    mocker.patch('db_connection.MySQLConnectionPool', return_value=pool)
+
+    assert DBConnection.warm_up() == POOL_SIZE
+    snapshot = DBConnection.metrics.snapshot()
+    assert snapshot['connections_created'] == POOL_SIZE
+    assert snapshot['pings'] == POOL_SIZE
@@ -0,0 +1,106 @@
+import json
+import logging
+import unittest
+from unittest.mock import MagicMock
+
+from dao import instrumentation
+from dao.instrumentation import JSONFormatter, instrumented, traced, untraced
+
+
+class FakeDAO:
+    def get_all(self):
+        return [1, 2, 3]
+
+    def create(self, value, session=None):
+        if session is None:
+            return self.create(value, session="sesion")
+        return 7
+
+    def iter_all(self):
+        yield from ("a", "b")
+
+    def fail(self):
+        raise ValueError("falla")
+
+    def _private(self):
+        return None
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.metrics = instrumentation.metrics
+        self.metrics.reset()
+        self.dao_class = instrumented(type("FakeDAO", (FakeDAO,), dict(vars(FakeDAO))))
+
+    def test_01_records_calls_rows_and_errors(self):
+        dao = self.dao_class()
+        dao.get_all()
+        dao.get_all()
+        self.assertEqual(dao.create(1), 7)
+        with self.assertRaises(ValueError):
+            dao.fail()
+        self.assertIsNone(dao._private())
+
+        snap = self.metrics.snapshot()
+        self.assertEqual((snap['FakeDAO.get_all']['calls'], snap['FakeDAO.get_all']['rows']), (2, 6))
+        # create se llama a si mismo con sesion: cuenta una vez.
+        self.assertEqual(snap['FakeDAO.create']['calls'], 1)
+        self.assertEqual(snap['FakeDAO.fail']['errors'], 1)
+        self.assertNotIn('FakeDAO._private', snap)
+        self.assertEqual(snap['FakeDAO.get_all']['p99_ms'], 1.0)
+
+    def test_02_generators_are_measured_until_exhausted(self):
+        rows = self.dao_class().iter_all()
+        self.assertEqual(self.metrics.snapshot(), {})
+        self.assertEqual(list(rows), ["a", "b"])
+        self.assertEqual(self.metrics.snapshot()['FakeDAO.iter_all']['rows'], 2)
+
+    def test_03_pool_wait_goes_to_the_running_method(self):
+        def get_all(dao):
+            instrumentation.record_pool_wait(0.25)
+            return []
+        dao_class = instrumented(type("WaitDAO", (), {'get_all': get_all}))
+        dao_class().get_all()
+        self.assertEqual(self.metrics.snapshot()['WaitDAO.get_all']['pool_wait_ms'], 250.0)
+
+    def test_04_slow_query_log_has_sql_and_params(self):
+        raw = MagicMock()
+        self.assertIs(traced(raw, threshold_ms=0), raw)
+
+        conn = traced(raw, threshold_ms=0.000001)
+        self.assertIs(untraced(conn), raw)
+        with self.assertLogs("hotel.slow_query", level="WARNING") as logs:
+            conn.cursor().execute("SELECT *\n   FROM ROOMS WHERE room_id = %s", (3,))
+        record = logs.records[0]
+        self.assertEqual(record.sql, "SELECT * FROM ROOMS WHERE room_id = %s")
+        self.assertEqual(record.params, "(int,)")
+        raw.cursor.return_value.execute.assert_called_once_with("SELECT *\n   FROM ROOMS WHERE room_id = %s", (3,))
+
+    def test_05_json_formatter_includes_extra_fields(self):
+        record = logging.makeLogRecord({'name': 'hotel.slow_query', 'levelname': 'WARNING', 'msg': "lenta %s",
+                                        'args': ("x",), 'elapsed_ms': 12.5})
+        entry = json.loads(JSONFormatter().format(record))
+        self.assertEqual((entry['message'], entry['elapsed_ms'], entry['level']), ("lenta x", 12.5, "WARNING"))
+
+    def test_06_slow_query_params_never_show_passwords(self):
+        insert = "INSERT INTO CUSTOMERS (email, password) VALUES (%s, %s)"
+        self.assertEqual(instrumentation._params_text(insert, ("a@mail.com", "secreta")), "(str, str)")
+        self.assertEqual(instrumentation._params_text(insert, ("a@mail.com", "secreta"), "values"), "(str, str)")
+        self.assertEqual(instrumentation._params_text("SELECT 1 WHERE x = %s", (3,), "values"), "(3,)")
+        self.assertEqual(instrumentation._params_text("SELECT 1", None), "()")
+
+
+    def test_07_executemany_passes_batch_through(self):
+        raw = MagicMock()
+        conn = traced(raw, threshold_ms=0.000001)
+        rows = iter([(1, "a"), (2, "b")])
+        with self.assertLogs("hotel.slow_query", level="WARNING") as logs:
+            conn.cursor().executemany("INSERT INTO T VALUES (%s, %s)", rows)
+        self.assertIs(raw.cursor.return_value.executemany.call_args.args[1], rows)
+        self.assertIsNone(logs.records[0].batch_rows)
+        with self.assertLogs("hotel.slow_query", level="WARNING") as logs:
+            conn.cursor().executemany("INSERT INTO T VALUES (%s, %s)", [(1, "a"), (2, "b")])
+        self.assertEqual((logs.records[0].batch_rows, logs.records[0].params), (2, "(int, str)"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import io
+import unittest
+from datetime import date
+
+from occupancy_report import build_report, write_csv
+from reservation_store import ReservationStore
+from room import Room
+
+
+def d(day):
+    return date(2025, 3, day).toordinal()
+
+
+class TestOccupancyReport(unittest.TestCase):
+    def setUp(self):
+        self.rooms = [
+            Room(1, "101", "Sencilla", "Available", 100.0),
+            Room(2, "102", "Sencilla", "Available", 100.0),
+            Room(3, "201", "Suite", "Available", 300.0),
+            Room(4, "202", "Suite", "Maintenance", 300.0),
+        ]
+        self.store = ReservationStore.from_rows([
+            (1, 1, 10, d(1), d(3), 200.0),   # Sencilla, 2 noches
+            (2, 2, 11, d(2), d(4), 240.0),   # Sencilla, 2 noches a 120
+            (3, 3, 12, d(2), d(6), 1200.0),  # Suite, recortada a la ventana
+            (4, 99, 13, d(1), d(2), 500.0),  # habitacion desconocida, se ignora
+        ])
+
+    def test_01_daily_rooms_sold_and_rates(self):
+        report = build_report(self.store, self.rooms, "2025-03-01", "2025-03-04")
+
+        self.assertEqual(report.room_types, ["Sencilla", "Suite"])
+        self.assertEqual(report.available.tolist(), [2, 1])
+        self.assertEqual(report.sold.tolist(), [[1, 2, 1], [0, 1, 1]])
+        self.assertEqual(report.occupancy()[0].tolist(), [50.0, 100.0, 50.0])
+        self.assertEqual(report.adr()[0].tolist(), [100.0, 110.0, 120.0])
+        self.assertEqual(report.revpar()[1].tolist(), [0.0, 300.0, 300.0])
+
+    def test_02_summary_includes_hotel_total(self):
+        summary = build_report(self.store, self.rooms, "2025-03-01", "2025-03-04").summary()
+
+        total = summary[-1]
+        self.assertEqual(total['room_type'], "Total")
+        self.assertEqual(total['rooms_sold'], 6)
+        self.assertEqual(total['revenue'], 1040.0)
+        self.assertEqual(total['occupancy_pct'], round(100 * 6 / 9, 2))
+
+        out = io.StringIO()
+        write_csv(summary, out)
+        self.assertTrue(out.getvalue().startswith("room_type,rooms_sold,occupancy_pct,adr,revpar,revenue"))
+
+    def test_03_rejects_empty_range(self):
+        with self.assertRaises(ValueError):
+            build_report(self.store, self.rooms, "2025-03-04", "2025-03-04")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,20 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import mysql.connector
+from datetime import date
 
 # Importar las clases de los componentes a probar
 from customer import Customer
 from payment import Payment
 from reservationService import ServiceReservation
 from reservation import Reservation
+from room import Room
 from dao.customer_dao import CustomerDAO # Asegúrate que la ruta al DAO es correcta
-from dao.reservation_dao import ReservationDAO
+from dao.reservation_dao import ReservationDAO, RoomNotAvailableError
+from dao.room_dao import RoomDAO
+from dao.identity_map import IdentityMap
+from dao.payment_dao import PaymentDAO
+from dao.unit_of_work import UnitOfWork
 
 # --------------------------------------------------------------------------
 # I. Pruebas de la Capa DAO (Persistencia y Transacciones)
@@ -49,6 +55,227 @@ class TestCustomerDAOLogic(unittest.TestCase):
         mock_conn.rollback.assert_called_once()
         self.assertEqual(self.mock_customer.getId(), 0)
 
+# Insercion por lotes: un commit por lote; executemany solo si los ids son consecutivos.
+@patch('dao.batching.get_conn')
+@patch('dao.batching.close_conn')
+class TestBulkInsert(unittest.TestCase):
+
+    def test_create_many_batches_and_backfills_ids(self, mock_close_conn, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 100
+        mock_cursor.fetchone.return_value = (1,)
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+        customers = [Customer(0, f"C{i}", "", "L", "", "1", f"c{i}@mail.com", "S", "CURP", "x") for i in range(5)]
+
+        ids = CustomerDAO().create_many(customers, batch_size=2)
+
+        self.assertEqual(mock_cursor.executemany.call_count, 3)
+        self.assertEqual(mock_conn.commit.call_count, 3)
+        mock_get_conn.assert_called_once()
+        self.assertEqual(ids, [100, 101, 100, 101, 100])
+        self.assertEqual(customers[1].getId(), 101)
+
+    def test_create_many_rolls_back_failed_batch(self, mock_close_conn, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 7
+        mock_cursor.fetchone.return_value = (1,)
+        mock_cursor.executemany.side_effect = [None, mysql.connector.Error("Simulated DB Error")]
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+        customers = [Customer(0, f"C{i}", "", "L", "", "1", f"c{i}@mail.com", "S", "CURP", "x") for i in range(4)]
+
+        ids = CustomerDAO().create_many(customers, batch_size=2)
+
+        self.assertEqual(ids, [7, 8])
+        mock_conn.rollback.assert_called_once()
+        self.assertEqual(customers[2].getId(), 0)
+        mock_close_conn.assert_called_once_with(mock_conn)
+
+    def test_create_many_inserts_row_by_row_with_interleaved_autoinc(self, mock_close_conn, mock_get_conn):
+        # Con innodb_autoinc_lock_mode=2 los ids del lote no son consecutivos: cada fila toma el suyo.
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (2,)
+        assigned = iter([10, 13, 14])
+
+        def execute(query, values=None):
+            if values is not None:
+                mock_cursor.lastrowid = next(assigned)
+        mock_cursor.execute.side_effect = execute
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+        customers = [Customer(0, f"C{i}", "", "L", "", "1", f"c{i}@mail.com", "S", "CURP", "x") for i in range(3)]
+
+        ids = CustomerDAO().create_many(customers, batch_size=3)
+
+        self.assertEqual(ids, [10, 13, 14])
+        self.assertEqual(customers[1].getId(), 13)
+        mock_cursor.executemany.assert_not_called()
+        mock_conn.commit.assert_called_once()
+
+# Lectura por bloques: fetchmany sobre cursor sin buffer, sin lista completa.
+@patch('dao.streaming.get_conn')
+@patch('dao.streaming.close_conn')
+class TestStreamingReads(unittest.TestCase):
+
+    def test_iter_all_streams_with_fetchmany(self, mock_close_conn, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.side_effect = [
+            [(1, "101", "Sencilla", "Available", 120.0, "")],
+            [(2, "205", "Doble", "Available", 180.0, "")],
+            [],
+        ]
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+
+        rooms = RoomDAO().iter_all(chunk_size=1)
+        mock_get_conn.assert_not_called()
+        self.assertEqual([r.getRoomNumber() for r in rooms], ["101", "205"])
+        mock_conn.cursor.assert_called_once_with(buffered=False)
+        mock_cursor.fetchmany.assert_called_with(1)
+        mock_cursor.fetchall.assert_not_called()
+        mock_conn.consume_results.assert_not_called()
+        mock_close_conn.assert_called_once_with(mock_conn)
+
+    def test_abandoned_iterator_discards_pending_rows(self, mock_close_conn, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.return_value = [(1, "101", "Sencilla", "Available", 120.0, "")]
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+
+        rooms = RoomDAO().iter_page(after_id=0, limit=10)
+        next(rooms)
+        rooms.close()
+        mock_conn.consume_results.assert_called_once()
+        mock_close_conn.assert_called_once_with(mock_conn)
+
+# Unidad de trabajo: varias escrituras de distintos DAOs, un prestamo y un commit.
+@patch('dao.unit_of_work.get_conn')
+@patch('dao.unit_of_work.close_conn')
+class TestUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        IdentityMap.reset()
+        cust = Customer(7, "Ana", "", "Lopez", "", "1", "ana@mail.com", "Qro", "CURP")
+        self.res = Reservation(None, "2025-01-01", "2025-01-03", cust, Room(3, "101", "Sencilla"))
+        self.payment = Payment(None, 240.0, "Tarjeta", self.res)
+
+    def _booking(self, mock_get_conn, link_rows=1):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        lastrowids = iter([41, 90])
+        type(mock_cursor).lastrowid = property(lambda _: next(lastrowids))
+        mock_cursor.rowcount = link_rows
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+        with UnitOfWork() as session:
+            ReservationDAO().create(self.res, 240.0, session=session)
+            PaymentDAO().create(self.payment, session=session)
+            if not ReservationDAO().link_payment(41, self.payment.getId(), session=session):
+                raise RuntimeError("sin enlace")
+        return mock_conn
+
+    def test_booking_commits_once_on_one_connection(self, mock_close_conn, mock_get_conn):
+        mock_conn = self._booking(mock_get_conn)
+
+        mock_get_conn.assert_called_once()
+        mock_conn.commit.assert_called_once()
+        mock_conn.rollback.assert_not_called()
+        mock_close_conn.assert_called_once_with(mock_conn)
+        self.assertEqual((self.res.getId(), self.payment.getId()), (41, 90))
+
+    def test_failure_rolls_back_everything(self, mock_close_conn, mock_get_conn):
+        with self.assertRaises(RuntimeError):
+            self._booking(mock_get_conn, link_rows=0)
+
+        mock_conn = mock_get_conn.return_value
+        mock_conn.commit.assert_not_called()
+        mock_conn.rollback.assert_called_once()
+        mock_close_conn.assert_called_once_with(mock_conn)
+        self.assertEqual((self.res.getId(), self.payment.getId()), (None, None))
+        self.assertIsNone(IdentityMap.get_instance().get(Reservation, 41))
+
+    def test_booking_claims_one_row_per_night(self, mock_close_conn, mock_get_conn):
+        mock_conn = self._booking(mock_get_conn)
+
+        claim = mock_conn.cursor.return_value.executemany.call_args_list
+        self.assertEqual(len(claim), 1)
+        self.assertEqual(claim[0].args, (ReservationDAO._CLAIM_NIGHT, [(3, date(2025, 1, 1), 41), (3, date(2025, 1, 2), 41)]))
+
+    def test_night_already_taken_rolls_back_booking(self, mock_close_conn, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 41
+
+        mock_cursor.executemany.side_effect = mysql.connector.IntegrityError(msg="Duplicate entry '3-2025-01-02'", errno=1062)
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+
+        with self.assertRaises(RoomNotAvailableError):
+            with UnitOfWork() as session:
+                ReservationDAO().create(self.res, 240.0, session=session)
+
+        mock_conn.commit.assert_not_called()
+        mock_conn.rollback.assert_called_once()
+        self.assertIsNone(self.res.getId())
+        self.assertIsNone(IdentityMap.get_instance().get(Reservation, 41))
+
+# Mapa de identidad: una instancia por llave primaria entre filas y DAOs.
+class TestIdentityMap(unittest.TestCase):
+    CUSTOMER = (7, "Ana", "", "Lopez", "", "1", "ana@mail.com", "Qro", "CURP", "x")
+    ROOM = (3, "101", "Sencilla", "Available", 120.0, "")
+
+    def setUp(self):
+        IdentityMap.reset()
+
+    @patch('dao.reservation_dao.close_conn')
+    @patch('dao.reservation_dao.get_conn')
+    def test_joined_rows_share_customer_and_room(self, mock_get_conn, mock_close_conn):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            (1, "2025-01-01", "2025-01-03", "Confirmed", 240.0) + self.CUSTOMER + self.ROOM,
+            (2, "2025-02-01", "2025-02-02", "Confirmed", 120.0) + self.CUSTOMER + self.ROOM,
+        ]
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+
+        first_room = RoomDAO()._from_record(self.ROOM)
+        res_a, res_b = ReservationDAO().get_all()
+        res_again = ReservationDAO().get_all()[0]
+
+        self.assertIs(res_a.getCustomer(), res_b.getCustomer())
+        self.assertIs(res_a.getRoom(), first_room)
+        self.assertIs(res_again, res_a)
+        self.assertEqual(res_a.getCustomer().getReservations(), [res_a, res_b])
+
+    @patch('dao.reservation_dao.close_conn')
+    @patch('dao.reservation_dao.get_conn')
+    def test_reloaded_row_updates_loaded_instance(self, mock_get_conn, mock_close_conn):
+        mock_cursor = MagicMock()
+        mock_get_conn.return_value.cursor.return_value = mock_cursor
+        other = (8, "Luis", "", "Perez", "", "2", "luis@mail.com", "Qro", "CURP2", "y")
+        mock_cursor.fetchall.return_value = [(1, "2025-01-01", "2025-01-03", "Confirmed", 240.0) + self.CUSTOMER + self.ROOM]
+        reservation = ReservationDAO().get_all()[0]
+        ana = reservation.getCustomer()
+
+        # Otra terminal cambio las fechas, el huesped y el precio de la habitacion.
+        mock_cursor.fetchall.return_value = [(1, "2025-01-05", "2025-01-07", "Confirmed", 300.0) + other
+                                             + (3, "101", "Sencilla", "Available", 150.0, "")]
+        again = ReservationDAO().get_all()[0]
+
+        self.assertIs(again, reservation)
+        self.assertEqual((again.getCheckIn(), again.getCheckOut(), again.getTotalCost()), ("2025-01-05", "2025-01-07", 300.0))
+        self.assertEqual(again.getRoom().getCost(), 150.0)
+        self.assertEqual(again.getCustomer().getEmail(), "luis@mail.com")
+        self.assertEqual(ana.getReservations(), [])
+        self.assertEqual(again.getCustomer().getReservations(), [again])
+
 # Pruebas de Entidades de Dominio (Lógica de Negocio y Colaboración)
 
 class TestReservationLogic(unittest.TestCase):
@@ -85,5 +312,30 @@ class TestReservationLogic(unittest.TestCase):
         fail = cust.cancelReservation(999)
         self.assertFalse(fail)
 
+    def test_06_unlink_reservation_is_silent(self):
+        cust = Customer(1, "Test", "", "User", "", "123", "e@mail.com", "State", "CURP123")
+        res = Reservation(101, "2025-01-01", "2025-01-02", cust, Room(3, "101", "Sencilla"))
+        cust.linkReservation(res)
+        with patch('builtins.print') as mock_print:
+            self.assertTrue(cust.unlinkReservation(101))
+            self.assertFalse(cust.unlinkReservation(101))
+        mock_print.assert_not_called()
+        self.assertEqual(cust.getReservations(), [])
+
+# Modelos compactos: sin __dict__ por instancia, listas perezosas y textos internalizados.
+class TestCompactModels(unittest.TestCase):
+
+    def test_entities_use_slots_and_keep_api(self):
+        room = Room(1, "101", "".join(["Su", "ite"]))
+        cust = Customer(1, "Ana", "", "Lopez", "", "1", "ana@mail.com", "Qro", "CURP")
+        for entity in (room, cust, Reservation(1, "2025-01-01", "2025-01-02", cust, room)):
+            self.assertFalse(hasattr(entity, '__dict__'))
+        with self.assertRaises(AttributeError):
+            room.extra = 1
+        self.assertIs(room.getType(), "Suite")
+        self.assertIsNone(cust._Customer__reservations)
+        self.assertEqual(cust.getReservations(), [])
+        self.assertEqual(cust.getPassword(), "")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
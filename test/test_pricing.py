@@ -0,0 +1,54 @@
+import unittest
+from datetime import date
+
+from pricing import RateCalendar, PricingEngine
+from room import Room
+from service import Service
+
+
+class TestPricing(unittest.TestCase):
+    def setUp(self):
+        self.single = Room(1, "101", "Sencilla", "Available", 100.0)
+        self.suite = Room(2, "401", "Suite", "Available", 300.0)
+        # 2025-03-03 es lunes.
+        self.calendar = RateCalendar.from_rooms([self.single, self.suite], start=date(2025, 3, 1), days=60)
+
+    def test_01_base_rate_matches_room_cost(self):
+        engine = PricingEngine(self.calendar)
+        quote = engine.quote(self.single, "2025-03-03", "2025-03-06", Service(1, "Spa", 50.0, ""))
+        self.assertEqual((quote.nights, quote.room_subtotal, quote.total), (3, 300.0, 350.0))
+
+    def test_02_weekend_and_season_factors(self):
+        self.calendar.apply_factor(1.5, weekdays=(4, 5))
+        self.calendar.apply_factor(2.0, "2025-03-10", "2025-03-12", room_type="Suite")
+        # Jueves a domingo: jueves normal, viernes y sabado con recargo.
+        self.assertEqual(self.calendar.stay_total(self.single, "2025-03-06", "2025-03-09"), 100 + 150 + 150)
+        self.assertEqual(self.calendar.nightly_rates(self.suite, "2025-03-09", "2025-03-13").tolist(), [300, 600, 600, 300])
+
+    def test_03_quote_many_with_length_of_stay_discount(self):
+        engine = PricingEngine(self.calendar, length_of_stay_discounts=[(3, 0.05), (7, 0.10)])
+        self.assertEqual(engine.quote_many([self.single, self.suite], "2025-03-03", "2025-03-10"),
+                         {1: 630.0, 2: 1890.0})
+        self.assertEqual(engine.quote(self.suite, "2025-03-03", "2025-03-05").discount, 0.0)
+
+    def test_04_each_room_keeps_its_own_cost(self):
+        deluxe = Room(3, "102", "Sencilla", "Available", 140.0)
+        calendar = RateCalendar.from_rooms([self.single, deluxe], start=date(2025, 3, 1), days=60, weekend_factor=1.5)
+        self.assertEqual(PricingEngine(calendar).quote_many([self.single, deluxe], "2025-03-06", "2025-03-08"),
+                         {1: 250.0, 3: 350.0})
+        # Un cambio de costo (p. ej. por sincronizacion) se cotiza sin reconstruir el calendario.
+        deluxe.setCost(160.0)
+        self.assertEqual(PricingEngine(calendar).quote(deluxe, "2025-03-03", "2025-03-04").total, 160.0)
+
+    def test_05_falls_back_to_room_cost_outside_calendar(self):
+        engine = PricingEngine(self.calendar)
+        # El calendario cubre hasta 2025-04-29: las noches despues valen el costo por noche.
+        self.assertEqual(engine.quote(self.single, "2025-04-28", "2025-05-02").room_subtotal, 400.0)
+        self.assertEqual(engine.quote(self.single, "2026-01-05", "2026-01-07").room_subtotal, 200.0)
+        penthouse = Room(9, "9", "Penthouse", "Available", 900.0)
+        self.assertEqual(engine.quote_many([penthouse], "2025-03-03", "2025-03-04"), {9: 900.0})
+        with self.assertRaises(ValueError):
+            self.calendar.stay_total(self.single, "2025-03-05", "2025-03-05")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from cache import LRUCache
+from repository import CustomerRepository, ReservationRepository
+from dao.ServiceDAO import ServiceDAO
+
+
+class TestLazyRepository(unittest.TestCase):
+    def test_01_lru_cache_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_02_customer_loaded_on_demand_and_cached(self):
+        dao = MagicMock()
+        customer = MagicMock()
+        dao.get_by_email.side_effect = lambda email: customer if email == "a@mail.com" else None
+        repo = CustomerRepository(dao, max_size=10)
+
+        self.assertIs(repo.get("a@mail.com"), customer)
+        self.assertIs(repo.get("a@mail.com"), customer)
+        self.assertIsNone(repo.get("x@mail.com"))
+        self.assertEqual(dao.get_by_email.call_count, 2)
+        dao.get_all.assert_not_called()
+
+    def test_03_working_set_is_bounded(self):
+        dao = MagicMock()
+        dao.get_page.return_value = [MagicMock(**{'getId.return_value': i}) for i in range(1, 6)]
+        repo = ReservationRepository(dao, max_size=3)
+
+        page = repo.page(0, 5)
+        self.assertEqual(len(page), 5)
+        self.assertEqual(len(repo), 3)
+        self.assertEqual(repo.keys(), [3, 4, 5])
+        dao.get_page.assert_called_once_with(0, 5)
+
+    def test_04_ttl_expires_entries_and_counts_stats(self):
+        now = [100.0]
+        cache = LRUCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        now[0] += 11
+        self.assertIsNone(cache.get('a'))
+        cache.put('b', 2); cache.put('c', 3); cache.put('d', 4)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations'], stats['evictions']), (1, 1, 1, 1))
+
+    @patch('dao.ServiceDAO.close_conn')
+    @patch('dao.ServiceDAO.get_conn')
+    def test_05_service_lookup_is_read_through_and_invalidated_by_delete(self, mock_get_conn, mock_close_conn):
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(5, "Spa", 50.0, "Acceso")]
+        mock_cursor.rowcount = 1
+        mock_conn.cursor.return_value = mock_cursor
+        mock_get_conn.return_value = mock_conn
+        dao = ServiceDAO(cache=LRUCache(max_size=10))
+
+        first = dao.get_by_id(5)
+        self.assertIs(dao.get_by_id(5), first)
+        self.assertEqual(mock_get_conn.call_count, 1)
+
+        dao.delete(5)
+        dao.get_by_id(5)
+        self.assertEqual(mock_get_conn.call_count, 3)
+        self.assertEqual(dao.cache.stats()['invalidations'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
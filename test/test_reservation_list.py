@@ -0,0 +1,62 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from reservation_list import ReservationListModel, diff_rows
+from dao.reservation_dao import ReservationDAO
+
+
+def row(res_id, customer="Ana Lopez", cost=100.0):
+    return (res_id, customer, "101", date(2025, 1, 1), date(2025, 1, 3), cost)
+
+
+class TestReservationListModel(unittest.TestCase):
+    def test_01_pages_continue_from_last_row(self):
+        dao = MagicMock()
+        dao.get_summary_page.side_effect = [[row(1), row(2)], [row(3)]]
+        model = ReservationListModel(dao, page_size=2)
+
+        self.assertEqual(len(model.append(model.fetch_next())), 2)
+        self.assertFalse(model.exhausted)
+        model.append(model.fetch_next())
+        self.assertTrue(model.exhausted)
+        dao.get_summary_page.assert_called_with('id', False, "", (2, 2), 2)
+
+    def test_02_sort_change_discards_stale_pages(self):
+        dao = MagicMock()
+        dao.get_summary_page.return_value = [row(1)]
+        model = ReservationListModel(dao, page_size=2)
+
+        stale = model.fetch_next()
+        model.set_sort('cost')
+        self.assertEqual(model.append(stale), [])
+        self.assertEqual(model.rows, [])
+        model.set_sort('cost')
+        self.assertTrue(model.descending)
+
+    def test_03_diff_reports_only_changes(self):
+        old = [row(1), row(2), row(3)]
+        new = [row(1), row(3, cost=150.0), row(4)]
+        self.assertEqual(diff_rows(old, new), ([2], [row(4)], [row(3, cost=150.0)]))
+
+    @patch('dao.streaming.close_conn')
+    @patch('dao.streaming.get_conn')
+    def test_04_summary_query_is_keyset_and_whitelisted(self, mock_get_conn, mock_close_conn):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.side_effect = [[row(9)], []]
+        mock_get_conn.return_value.cursor.return_value = mock_cursor
+        dao = ReservationDAO()
+
+        rows = dao.get_summary_page('cost', True, "50%", after=(120.0, 10), limit=25)
+        self.assertEqual(rows, [row(9)])
+        query, values = mock_cursor.execute.call_args[0]
+        self.assertIn("(COALESCE(r.total_cost, 0), r.reservation_id) < (%s, %s)", query)
+        self.assertIn("DESC", query)
+        self.assertEqual(values, ("%50!%%",) * 4 + (120.0, 10, 25))
+
+        with self.assertRaises(ValueError):
+            dao.get_summary_page("total_cost; DROP TABLE RESERVATIONS")
+
+
+if __name__ == '__main__':
+    unittest.main()
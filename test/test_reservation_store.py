@@ -0,0 +1,57 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from reservation_store import ReservationStore
+
+
+def d(day):
+    return date(2025, 3, day).toordinal()
+
+
+ROWS = [
+    (1, 10, 100, d(1), d(4), 300.0),
+    (2, 10, 101, d(5), d(7), 200.0),
+    (3, 11, 100, d(3), d(10), 700.0),
+    (4, 12, 102, d(20), d(22), 250.0),
+]
+
+
+class TestReservationStore(unittest.TestCase):
+    def test_01_loads_from_dao_in_chunks(self):
+        dao = MagicMock()
+        dao.iter_fact_rows.return_value = iter(ROWS)
+        store = ReservationStore.from_dao(dao, chunk_size=3)
+
+        dao.iter_fact_rows.assert_called_once_with(3)
+        self.assertEqual(len(store), 4)
+        self.assertEqual(store.id.tolist(), [1, 2, 3, 4])
+        self.assertEqual(store.total_cost.sum(), 1450.0)
+
+    def test_02_filters_by_window_and_room(self):
+        store = ReservationStore.from_rows(ROWS)
+
+        self.assertEqual(store.id[store.where("2025-03-04", "2025-03-06")].tolist(), [2, 3])
+        self.assertEqual(store.id[store.where(date(2025, 3, 1), room_ids=[10])].tolist(), [1, 2])
+        self.assertEqual(store.nights_sold("2025-03-02", "2025-03-06"), 2 + 1 + 3)
+        self.assertEqual(store.revenue(room_ids=[11, 12]), 950.0)
+
+    def test_03_append_and_remove(self):
+        store = ReservationStore.from_rows(ROWS[:2])
+        res = MagicMock()
+        res.getId.return_value = 9
+        res.getRoom.return_value.getId.return_value = 12
+        res.getCustomer.return_value.getId.return_value = 103
+        res.getCheckIn.return_value = "2025-03-01"
+        res.getCheckOut.return_value = "2025-03-03"
+        res.getTotalCost.return_value = 180.0
+        store.append(res)
+
+        self.assertEqual(store.check_in[-1], d(1))
+        self.assertEqual(store.remove([1, 42]), 1)
+        self.assertEqual(store.id.tolist(), [2, 9])
+        self.assertEqual(store.nights_sold(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
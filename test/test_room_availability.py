@@ -0,0 +1,59 @@
+import unittest
+
+from customer import Customer
+from room import Room
+from reservation import Reservation
+from room_availability import RoomAvailabilityIndex
+
+
+class TestRoomAvailabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.customer = Customer(1, "Test", "", "User", "", "123", "e@mail.com", "State", "CURP123")
+        self.room_a = Room(1, "101", "Sencilla", "Available", 120.0)
+        self.room_b = Room(2, "205", "Doble", "Not available", 180.0)
+        self.room_c = Room(3, "503", "Doble", "Maintenance", 600.0)
+        booked = Reservation(10, "2025-01-05", "2025-01-10", self.customer, self.room_a)
+        self.index = RoomAvailabilityIndex([self.room_a, self.room_b, self.room_c], [booked])
+
+    def test_01_overlapping_range_is_not_available(self):
+        self.assertFalse(self.index.is_available(1, "2025-01-08", "2025-01-12"))
+        self.assertFalse(self.index.is_available(1, "2025-01-01", "2025-01-06"))
+        self.assertTrue(self.index.is_available(1, "2025-01-10", "2025-01-12"))
+        self.assertTrue(self.index.is_available(1, "2025-01-01", "2025-01-05"))
+
+    def test_02_available_rooms_ignores_status_string_but_not_maintenance(self):
+        rooms = self.index.available_rooms("2025-01-06", "2025-01-07")
+        self.assertEqual([r.getId() for r in rooms], [2])
+        rooms = self.index.available_rooms("2025-02-01", "2025-02-03", room_type="Doble")
+        self.assertEqual([r.getId() for r in rooms], [2])
+
+    def test_03_add_and_remove_keep_index_updated(self):
+        new_res = Reservation(11, "2025-03-01", "2025-03-04", self.customer, self.room_b)
+        self.index.add(new_res)
+        self.assertFalse(self.index.is_available(2, "2025-03-03", "2025-03-05"))
+        self.assertTrue(self.index.remove(11))
+        self.assertTrue(self.index.is_available(2, "2025-03-03", "2025-03-05"))
+        self.assertFalse(self.index.remove(11))
+
+    def test_04_create_reservation_uses_dates_when_index_given(self):
+        res = Reservation(12, "2025-01-07", "2025-01-09", self.customer, self.room_a)
+        self.assertFalse(res.createReservation(self.index))
+        res.setCheckIn("2025-01-10")
+        res.setCheckOut("2025-01-11")
+        self.assertTrue(res.createReservation(self.index))
+        self.assertIn(res, self.customer.getReservations())
+
+
+    def test_05_overlapping_legacy_stays_and_empty_ranges(self):
+        # Datos viejos con estancias traslapadas: [1, 10) cubre a [2, 3) y a lo que sigue.
+        self.index.add(Reservation(20, "2025-04-01", "2025-04-10", self.customer, self.room_b))
+        self.index.add(Reservation(21, "2025-04-02", "2025-04-03", self.customer, self.room_b))
+        self.assertFalse(self.index.is_available(2, "2025-04-05", "2025-04-06"))
+        self.assertEqual(self.index.available_rooms("2025-04-05", "2025-04-06", room_type="Doble"), [])
+        self.index.remove(20)
+        self.assertTrue(self.index.is_available(2, "2025-04-05", "2025-04-06"))
+        self.assertFalse(self.index.is_available(2, "2025-04-06", "2025-04-06"))
+        self.assertFalse(self.index.is_available(1, "2025-02-03", "2025-02-01"))
+
+if __name__ == '__main__':
+    unittest.main()
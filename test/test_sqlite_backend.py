@@ -0,0 +1,124 @@
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import mysql.connector
+
+from customer import Customer
+from payment import Payment
+from reservation import Reservation
+from room import Room
+from service import Service
+from sqlite_backend import SQLiteDatabase, to_qmark
+from dao.change_log import ChangeLogDAO
+from dao.customer_dao import CustomerDAO
+from dao.identity_map import IdentityMap
+from dao.payment_dao import PaymentDAO
+from dao.reservation_dao import ReservationDAO, RoomNotAvailableError
+from dao.room_dao import RoomDAO
+from dao.ServiceDAO import ServiceDAO
+from dao.statement_cache import StatementCache
+from dao.unit_of_work import UnitOfWork
+
+
+# Los DAOs reales contra una BD SQLite en memoria, creada desde el esquema en cada prueba.
+@patch('db_connection.DB_BACKEND', 'sqlite')
+class TestSQLiteBackend(unittest.TestCase):
+
+    def setUp(self):
+        SQLiteDatabase.configure(":memory:")
+        IdentityMap.reset()
+        StatementCache.reset()
+        ServiceDAO.cache.clear()
+        self.room = Room(0, "101", "Sencilla", "Available", 120.0, "")
+        self.customer = Customer(0, "Ana", "", "Lopez", "", "1", "ana@mail.com", "Qro", "CURP", "x")
+
+    def tearDown(self):
+        SQLiteDatabase.reset()
+
+    def _seed(self):
+        RoomDAO().create(self.room)
+        CustomerDAO().create(self.customer)
+
+    def _book(self, check_in, check_out):
+        return Reservation(None, check_in, check_out, self.customer, self.room)
+
+    def test_01_placeholders(self):
+        self.assertEqual(to_qmark("SELECT * FROM T WHERE a = %s AND b LIKE '10%%'"),
+                         "SELECT * FROM T WHERE a = ? AND b LIKE '10%'")
+
+    def test_02_crud_roundtrip(self):
+        self._seed()
+        self.assertEqual(self.room.getId(), 1)
+        self.assertEqual(CustomerDAO().get_by_email("ana@mail.com").getId(), self.customer.getId())
+        self.assertEqual([room.getRoomNumber() for room in RoomDAO().get_all()], ["101"])
+
+        ids = ServiceDAO().create_many([Service(0, "Spa", 50.0, ""), Service(0, "Gimnasio", 10.0, "")])
+        self.assertEqual(ids, [1, 2])
+        self.assertEqual(ServiceDAO().get_by_id(2).getType(), "Gimnasio")
+        self.assertTrue(ServiceDAO().delete(1))
+        self.assertEqual([svc.getId() for svc in ServiceDAO().get_all()], [2])
+
+    def test_03_booking_in_one_transaction(self):
+        self._seed()
+        res = self._book("2025-03-01", "2025-03-04")
+        payment = Payment(None, 360.0, "Tarjeta", res)
+        with UnitOfWork() as session:
+            ReservationDAO().create(res, 360.0, session=session)
+            PaymentDAO().create(payment, session=session)
+            self.assertTrue(ReservationDAO().link_payment(res.getId(), payment.getId(), session=session))
+
+        IdentityMap.reset()
+        loaded = ReservationDAO().get_all()
+        self.assertEqual([(r.getId(), r.getCheckIn(), r.getCheckOut(), r.getTotalCost()) for r in loaded],
+                         [(res.getId(), "2025-03-01", "2025-03-04", 360.0)])
+        self.assertEqual(loaded[0].getRoom().getRoomNumber(), "101")
+
+        store_rows = list(ReservationDAO().iter_fact_rows())
+        self.assertEqual(store_rows[0][3:5], (date(2025, 3, 1).toordinal(), date(2025, 3, 4).toordinal()))
+
+        summary = ReservationDAO().get_summary_page('customer', search="lop")
+        self.assertEqual(summary[0][1:4], ("Ana Lopez", "101", date(2025, 3, 1)))
+
+    def test_04_overlapping_nights_are_rejected(self):
+        self._seed()
+        first = self._book("2025-03-01", "2025-03-04")
+        self.assertIsNotNone(ReservationDAO().create(first, 360.0))
+
+        with self.assertRaises(RoomNotAvailableError):
+            ReservationDAO().create(self._book("2025-03-03", "2025-03-05"), 240.0)
+        self.assertIsNotNone(ReservationDAO().create(self._book("2025-03-04", "2025-03-05"), 120.0))
+
+        # Borrar la reserva libera sus noches.
+        self.assertTrue(ReservationDAO().delete(first.getId()))
+        self.assertIsNotNone(ReservationDAO().create(self._book("2025-03-02", "2025-03-03"), 120.0))
+
+    def test_05_duplicate_email_is_a_connector_integrity_error(self):
+        self._seed()
+        conn = SQLiteDatabase.acquire()
+        try:
+            with self.assertRaises(mysql.connector.IntegrityError) as ctx:
+                conn.cursor().execute(CustomerDAO._INSERT, ("B", "", "C", "", "2", "ana@mail.com", "Qro", "CURP", "x"))
+            self.assertEqual(ctx.exception.errno, 1062)
+        finally:
+            SQLiteDatabase.release(conn)
+
+    def test_06_changes_and_tombstones(self):
+        change_log = ChangeLogDAO()
+        since = change_log.server_time() - timedelta(seconds=1)
+        self._seed()
+        res = self._book("2025-03-01", "2025-03-02")
+        ReservationDAO().create(res, 120.0)
+
+        rooms, watermark = RoomDAO().get_changed_since(since)
+        self.assertEqual([room.getRoomNumber() for room in rooms], ["101"])
+        self.assertGreater(watermark, since)
+
+        ReservationDAO().delete(res.getId())
+        tombstones, _ = change_log.get_tombstones_since(since)
+        self.assertEqual(tombstones, [("RESERVATIONS", res.getId())])
+        self.assertEqual(change_log.prune(days=0), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock
+
+import mysql.connector
+
+from dao.statement_cache import StatementCache, UNKNOWN_STATEMENT
+
+
+class FakePhysical:
+    """Conexion fisica del pool: solo necesita poder referenciarse debilmente."""
+
+
+def pooled(physical):
+    # Cada prestamo del pool es un envoltorio nuevo sobre la misma conexion fisica.
+    conn = MagicMock()
+    conn._cnx = physical
+    conn.cursor.side_effect = lambda prepared: MagicMock(**{'fetchall.return_value': [(1,)]})
+    return conn
+
+
+class TestStatementCache(unittest.TestCase):
+    QUERY = "SELECT service_id FROM SERVICES WHERE service_id = %s"
+
+    def test_01_reuses_statement_across_checkouts(self):
+        cache = StatementCache(max_size=4)
+        physical = FakePhysical()
+        first, second = pooled(physical), pooled(physical)
+
+        self.assertEqual(cache.fetch_one(first, self.QUERY, (1,)), (1,))
+        # Texto igual pero otro objeto str: se ejecuta con el original para no re-preparar.
+        cursor = cache.run(second, "".join(self.QUERY), (2,))
+
+        second.cursor.assert_not_called()
+        self.assertIs(cursor.execute.call_args[0][0], self.QUERY)
+        stats = cache.stats()
+        self.assertEqual((stats['prepares'], stats['hits'], stats['connections']), (1, 1, 1))
+
+    def test_02_bound_evicts_and_closes_oldest(self):
+        cache = StatementCache(max_size=2)
+        conn = pooled(FakePhysical())
+        oldest = cache.run(conn, "SELECT 1")
+        cache.run(conn, "SELECT 2")
+        cache.run(conn, "SELECT 3")
+
+        oldest.close.assert_called_once()
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['statements'], 2)
+
+    def test_03_reprepares_after_reconnect(self):
+        cache = StatementCache()
+        conn = pooled(FakePhysical())
+        stale = cache.run(conn, self.QUERY, (1,))
+        stale.execute.side_effect = mysql.connector.Error("Unknown prepared statement handler", errno=UNKNOWN_STATEMENT)
+
+        fresh = cache.run(conn, self.QUERY, (1,))
+        self.assertIsNot(fresh, stale)
+        fresh.execute.assert_called_once()
+        self.assertEqual(cache.stats()['reprepares'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
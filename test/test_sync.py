@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from customer import Customer
+from reservation import Reservation
+from room import Room
+from room_availability import RoomAvailabilityIndex
+from repository import ReservationRepository
+from dao.identity_map import IdentityMap
+from sync import DeltaSync
+
+T0 = datetime(2025, 3, 1, 12, 0, 0)
+T1 = datetime(2025, 3, 1, 12, 0, 5)
+
+
+class TestDeltaSync(unittest.TestCase):
+    def setUp(self):
+        IdentityMap.reset()
+        identity = IdentityMap.get_instance()
+        self.room = identity.add(Room, 1, Room(1, "101", "Sencilla", "Available", 120.0))
+        self.customer = identity.add(Customer, 7, Customer(7, "Ana", "", "Lopez", "", "1", "ana@mail.com", "Qro", "CURP"))
+        self.data = {'rooms': {1: self.room}, 'services': {}, 'reservations': ReservationRepository(MagicMock())}
+        self.availability = RoomAvailabilityIndex([self.room])
+        self.room_dao = MagicMock()
+        self.reservation_dao = MagicMock()
+        self.change_log = MagicMock()
+        self.change_log.get_tombstones_since.return_value = ([], T0)
+        self.sync = DeltaSync({Room: self.room_dao, Reservation: self.reservation_dao}, self.change_log, watermark=T0, overlap=2)
+
+    def test_01_fetch_asks_only_for_rows_after_watermark(self):
+        self.room_dao.get_changed_since.return_value = ([Room(1, "101", "Sencilla", "Maintenance", 150.0)], T1)
+        self.reservation_dao.get_changed_since.return_value = ([], T0)
+
+        changes = self.sync.fetch()
+        since = self.room_dao.get_changed_since.call_args[0][0]
+        self.assertEqual((T0 - since).total_seconds(), 2)
+        self.assertEqual(changes.watermark, T1)
+
+        self.assertEqual(self.sync.apply(changes, self.data, self.availability), 1)
+        self.assertIs(self.data['rooms'][1], self.room)
+        self.assertEqual((self.room.getStatus(), self.room.getCost()), ("Maintenance", 150.0))
+        self.assertEqual(self.availability.available_rooms("2025-03-02", "2025-03-03"), [])
+        self.assertEqual(self.sync.watermark, T1)
+
+    def test_02_remote_booking_and_delete_update_availability(self):
+        booked = Reservation(50, "2025-03-02", "2025-03-04", self.customer, self.room, None, 240.0)
+        self.room_dao.get_changed_since.return_value = ([], T0)
+        self.reservation_dao.get_changed_since.return_value = ([booked], T1)
+
+        self.sync.apply(self.sync.fetch(), self.data, self.availability)
+        self.assertFalse(self.availability.is_available(1, "2025-03-03", "2025-03-05"))
+        self.assertEqual(self.customer.getReservations(), [booked])
+
+        self.reservation_dao.get_changed_since.return_value = ([], T1)
+        self.change_log.get_tombstones_since.return_value = ([('RESERVATIONS', 50)], T1)
+        self.sync.apply(self.sync.fetch(), self.data, self.availability)
+        self.assertTrue(self.availability.is_available(1, "2025-03-03", "2025-03-05"))
+        self.assertEqual(self.customer.getReservations(), [])
+        self.assertIsNone(IdentityMap.get_instance().get(Reservation, 50))
+
+    def test_03_failed_table_fails_whole_fetch(self):
+        from mysql.connector.errors import OperationalError
+        self.room_dao.get_changed_since.return_value = ([], T1)
+        self.reservation_dao.get_changed_since.side_effect = OperationalError("Lost connection")
+        with self.assertRaises(OperationalError):
+            self.sync.fetch()
+        self.assertEqual(self.sync.watermark, T0)
+
+        # Sin marca de agua (la BD no respondio al arrancar) la primera consulta solo la toma.
+        self.change_log.server_time.return_value = T1
+        room_dao = MagicMock()
+        pending = DeltaSync({Room: room_dao}, self.change_log)
+        self.assertEqual(len(pending.fetch()), 0)
+        self.assertEqual(pending.watermark, T1)
+        room_dao.get_changed_since.assert_not_called()
+
+    def test_04_missing_change_schema_disables_sync(self):
+        self.change_log.has_change_tracking.return_value = False
+        pending = DeltaSync({Room: MagicMock()}, self.change_log)
+        with self.assertLogs("sync", level="WARNING") as logs:
+            self.assertIsNone(pending.start())
+            self.assertEqual(len(pending.fetch()), 0)
+        self.assertEqual(len(logs.records), 1)
+        self.assertFalse(pending.enabled)
+        self.change_log.server_time.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
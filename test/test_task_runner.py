@@ -0,0 +1,145 @@
+import threading
+import unittest
+
+from task_runner import TaskRunner
+
+
+class FakeMaster:
+    """Sustituto de la ventana Tk: guarda los after() para correrlos a mano."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+class FakeWindow:
+    def __init__(self):
+        self.open = True
+
+    def winfo_exists(self):
+        return self.open
+
+
+class TestTaskRunner(unittest.TestCase):
+    def setUp(self):
+        self.master = FakeMaster()
+        self.busy_changes = []
+        self.runner = TaskRunner(self.master, max_workers=2, on_busy_change=self.busy_changes.append)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def drain(self, task):
+        task.future.exception(timeout=2)
+        self.master.run_pending()
+
+    def test_01_result_is_delivered_on_poll(self):
+        results = []
+        task = self.runner.submit(lambda a, b: a + b, 2, 3, on_success=results.append)
+        self.assertEqual(results, [])
+        self.drain(task)
+        self.assertEqual(results, [5])
+        self.assertEqual(self.busy_changes, [True, False])
+        self.assertFalse(self.runner.busy)
+
+    def test_02_errors_go_to_on_error(self):
+        errors = []
+
+        def fail():
+            raise RuntimeError("sin conexion")
+
+        task = self.runner.submit(fail, on_success=self.fail, on_error=errors.append)
+        self.drain(task)
+        self.assertEqual(str(errors[0]), "sin conexion")
+
+    def test_03_closed_owner_does_not_receive_result(self):
+        release = threading.Event()
+        window = FakeWindow()
+        results = []
+        task = self.runner.submit(release.wait, 2, owner=window, on_success=results.append)
+        window.open = False
+        release.set()
+        self.drain(task)
+        self.assertEqual(results, [])
+        self.assertFalse(self.runner.busy)
+
+    def test_04_cancel_owner_discards_pending_tasks(self):
+        release = threading.Event()
+        window = FakeWindow()
+        results = []
+        task = self.runner.submit(release.wait, 2, owner=window, on_success=results.append)
+        self.runner.cancel_owner(window)
+        release.set()
+        self.drain(task)
+        self.assertEqual(results, [])
+
+    def test_05_lock_disables_button_until_done_and_cancel_all_skips_running_writes(self):
+        class FakeButton:
+            state = 'normal'
+
+            def config(self, state):
+                self.state = state
+
+        release = threading.Event()
+        started = threading.Event()
+        button = FakeButton()
+        saved = []
+
+        def write():
+            started.set()
+            release.wait(2)
+            return 7
+
+        task = self.runner.submit(write, lock=(button,), cancellable=False, on_success=saved.append)
+        self.assertEqual(button.state, 'disabled')
+        started.wait(2)
+        self.runner.cancel_all()
+        self.assertEqual((button.state, self.runner.busy), ('disabled', True))
+        release.set()
+        self.drain(task)
+        self.assertEqual((button.state, saved), ('normal', [7]))
+
+        release.clear()
+        read = self.runner.submit(release.wait, 2, lock=(button,), on_success=saved.append)
+        self.runner.cancel_all()
+        self.assertEqual((button.state, self.runner.busy), ('normal', False))
+        release.set()
+        self.master.run_pending()
+        self.assertTrue(read.cancelled)
+        self.assertEqual(saved, [7])
+
+    def test_06_closed_owner_keeps_running_write_and_reports_it(self):
+        orphans = []
+        self.runner.shutdown()
+        self.runner = TaskRunner(self.master, max_workers=2, on_orphan=orphans.append)
+        release = threading.Event()
+        started = threading.Event()
+        window = FakeWindow()
+        saved = []
+
+        def write():
+            started.set()
+            release.wait(2)
+            return 7
+
+        task = self.runner.submit(write, owner=window, cancellable=False, on_success=saved.append)
+        started.wait(2)
+        window.open = False
+        self.master.run_pending()
+        self.assertFalse(task.cancelled)
+        self.assertTrue(self.runner.busy)
+        release.set()
+        self.drain(task)
+        self.assertEqual((saved, orphans), ([], [None]))
+        self.assertFalse(self.runner.busy)
+
+
+if __name__ == '__main__':
+    unittest.main()